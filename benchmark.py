@@ -0,0 +1,312 @@
+"""
+Synthetic-Scale Benchmarks for the Quiz Pipeline
+
+This script builds synthetic lesson dictionaries of increasing size, with a
+realistic mix of translation variants, questions, "-ite" endings and
+QuestionGroups, and times the hot paths of utilities.py:
+- process_dictionary: rows processed per second and peak memory
+- find_random_answers: latency per call (p50/p99), in the default and in
+  the hard (edit-distance) mode
+- LanguageQuiz.iter_questions: latency per question (p50/p99) and time
+  to the first question
+- QuizSession: simulated (headless) sessions of 10 answers per second
+
+Results are printed (or written) as JSON; when a baseline file is given,
+the run fails (exit status 1) if any metric regressed by more than the
+threshold.
+
+Usage:
+    python benchmark.py --sizes 1000 10000 --output bench.json
+    python benchmark.py --baseline bench.json --threshold 0.25
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Optional, List, Dict, Tuple
+
+from utilities import QuestionGroup, WordType, Level, process_dictionary, find_random_answers, \
+    DistractorIndex, LanguageQuiz, QuizSession, latency_percentiles
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# metric name -> True if higher is better
+METRICS = {
+    "rows_per_second": True,
+    "peak_memory_bytes": False,
+    "calls_per_second": True,
+    "questions_per_second": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "first_question_ms": False,
+    "sessions_per_second": True,
+}
+
+
+# =============================================================================
+# SYNTHETIC DATA
+# =============================================================================
+
+def make_lesson(rows: int, seed: int = 1, category_size: int = 100) -> Dict[str, List[Tuple]]:
+    """
+    Build a synthetic lesson dictionary shaped like the enota*.py files.
+
+    Roughly 10% of the rows have Italian variants, 10% are questions,
+    5% end with "-ite", 30% are multi-word and 30% belong to one of a few
+    dozen QuestionGroups.
+
+    Args:
+        rows: Number of rows
+        seed: Random seed (the same seed always builds the same lesson)
+        category_size: Rows per category
+
+    Returns:
+        Lesson dictionary {category: (row, ...)}
+    """
+    rng = random.Random(seed)
+    groups = [QuestionGroup(f"skupina{i}") for i in range(max(1, rows // 1000) * 10)]
+    lesson = {}
+
+    for start in range(0, rows, category_size):
+        category_rows = []
+        for i in range(start, min(start + category_size, rows)):
+            slo = f"beseda{i}"
+            ita = f"parola{i}"
+            if rng.random() < 0.3:
+                slo += f" in {rng.randrange(100)}"
+                ita += f" e {rng.randrange(100)}"
+            r = rng.random()
+            if r < 0.1:
+                slo += "?"
+                ita += "?"
+            elif r < 0.15:
+                slo += "ite"
+
+            row = [slo, ita]
+            if rng.random() < 0.1:
+                row[1] = (ita, ita + " bis")
+            row.append(rng.choice(list(WordType)))
+            row.append(rng.choice(list(Level)))
+            if rng.random() < 0.3:
+                row.append(rng.choice(groups))
+            category_rows.append(tuple(row))
+
+        lesson[f"kategorija {start // category_size}"] = tuple(category_rows)
+
+    return lesson
+
+
+# =============================================================================
+# MEASUREMENTS
+# =============================================================================
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    summary = latency_percentiles(samples, (50, 99))
+    return {
+        "p50_ms": summary.get("p50", 0.0) * 1000,
+        "p99_ms": summary.get("p99", 0.0) * 1000,
+    }
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silence the progress and warning messages printed by utilities."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def bench_process_dictionary(lesson: Dict[str, List[Tuple]]) -> Dict[str, float]:
+    rows = sum(len(r) for r in lesson.values())
+
+    with _quiet():
+        start = time.perf_counter()
+        process_dictionary(lesson)
+        elapsed = time.perf_counter() - start
+
+        # separate run: tracemalloc slows allocation down considerably
+        tracemalloc.start()
+        process_dictionary(lesson)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else 0.0,
+        "peak_memory_bytes": peak,
+    }
+
+
+def bench_find_random_answers(dict_slo, calls: int, seed: int, hard: bool = False) -> Dict[str, float]:
+    rng = random.Random(seed)
+    keys = list(dict_slo)
+    index = DistractorIndex(dict_slo, hard=hard)
+    samples = []
+
+    with _quiet():
+        for _ in range(calls):
+            question = rng.choice(keys)
+            answer = dict_slo[question][0]
+            start = time.perf_counter()
+            find_random_answers(dict_slo, question, answer, 5, index=index)
+            samples.append(time.perf_counter() - start)
+
+    total = sum(samples)
+    result = {"calls": calls, "calls_per_second": calls / total if total else 0.0}
+    result.update(_latency_stats(samples))
+    return result
+
+
+def bench_prepare_questions(dict_slo, questions: int, seed: int) -> Dict[str, float]:
+    quiz = LanguageQuiz(dict_slo, seed)
+    samples = []
+
+    with _quiet():
+        generator = quiz.iter_questions(max_questions=questions)
+        start = last = time.perf_counter()
+        for _ in generator:
+            now = time.perf_counter()
+            samples.append(now - last)
+            last = now
+        total = last - start
+
+    result = {
+        "questions": len(samples),
+        "questions_per_second": len(samples) / total if total else 0.0,
+        "first_question_ms": samples[0] * 1000 if samples else 0.0,
+    }
+    result.update(_latency_stats(samples[1:]))
+    return result
+
+
+def bench_sessions(dict_slo, sessions: int, seed: int, answers: int = 10) -> Dict[str, float]:
+    rng = random.Random(seed)
+
+    with _quiet():
+        start = time.perf_counter()
+        for i in range(sessions):
+            session = QuizSession(LanguageQuiz(dict_slo, seed + i), max_questions=answers)
+            question = session.next_question()
+            while question is not None:
+                session.submit(rng.randrange(len(question.options)))
+                question = session.next_question()
+        elapsed = time.perf_counter() - start
+
+    return {
+        "sessions": sessions,
+        "sessions_per_second": sessions / elapsed if elapsed else 0.0,
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, questions: int = 1000, seed: int = 1) -> Dict:
+    """
+    Run all benchmarks for every deck size.
+
+    Args:
+        sizes: Number of synthetic rows of each deck
+        questions: Questions (and find_random_answers calls) timed per deck
+        seed: Random seed for data generation and sampling
+
+    Returns:
+        {"python": ..., "results": {size: {benchmark: {metric: value}}}}
+    """
+    results = {}
+    for size in sizes:
+        lesson = make_lesson(size, seed)
+        with _quiet():
+            dict_slo, _ = process_dictionary(lesson)
+
+        results[str(size)] = {
+            "process_dictionary": bench_process_dictionary(lesson),
+            "find_random_answers": bench_find_random_answers(dict_slo, questions, seed),
+            "find_random_answers_hard": bench_find_random_answers(dict_slo, questions, seed, hard=True),
+            "prepare_questions": bench_prepare_questions(dict_slo, questions, seed),
+            "sessions": bench_sessions(dict_slo, questions // 10, seed),
+        }
+
+    return {
+        "python": sys.version.split()[0],
+        "questions": questions,
+        "seed": seed,
+        "results": results,
+    }
+
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 0.25) -> List[str]:
+    """
+    Compare two benchmark runs.
+
+    Only the sizes, benchmarks and metrics present in both runs are compared.
+
+    Args:
+        current: Result of run_benchmarks
+        baseline: Earlier result of run_benchmarks
+        threshold: Allowed relative regression (0.25 = 25% worse)
+
+    Returns:
+        Human-readable descriptions of the regressions (empty if none)
+    """
+    regressions = []
+    for size, benchmarks in current["results"].items():
+        for bench, metrics in benchmarks.items():
+            reference = baseline.get("results", {}).get(size, {}).get(bench, {})
+            for metric, higher_is_better in METRICS.items():
+                if metric not in metrics or not reference.get(metric):
+                    continue
+                old, new = reference[metric], metrics[metric]
+                change = (old - new) / old if higher_is_better else (new - old) / old
+                if change > threshold:
+                    regressions.append(f"{bench}[{size}] {metric}: {old:.4g} -> {new:.4g} "
+                                       f"({change * 100:.1f}% worse)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="benchmark dei percorsi critici di utilities.py")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="numero di righe dei dizionari sintetici (es. 1000 10000 1000000)")
+    parser.add_argument("--questions", type=int, default=1000, help="domande misurate per dizionario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="file JSON in cui scrivere i risultati")
+    parser.add_argument("--baseline", help="file JSON con i risultati di riferimento")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="peggioramento relativo tollerato rispetto al riferimento")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.questions, args.seed)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressioni oltre la soglia del {args.threshold * 100:.0f}%:",
+                  file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,181 @@
-from enota2 import enota
-
-
-def check_duplicates():
-    """Verifica l'esistenza di doppioni nella prima colonna (parole slovene)"""
-    first_columns = []
-    duplicates = []
-
-    # Estrai tutte le tuple dal dizionario
-    for unit_name, tuple_list in enota.items():
-        for item in tuple_list:
-            if isinstance(item, tuple) and len(item) >= 2:
-                first_col = item[0]  # Prima colonna (parola slovena)
-
-                if first_col in first_columns:
-                    if first_col not in duplicates:
-                        duplicates.append(first_col)
-                else:
-                    first_columns.append(first_col)
-
-    # Mostra i risultati
-    if duplicates:
-        print(f"🔍 TROVATI {len(duplicates)} DOPPIONI nella prima colonna:")
-        print("=" * 50)
-
-        for duplicate in sorted(duplicates):
-            print(f"❌ '{duplicate}' appare più volte")
-
-            # Trova tutte le occorrenze
-            occurrences = []
-            for unit_name, tuple_list in enota.items():
-                for i, item in enumerate(tuple_list):
-                    if isinstance(item, tuple) and len(item) >= 2 and item[0] == duplicate:
-                        occurrences.append((unit_name, i, item))
-
-            print(f"   Occorrenze ({len(occurrences)}):")
-            for unit_name, index, full_item in occurrences:
-                print(f"     - {unit_name}, posizione {index}: {full_item}")
-            print()
-
-    else:
+"""
+Verifica dei doppioni nelle lezioni
+
+Analizza in un solo passaggio tutte le lezioni del menu (vedi lessons.py)
+e quelle della cartella 2023/, indicizzando le parole slovene in un
+dizionario (tempo lineare nel numero di righe), e segnala:
+- doppioni esatti: la stessa parola slovena in più righe
+- doppioni che differiscono solo per maiuscole/spazi (es. danes / Danes)
+- traduzioni in conflitto: la stessa parola slovena con traduzioni
+  italiane diverse
+
+Per ogni occorrenza vengono indicati lezione, categoria e posizione.
+
+Usage:
+    python check_duplicates.py            # report
+    python check_duplicates.py --strict   # exit status 1 se ci sono doppioni
+"""
+
+from __future__ import annotations
+import argparse
+import glob
+import importlib
+import importlib.util
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple, Iterable
+
+from lessons import LESSONS
+from utilities import normalize_text
+
+LEGACY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "2023")
+
+
+@dataclass
+class Occurrence:
+    """A Slovenian text found in a lesson row."""
+    lesson: str
+    category: str
+    position: int
+    slovensko: str
+    italiansko: Tuple[str, ...]
+
+    def __str__(self) -> str:
+        return (f"{self.lesson}, {self.category}, posizione {self.position}: "
+                f"'{self.slovensko}' -> {' / '.join(self.italiansko)}")
+
+
+@dataclass
+class Report:
+    """
+    Result of the analysis; every entry is a list of occurrences of the same word.
+
+    Attributes:
+        rows: Number of rows analyzed
+        exact: Same Slovenian text, verbatim, in more than one row
+        case_whitespace: Texts differing only by case or whitespace
+        conflicts: Same (normalized) Slovenian text with different translations
+    """
+    rows: int = 0
+    exact: List[List[Occurrence]] = field(default_factory=list)
+    case_whitespace: List[List[Occurrence]] = field(default_factory=list)
+    conflicts: List[List[Occurrence]] = field(default_factory=list)
+
+    def has_problems(self) -> bool:
+        return bool(self.exact or self.case_whitespace or self.conflicts)
+
+
+def _as_tuple(value) -> Tuple[str, ...]:
+    if isinstance(value, (tuple, list)):
+        return tuple(v for v in value if isinstance(v, str) and v)
+    return (value,) if isinstance(value, str) and value else ()
+
+
+def analyze(lessons: Iterable[Tuple[str, Dict]]) -> Report:
+    """
+    Find duplicates and conflicting translations across lessons.
+
+    Args:
+        lessons: (lesson name, lesson dictionary) pairs
+
+    Returns:
+        Report with the duplicates found
+    """
+    report = Report()
+    index = {}
+
+    # single pass: index every Slovenian text by its normalized form
+    for lesson_name, lesson in lessons:
+        for category, rows in lesson.items():
+            for position, row in enumerate(rows):
+                if not isinstance(row, (tuple, list)) or len(row) < 2:
+                    continue
+                italiansko = _as_tuple(row[1])
+                for slovensko in _as_tuple(row[0]):
+                    report.rows += 1
+                    index.setdefault(normalize_text(slovensko), []).append(
+                        Occurrence(lesson_name, str(category), position, slovensko, italiansko))
+
+    for key in sorted(index):
+        occurrences = index[key]
+        if len(occurrences) < 2:
+            continue
+
+        by_text = {}
+        for occurrence in occurrences:
+            by_text.setdefault(occurrence.slovensko, []).append(occurrence)
+        for same_text in by_text.values():
+            if len(same_text) > 1:
+                report.exact.append(same_text)
+        if len(by_text) > 1:
+            report.case_whitespace.append(occurrences)
+
+        translations = {frozenset(normalize_text(t) for t in occurrence.italiansko) for occurrence in occurrences}
+        if len(translations) > 1:
+            report.conflicts.append(occurrences)
+
+    return report
+
+
+def load_lessons(include_legacy: bool = True) -> List[Tuple[str, Dict]]:
+    """
+    Import the lessons of the menu and, optionally, the ones in 2023/.
+
+    Returns:
+        (lesson name, lesson dictionary) pairs
+    """
+    result = []
+    for lesson in LESSONS:
+        module = importlib.import_module(lesson.module)
+        result.append((lesson.module, getattr(module, lesson.attr)))
+
+    if include_legacy:
+        for path in sorted(glob.glob(os.path.join(LEGACY_DIR, "*.py"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            result.append((f"2023/{name}", module.enota))
+
+    return result
+
+
+def _print_section(title: str, groups: List[List[Occurrence]]) -> None:
+    if not groups:
+        return
+    print(f"🔍 {title}: {len(groups)}")
+    print("=" * 50)
+    for occurrences in groups:
+        print(f"❌ '{occurrences[0].slovensko}' ({len(occurrences)} occorrenze)")
+        for occurrence in occurrences:
+            print(f"     - {occurrence}")
+    print()
+
+
+def check_duplicates(include_legacy: bool = True) -> Report:
+    """Verifica l'esistenza di doppioni nella prima colonna (parole slovene) di tutte le lezioni"""
+    report = analyze(load_lessons(include_legacy))
+
+    _print_section("DOPPIONI ESATTI", report.exact)
+    _print_section("DOPPIONI CHE DIFFERISCONO SOLO PER MAIUSCOLE/SPAZI", report.case_whitespace)
+    _print_section("TRADUZIONI IN CONFLITTO", report.conflicts)
+
+    if not report.has_problems():
         print("✅ NESSUN DOPPIONE trovato nella prima colonna!")
-        print(f"   Totale elementi unici: {len(first_columns)}")
+    print(f"   Totale parole slovene analizzate: {report.rows}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="verifica dei doppioni nelle lezioni")
+    parser.add_argument("--no-2023", action="store_true", help="escludi le lezioni della cartella 2023/")
+    parser.add_argument("--strict", action="store_true", help="exit status 1 se ci sono doppioni o conflitti")
+    args = parser.parse_args(argv)
+
+    report = check_duplicates(include_legacy=not args.no_2023)
+    return 1 if args.strict and report.has_problems() else 0
 
 
 if __name__ == "__main__":
-    check_duplicates()
\ No newline at end of file
+    sys.exit(main())
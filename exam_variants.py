@@ -0,0 +1,216 @@
+"""
+Exam Variant Generator
+
+Generates N different but reproducible exam variants of a lesson, as JSON
+or as printable text with the answer key: variant i is the quiz of seed
+base + i, so the same command always produces the same variants and any
+single variant can be generated again on its own.
+
+The variants are generated in parallel by a pool of processes (each
+process loads the lesson once) and every variant is written to disk as
+soon as it is ready, so the memory used does not grow with the number of
+variants.
+
+Usage:
+    python exam_variants.py enota2 --variants 30 --questions 50
+    python exam_variants.py enota_extra.extra --variants 1000 --format txt --output esami
+    python exam_variants.py enota1 --variants 5 --ita2slo --seed 100
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, List, Dict, Tuple, Iterator
+
+from lessons import LESSONS
+from utilities import Item, LanguageQuiz, VocabularyStore, process_dictionary
+from vocab_snapshot import load_lesson
+
+FORMATS = ("json", "txt")
+
+# variants generated by a worker process per task
+BATCH_SIZE = 10
+
+# lesson of the worker process: (spec, dict_slo, dict_ita)
+_deck = None
+
+
+def load_deck(spec: str) -> Tuple[Dict[str, List[Item]], Dict[str, List[Item]]]:
+    """
+    Load a lesson given as "module" or "module.dictionary" (e.g. "enota2.enota").
+
+    Lessons of the menu are loaded through vocab_snapshot.load_lesson. The
+    progress messages of process_dictionary are not printed.
+    """
+    module_name, _, attr = spec.partition(".")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for lesson in LESSONS:
+            if lesson.module == module_name and attr in ("", lesson.attr):
+                return load_lesson(module_name)
+
+        module = importlib.import_module(module_name)
+        return process_dictionary(getattr(module, attr or "enota"), store=VocabularyStore())
+
+
+def _load(spec: str) -> Tuple[Dict[str, List[Item]], Dict[str, List[Item]]]:
+    global _deck
+    if _deck is None or _deck[0] != spec:
+        _deck = (spec,) + tuple(load_deck(spec))
+    return _deck[1], _deck[2]
+
+
+def make_variant(
+        spec: str,
+        variant: int,
+        seed: int,
+        questions: int,
+        options: int,
+        slo2ita: bool = True
+) -> Dict:
+    """
+    Generate one exam variant.
+
+    Returns:
+        {"lesson", "variant", "seed", "slo2ita", "questions": [{"number",
+        "question", "options", "answer"}]}, answer being the index of the
+        correct option
+    """
+    dict_slo, dict_ita = _load(spec)
+    quiz = LanguageQuiz(dict_slo if slo2ita else dict_ita, seed)
+    entries = []
+    for number, (question, correct, answers) in enumerate(quiz.iter_questions(slo2ita, questions, options), 1):
+        entries.append({
+            "number": number,
+            "question": question,
+            "options": [answer.italiansko if slo2ita else answer.slovensko for answer in answers],
+            "answer": answers.index(correct),
+        })
+    return {"lesson": spec, "variant": variant, "seed": seed, "slo2ita": slo2ita, "questions": entries}
+
+
+def render_text(exam: Dict) -> str:
+    """Printable exam, with the answer key at the end."""
+    lines = [f"Verifica - {exam['lesson']} - variante {exam['variant']} (seed {exam['seed']})", ""]
+    for entry in exam["questions"]:
+        if exam["slo2ita"]:
+            lines.append(f"{entry['number']}. Cosa significa '{entry['question']}' ?")
+        else:
+            lines.append(f"{entry['number']}. Come traduci '{entry['question']}' ?")
+        for counter, option in enumerate(entry["options"]):
+            lines.append(f"   {chr(ord('a') + counter)}) {option}")
+        lines.append("")
+    key = ", ".join(f"{entry['number']}-{chr(ord('a') + entry['answer'])}" for entry in exam["questions"])
+    lines.append(f"Soluzioni: {key}")
+    return "\n".join(lines) + "\n"
+
+
+def render(exam: Dict, fmt: str) -> str:
+    if fmt == "txt":
+        return render_text(exam)
+    return json.dumps(exam, ensure_ascii=False, indent=1) + "\n"
+
+
+def _render_batch(
+        spec: str,
+        variants: List[int],
+        base_seed: int,
+        questions: int,
+        options: int,
+        slo2ita: bool,
+        fmt: str
+) -> List[Tuple[int, str]]:
+    """Task of a worker process: (variant, rendered exam) of some variants."""
+    return [(variant, render(make_variant(spec, variant, base_seed + variant, questions, options, slo2ita), fmt))
+            for variant in variants]
+
+
+def variant_path(output: str, variant: int, fmt: str) -> str:
+    return os.path.join(output, f"variante_{variant:04d}.{fmt}")
+
+
+def generate_variants(
+        spec: str,
+        variants: int,
+        questions: int = 50,
+        options: int = 5,
+        base_seed: int = 1,
+        slo2ita: bool = True,
+        output: str = "varianti",
+        fmt: str = "json",
+        workers: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Generate and write the exam variants, yielding each file as it is written.
+
+    Args:
+        spec: Lesson, "module" or "module.dictionary"
+        variants: Number of variants
+        questions: Questions per variant
+        options: Options per question
+        base_seed: Seed of variant 0 (variant i uses base_seed + i); not 0
+        slo2ita: Translation direction
+        output: Directory of the files (created if missing)
+        fmt: "json" or "txt"
+        workers: Worker processes (default: one per CPU; 0 to generate the
+                 variants in this process)
+
+    Yields:
+        The paths of the written files, in order of completion
+    """
+    if base_seed <= 0:
+        raise ValueError("the base seed must be positive: seed 0 is not reproducible")
+    os.makedirs(output, exist_ok=True)
+    batches = [list(range(start, min(start + BATCH_SIZE, variants))) for start in range(0, variants, BATCH_SIZE)]
+
+    def write(results: List[Tuple[int, str]]) -> Iterator[str]:
+        for variant, text in results:
+            path = variant_path(output, variant, fmt)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            yield path
+
+    if workers == 0:
+        for batch in batches:
+            yield from write(_render_batch(spec, batch, base_seed, questions, options, slo2ita, fmt))
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_render_batch, spec, batch, base_seed, questions, options, slo2ita, fmt)
+                   for batch in batches]
+        for future in as_completed(futures):
+            yield from write(future.result())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="genera varianti riproducibili di una verifica")
+    parser.add_argument("lesson", help="lezione, es. enota2 oppure enota2.enota")
+    parser.add_argument("--variants", type=int, default=10, help="numero di varianti (default: 10)")
+    parser.add_argument("--questions", type=int, default=50, help="domande per variante (default: 50)")
+    parser.add_argument("--options", type=int, default=5, help="risposte per domanda (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="seed della variante 0 (default: 1)")
+    parser.add_argument("--ita2slo", action="store_true", help="domande da italiano a sloveno")
+    parser.add_argument("--format", choices=FORMATS, default="json", help="formato dei file (default: json)")
+    parser.add_argument("--output", default="varianti", help="cartella dei file (default: varianti)")
+    parser.add_argument("--workers", type=int, default=None, help="processi (default: uno per CPU)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = 0
+    for _ in generate_variants(args.lesson, args.variants, args.questions, args.options, args.seed,
+                               not args.ita2slo, args.output, args.format, args.workers):
+        written += 1
+    print(f"{written} varianti scritte in {args.output}/ ({time.perf_counter() - start:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Streaming Export of Generated Quizzes
+
+Writes the questions of a quiz, with their options and answer key, as
+JSON Lines or CSV rows, for other tools (spreadsheets, printing, training
+data, ...). The questions are consumed one at a time from a generator and
+written through a buffered writer, so the memory used does not depend on
+the number of questions.
+
+The command line generates the questions with LanguageQuiz.question_at,
+which keeps no state between questions (a FeistelPermutation of the deck
+instead of a shuffled copy); more questions than the deck has keys are
+asked in passes, pass p using seed + p.
+
+Usage:
+    python export_quiz.py enota1 > enota1.jsonl
+    python export_quiz.py enota2 --format csv --ita2slo --output enota2.csv
+    python export_quiz.py enota_verbs.verbs --questions 1000000 --seed 7 --output verbs.jsonl
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import argparse
+import csv
+import json
+import sys
+from typing import Optional, List, Dict, Tuple, Iterable, Iterator, TextIO
+
+from exam_variants import load_deck
+from utilities import Item, LanguageQuiz
+
+FORMATS = ("jsonl", "csv")
+
+BUFFER_SIZE = 1 << 20
+
+
+def generate_questions(
+        dict_lang: Dict[str, List[Item]],
+        count: int = 0,
+        number_of_answers: int = 5,
+        slo2ita: bool = True,
+        seed: int = 1
+) -> Iterator[Tuple[str, Item, List[Item]]]:
+    """
+    Generate count questions in constant memory (see LanguageQuiz.question_at).
+
+    Args:
+        dict_lang: Vocabulary dictionary
+        count: Number of questions (0: every key once)
+        number_of_answers: Number of multiple choice options
+        slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
+        seed: Seed of the first pass over the deck (not 0)
+
+    Yields:
+        Tuples: (question_text, correct_answer, all_possible_answers)
+    """
+    size = len(dict_lang)
+    if size == 0:
+        return
+    if count == 0:
+        count = size
+    quiz = None
+    for number in range(count):
+        passes, position = divmod(number, size)
+        if position == 0:
+            quiz = LanguageQuiz(dict_lang, seed + passes)
+        yield quiz.question_at(position, slo2ita, number_of_answers)
+
+
+def warn_shortfall(
+        questions: Iterable[Tuple[str, Item, List[Item]]],
+        number_of_answers: int,
+        err: Optional[TextIO] = None
+) -> Iterator[Tuple[str, Item, List[Item]]]:
+    """
+    Pass the questions through, warning on err (default: standard error)
+    about those with fewer than number_of_answers options, so the warnings
+    never end up among the exported rows.
+    """
+    for question in questions:
+        if len(question[2]) < number_of_answers:
+            print(f"Warning: Could only find {len(question[2])} answers out of "
+                  f"{number_of_answers} requested for question '{question[0]}'", file=err or sys.stderr)
+        yield question
+
+
+def question_row(number: int, question: Tuple[str, Item, List[Item]], slo2ita: bool) -> Dict:
+    """Exported fields of a question."""
+    text, correct, answers = question
+    return {
+        "number": number,
+        "question": text,
+        "options": [answer.italiansko if slo2ita else answer.slovensko for answer in answers],
+        "answer": answers.index(correct),
+        "correct": correct.italiansko if slo2ita else correct.slovensko,
+        "category": correct.category,
+    }
+
+
+def export_questions(
+        questions: Iterable[Tuple[str, Item, List[Item]]],
+        out: TextIO,
+        fmt: str = "jsonl",
+        slo2ita: bool = True,
+        number_of_answers: int = 5
+) -> int:
+    """
+    Write questions as they are generated, one row each.
+
+    CSV rows have the columns number, question, option_a, option_b, ...,
+    answer (letter of the correct option), correct and category; JSONL
+    rows have the fields of question_row.
+
+    Args:
+        questions: Questions, e.g. from LanguageQuiz.iter_questions or generate_questions
+        out: Text file to write to
+        fmt: "jsonl" or "csv"
+        slo2ita: Direction of the questions (language of the options)
+        number_of_answers: Number of option columns of the CSV rows
+
+    Returns:
+        Number of questions written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}")
+
+    letters = [chr(ord('a') + i) for i in range(number_of_answers)]
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["number", "question"] + [f"option_{letter}" for letter in letters]
+                        + ["answer", "correct", "category"])
+
+    count = 0
+    for count, question in enumerate(questions, 1):
+        row = question_row(count, question, slo2ita)
+        if writer is None:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+        else:
+            options = row["options"] + [""] * (number_of_answers - len(row["options"]))
+            writer.writerow([count, row["question"]] + options
+                            + [letters[row["answer"]], row["correct"], row["category"]])
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="esporta le domande di un quiz in JSONL o CSV")
+    parser.add_argument("lesson", help="lezione, es. enota1 oppure enota_verbs.verbs")
+    parser.add_argument("--questions", type=int, default=0, help="numero di domande (default: una per parola)")
+    parser.add_argument("--options", type=int, default=5, help="risposte per domanda (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="seed (default: 1)")
+    parser.add_argument("--ita2slo", action="store_true", help="domande da italiano a sloveno")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl", help="formato (default: jsonl)")
+    parser.add_argument("--output", default="-", help="file di uscita (default: standard output)")
+    args = parser.parse_args(argv)
+    if args.seed <= 0:
+        parser.error("il seed deve essere positivo")
+
+    slo2ita = not args.ita2slo
+    dict_slo, dict_ita = load_deck(args.lesson)
+    questions = warn_shortfall(generate_questions(dict_slo if slo2ita else dict_ita, args.questions,
+                                                  args.options, slo2ita, args.seed), args.options)
+
+    if args.output == "-":
+        count = export_questions(questions, sys.stdout, args.format, slo2ita, args.options)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as out:
+            count = export_questions(questions, out, args.format, slo2ita, args.options)
+        print(f"{count} domande scritte in {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
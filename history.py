@@ -0,0 +1,296 @@
+"""
+Persistent Answer History
+
+Every answer given in a quiz is saved in a local SQLite database (WAL
+mode), with the question, the options shown, the chosen option,
+correctness, timestamp and response time.
+
+Writes never block the quiz: record() only puts the answer in a queue,
+and a background thread writes the queued answers in batches, one
+transaction per batch. The database has indexes for the two common
+queries, the history of an item and the last N sessions, so they stay
+fast after years of answers.
+
+Example:
+    >>> history = AnswerHistory()
+    >>> session = history.start_session("enota1", slo2ita=True)
+    >>> history.record(session, item, chosen, True, slo2ita=True, latency=1.3, options=options)
+    >>> history.close()
+    >>> AnswerHistory().item_history(item_key(item))
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional, List, Dict
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".learnslo_history.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    lesson TEXT,
+    direction TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES sessions (id),
+    item_key TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    question TEXT NOT NULL,
+    chosen TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    latency REAL,
+    options TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_item ON answers (item_key, ts);
+CREATE INDEX IF NOT EXISTS answers_session ON answers (session_id);
+"""
+
+_INSERT_SESSION = "INSERT INTO sessions (id, started, lesson, direction) VALUES (?, ?, ?, ?)"
+_INSERT_ANSWER = ("INSERT INTO answers (session_id, item_key, direction, question, chosen, correct, ts, latency, "
+                  "options) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+_STOP = object()
+
+# a batch that fails to be written (e.g. database locked) is retried once after this delay (seconds)
+RETRY_DELAY = 0.5
+
+
+def item_key(item) -> str:
+    """Stable identifier of an Item across sessions (item ids are not)."""
+    return f"{item.slovensko}\t{item.italiansko}"
+
+
+def _direction(slo2ita: bool) -> str:
+    return "slo2ita" if slo2ita else "ita2slo"
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class AnswerHistory:
+    """
+    Answer history database with asynchronous, batched writes.
+
+    Attributes:
+        path: Database file
+        batch_size: Maximum answers written per transaction
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 64):
+        self.path = path
+        self.batch_size = batch_size
+
+        conn = _connect(path)
+        with conn:
+            conn.executescript(SCHEMA)
+        conn.close()
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="answer-history", daemon=True)
+        self._writer.start()
+        self._reader = None
+
+    # -------------------------------------------------------------------------
+    # writing
+    # -------------------------------------------------------------------------
+
+    def _write_loop(self) -> None:
+        """Write queued rows in batches until close() is called."""
+        conn = _connect(self.path)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(entry is _STOP for entry in batch)
+                rows = [entry for entry in batch if entry is not _STOP]
+                try:
+                    self._write_batch(conn, rows)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, rows: List) -> None:
+        """Write rows in one transaction, retrying once if it fails."""
+        for attempt in range(2):
+            try:
+                with conn:
+                    for sql, params in rows:
+                        conn.execute(sql, params)
+                return
+            except sqlite3.Error as e:
+                if attempt == 0:
+                    time.sleep(RETRY_DELAY)
+                else:
+                    print(f"Errore nel salvataggio della cronologia ({len(rows)} righe perse): {e}")
+
+    def _put(self, row) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("the answer history is closed")
+            self._queue.put(row)
+
+    def start_session(self, lesson: Optional[str] = None, slo2ita: bool = True) -> str:
+        """
+        Register a new quiz session.
+
+        Returns:
+            The session id, to pass to record()
+
+        Raises:
+            RuntimeError: If the history is closed
+        """
+        session_id = uuid.uuid4().hex
+        self._put((_INSERT_SESSION, (session_id, time.time(), lesson, _direction(slo2ita))))
+        return session_id
+
+    def record(
+            self,
+            session_id: str,
+            item,
+            chosen,
+            correct: bool,
+            slo2ita: bool = True,
+            latency: Optional[float] = None,
+            options: Optional[List] = None,
+            question: Optional[str] = None
+    ) -> None:
+        """
+        Queue an answer for writing (returns immediately).
+
+        Args:
+            session_id: Id returned by start_session()
+            item: The correct Item
+            chosen: The Item chosen (or the text typed) by the user
+            correct: True if the answer was correct
+            slo2ita: Quiz direction
+            latency: Response time in seconds
+            options: Items shown as options
+            question: Question text (default: the text of item in the quiz direction)
+
+        Raises:
+            RuntimeError: If the history is closed
+        """
+        def shown(answer) -> str:
+            if isinstance(answer, str):
+                return answer
+            return answer.italiansko if slo2ita else answer.slovensko
+
+        if question is None:
+            question = item.slovensko if slo2ita else item.italiansko
+        self._put((_INSERT_ANSWER, (
+            session_id,
+            item_key(item),
+            _direction(slo2ita),
+            question,
+            shown(chosen),
+            int(correct),
+            time.time(),
+            latency,
+            json.dumps([shown(option) for option in options or []], ensure_ascii=False),
+        )))
+
+    def flush(self) -> None:
+        """Wait until all the queued answers are written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the queued answers and stop the writer thread; record() then raises."""
+        with self._lock:
+            stop = not self._closed
+            self._closed = True
+            if stop:
+                self._queue.put(_STOP)
+        if stop:
+            self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    # -------------------------------------------------------------------------
+    # queries
+    # -------------------------------------------------------------------------
+
+    def _read(self, sql: str, params=()) -> List[sqlite3.Row]:
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.path, check_same_thread=False)
+            self._reader.row_factory = sqlite3.Row
+        return self._reader.execute(sql, params).fetchall()
+
+    def item_history(self, key: str, limit: int = 100) -> List[Dict]:
+        """
+        Most recent answers for an item (see item_key), newest first.
+
+        Uses the (item_key, ts) index.
+        """
+        rows = self._read("SELECT session_id, direction, question, chosen, correct, ts, latency, options "
+                          "FROM answers WHERE item_key = ? ORDER BY ts DESC LIMIT ?", (key, limit))
+        result = []
+        for row in rows:
+            entry = dict(row)
+            entry["correct"] = bool(entry["correct"])
+            entry["options"] = json.loads(entry["options"])
+            result.append(entry)
+        return result
+
+    def last_sessions(self, n: int = 10) -> List[Dict]:
+        """
+        The last n sessions, newest first, with their answer counts.
+
+        Uses the sessions (started) and answers (session_id) indexes.
+        """
+        rows = self._read(
+            "SELECT s.id, s.started, s.lesson, s.direction, "
+            "(SELECT COUNT(*) FROM answers a WHERE a.session_id = s.id) AS answers, "
+            "(SELECT COALESCE(SUM(a.correct), 0) FROM answers a WHERE a.session_id = s.id) AS correct "
+            "FROM sessions s ORDER BY s.started DESC LIMIT ?", (n,))
+        return [dict(row) for row in rows]
+
+
+_default_history = None
+
+
+def default_history() -> Optional[AnswerHistory]:
+    """
+    History database shared by the interactive quizzes (opened on first use,
+    closed at exit); None if the database cannot be opened.
+    """
+    global _default_history
+    if _default_history is None:
+        try:
+            _default_history = AnswerHistory()
+        except sqlite3.Error as e:
+            print(f"Cronologia delle risposte non disponibile: {e}")
+            return None
+        atexit.register(_default_history.close)
+    return _default_history
@@ -0,0 +1,203 @@
+"""
+Opt-in Instrumentation for the Quiz Pipeline
+
+Collects per-stage timers, counters and histograms from utilities.py
+(dictionary processing, distractor search, question preparation,
+rendering), to find out where the time goes in a quiz session.
+
+Instrumentation is disabled by default and costs a single attribute check
+per instrumented call. It is enabled either:
+- by setting the environment variable LEARNSLO_METRICS to 1, true or yes, or
+- from code, with metrics.enable()
+
+When enabled, LanguageQuiz.run_quiz writes the collected data as JSON at
+the end of the quiz, to the file named by LEARNSLO_METRICS_FILE
+(default: learnslo_metrics.json).
+
+Example:
+    >>> from instrumentation import metrics
+    >>> metrics.enable()
+    >>> with metrics.stage("process_dictionary"):
+    ...     dict_slo, dict_ita = process_dictionary(enota)
+    >>> print(metrics.to_dict()["stages"]["process_dictionary"]["count"])  # 1
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Optional, Dict, Iterable
+
+ENV_ENABLE = "LEARNSLO_METRICS"
+ENV_FILE = "LEARNSLO_METRICS_FILE"
+DEFAULT_FILE = "learnslo_metrics.json"
+
+
+class _Stage:
+    """Context manager adding the elapsed time of a block to a stage timer."""
+    __slots__ = ("_metrics", "_name", "_start")
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._metrics.add_time(self._name, time.perf_counter() - self._start)
+        return False
+
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+def latency_percentiles(latencies: Iterable[float], percentiles: Iterable[int] = (50, 90)) -> Dict[str, float]:
+    """
+    Summary of measured values (response times): count, mean, the given
+    percentiles (p50 and p90 by default) and max.
+
+    Percentiles use the nearest-rank method, so they are always one of the
+    measured values. This is the percentile of the quiz results, of the
+    metrics histograms and of benchmark.py.
+    """
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+
+    summary = {"count": len(values), "mean": sum(values) / len(values)}
+    for pct in percentiles:
+        summary[f"p{pct}"] = values[max(0, -(-len(values) * pct // 100) - 1)]
+    summary["max"] = values[-1]
+    return summary
+
+
+class Metrics:
+    """
+    Registry of stage timers, counters and histograms.
+
+    Measurements may come from several threads (the prefetch thread of a
+    quiz, the sessions of the quiz server): when enabled, every update
+    holds a lock.
+
+    Attributes:
+        enabled: When False, all recording methods return immediately
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard all the collected data."""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.histograms = {}
+
+    def stage(self, name: str):
+        """
+        Time a block of code as part of a pipeline stage.
+
+        Example:
+            >>> with metrics.stage("render"):
+            ...     print(question)
+        """
+        if not self.enabled:
+            return _NO_STAGE
+        return _Stage(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add one measurement to a stage timer."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                self.stages[name] = [1, seconds, seconds]
+            else:
+                stage[0] += 1
+                stage[1] += seconds
+                if seconds > stage[2]:
+                    stage[2] = seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: int) -> None:
+        """Add an integer observation (e.g. number of attempts) to a histogram."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.setdefault(name, {})
+            histogram[value] = histogram.get(value, 0) + 1
+
+    @staticmethod
+    def _histogram_summary(histogram: Dict[int, int]) -> Dict:
+        values = sorted(histogram)
+        summary = latency_percentiles((v for v in values for _ in range(histogram[v])), (50, 99))
+        summary["buckets"] = {str(v): histogram[v] for v in values}
+        return summary
+
+    def to_dict(self) -> Dict:
+        """Collected data as a JSON-serializable dictionary."""
+        with self._lock:
+            stages = {name: tuple(stage) for name, stage in self.stages.items()}
+            counters = dict(self.counters)
+            histograms = {name: dict(h) for name, h in self.histograms.items() if h}
+        return {
+            "stages": {
+                name: {
+                    "count": count,
+                    "total_s": total,
+                    "mean_ms": total / count * 1000,
+                    "max_ms": longest * 1000,
+                }
+                for name, (count, total, longest) in stages.items()
+            },
+            "counters": counters,
+            "histograms": {name: self._histogram_summary(h) for name, h in histograms.items()},
+        }
+
+    def export_json(self, path: Optional[str] = None) -> str:
+        """
+        Write the collected data as JSON.
+
+        Args:
+            path: Destination file (default: $LEARNSLO_METRICS_FILE or
+                  learnslo_metrics.json)
+
+        Returns:
+            The path written to
+        """
+        if path is None:
+            path = os.environ.get(ENV_FILE) or DEFAULT_FILE
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        return path
+
+
+def enabled_by_environment() -> bool:
+    """True if LEARNSLO_METRICS is 1, true or yes (so that 0 or false keep the metrics off)."""
+    return os.environ.get(ENV_ENABLE, "").strip().lower() in ("1", "true", "yes")
+
+
+# Process-wide metrics, enabled by the LEARNSLO_METRICS environment variable
+metrics = Metrics(enabled=enabled_by_environment())
@@ -0,0 +1,138 @@
+"""
+Lesson Registry and Manifest
+
+LESSONS lists the lessons offered by main.py: menu key, title, module and
+name of the dictionary defined in the module. Adding a lesson only needs
+a new entry here.
+
+The manifest (lessons_manifest.json) is precomputed from the registry
+with the number of items, the categories and a content hash of every
+lesson module, so that the menu can be shown without importing any
+lesson; only the lesson chosen by the user is then loaded (see
+vocab_snapshot.load_lesson).
+
+Usage:
+    python lessons.py          # rebuild lessons_manifest.json
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional, List, Dict
+
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lessons_manifest.json")
+
+
+@dataclass
+class Lesson:
+    """
+    A lesson of the main.py menu.
+
+    Attributes:
+        key: Menu key
+        title: Menu label
+        module: Lesson module name
+        attr: Name of the lesson dictionary in the module
+        hidden: Lesson not listed in the menu (but still selectable)
+    """
+    key: str
+    title: str
+    module: str
+    attr: str = "enota"
+    hidden: bool = False
+
+
+LESSONS = [
+    Lesson('a', "enota 1", "enota1"),
+    Lesson('b', "enota 2", "enota2"),
+    Lesson('c', "enota 3", "enota3", hidden=True),
+    Lesson('d', "enota 4", "enota4", hidden=True),
+    Lesson('e', "enota 5", "enota5"),
+    Lesson('f', "enota 6", "enota6"),
+    Lesson('g', "extra", "enota_extra", "extra"),
+    Lesson('h', "numbers", "enota_numbers"),
+    Lesson('i', "time", "enota_time", "time_dict"),
+    Lesson('l', "verbs", "enota_verbs", "verbs"),
+]
+
+
+def get_lesson(key: str) -> Optional[Lesson]:
+    """Return the lesson with the given menu key, None if there is none."""
+    for lesson in LESSONS:
+        if lesson.key == key:
+            return lesson
+    return None
+
+
+def source_path(module_name: str) -> Optional[str]:
+    """Locate a module's source file without importing it."""
+    spec = importlib.util.find_spec(module_name)
+    return spec.origin if spec is not None else None
+
+
+def content_hash(path: str) -> str:
+    """SHA-256 of a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_manifest(lessons: Optional[List[Lesson]] = None) -> Dict[str, Dict]:
+    """
+    Compute the manifest entries of the lessons (imports every lesson).
+
+    Args:
+        lessons: Lessons to describe (default: LESSONS)
+
+    Returns:
+        {module name: {"name", "path", "items", "categories", "sha256"}}
+    """
+    from utilities import VocabularyStore, process_dictionary
+
+    if lessons is None:
+        lessons = LESSONS
+
+    manifest = {}
+    for lesson in lessons:
+        module = importlib.import_module(lesson.module)
+        lesson_dict = getattr(module, lesson.attr)
+        store = VocabularyStore()
+        process_dictionary(lesson_dict, store=store)
+
+        path = source_path(lesson.module)
+        manifest[lesson.module] = {
+            "name": lesson.title,
+            "path": os.path.relpath(path, os.path.dirname(MANIFEST_PATH)),
+            "items": len(store),
+            "categories": [str(category) for category in lesson_dict],
+            "sha256": content_hash(path),
+        }
+    return manifest
+
+
+def write_manifest(path: str = MANIFEST_PATH) -> Dict[str, Dict]:
+    """Rebuild the manifest file."""
+    manifest = build_manifest()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return manifest
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, Dict]:
+    """Read the manifest file (empty if it is missing or unreadable)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+if __name__ == "__main__":
+    manifest = write_manifest()
+    print(f"manifest scritto in {MANIFEST_PATH}: {len(manifest)} lezioni")
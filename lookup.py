@@ -0,0 +1,230 @@
+"""
+Dictionary Lookup Across All Lessons
+
+Finds the items of every lesson whose Slovenian or Italian text has a
+word starting with the searched prefix. Matching ignores case,
+punctuation and diacritics ("cas" finds "čas"), and results are listed in
+Slovenian alphabetical order (c < č < d, s < š < t, z < ž).
+
+The index is a sorted array of search keys (every word-initial suffix of
+the folded texts) with a parallel array of item numbers: a query is a
+binary search followed by a scan of the matching range, and items are
+ranked by a collation order computed once when the index is built.
+Short prefixes match too many keys to be scanned at every keystroke, so
+the first results of every prefix matching more than SCAN_LIMIT keys are
+computed when the index is built, and no query scans more than
+SCAN_LIMIT keys. The lessons are loaded through vocab_snapshot.load_lesson, so the index is
+built from the snapshot when it is up to date.
+
+Usage:
+    python lookup.py čas         # one search
+    python lookup.py             # interactive search
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import heapq
+import sys
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Optional, List, Tuple, Iterable
+
+from lessons import LESSONS
+from utilities import Item, canonical_answer, fold_diacritics
+
+# Slovenian alphabet, plus the letters of foreign words in their usual place
+SLOVENIAN_ALPHABET = "abcčćdđefghijklmnopqrsštuvwxyzž"
+_RANK = {letter: rank for rank, letter in enumerate(SLOVENIAN_ALPHABET)}
+
+DEFAULT_LIMIT = 20
+
+# results of the prefixes matching more keys than this are precomputed
+SCAN_LIMIT = 1000
+
+
+def collation_key(text: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Sort key of a text in Slovenian alphabetical order.
+
+    Letters of the Slovenian alphabet sort by their position in it; other
+    accented letters (e.g. Italian "è") sort right after their base letter;
+    spaces, digits and punctuation sort before all letters.
+    """
+    primary = []
+    secondary = []
+    for char in text.lower():
+        rank = _RANK.get(char)
+        accent = 0
+        if rank is None:
+            rank = _RANK.get(fold_diacritics(char))
+            accent = 1
+        if rank is None:
+            rank = ord(char) - sys.maxunicode - 1
+            accent = 0
+        primary.append(rank)
+        secondary.append(accent)
+    return tuple(primary), tuple(secondary)
+
+
+@dataclass
+class LookupResult:
+    """An item found by a search, with the lesson it belongs to."""
+    lesson: str
+    item: Item
+
+    def __str__(self) -> str:
+        return f"[{self.lesson}, {self.item.category}] {self.item}"
+
+
+class LookupIndex:
+    """
+    Prefix index over the Slovenian and Italian texts of many lessons.
+
+    Example:
+        >>> index = LookupIndex([("enota1", items)])
+        >>> for result in index.search("cas"):
+        ...     print(result)
+    """
+
+    def __init__(self, lessons: Iterable[Tuple[str, Iterable[Item]]]):
+        """
+        Build the index.
+
+        Args:
+            lessons: (lesson name, items) pairs
+        """
+        self.results = []
+        for lesson, items in lessons:
+            self.results.extend(LookupResult(lesson, item) for item in items)
+
+        # collation rank of every item: Slovenian text first, then Italian
+        order = sorted(range(len(self.results)), key=lambda i: (
+            collation_key(self.results[i].item.slovensko or ""),
+            collation_key(self.results[i].item.italiansko or "")))
+        self._rank = array('l', [0]) * len(order)
+        for rank, i in enumerate(order):
+            self._rank[i] = rank
+
+        entries = []
+        for i, result in enumerate(self.results):
+            keys = set()
+            for text in (result.item.slovensko, result.item.italiansko):
+                # slash alternatives are words of their own ("zdaj/sedaj")
+                words = canonical_answer((text or "").replace("/", " ")).split()
+                keys.update(" ".join(words[start:]) for start in range(len(words)))
+            entries.extend((key, i) for key in keys)
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._ids = array('l', [i for _, i in entries])
+
+        # first results of the frequent prefixes: keys sharing a prefix are
+        # contiguous, and only the ranges of frequent prefixes are split further
+        self._frequent = {}
+        keys = self._keys
+        stack = [(0, len(keys), 1)]
+        while stack:
+            lo, hi, length = stack.pop()
+            for prefix, group in groupby(range(lo, hi), key=lambda pos: keys[pos][:length]):
+                positions = list(group)
+                if len(prefix) < length or len(positions) <= SCAN_LIMIT:
+                    continue
+                self._frequent[prefix] = self._top({self._ids[pos] for pos in positions}, DEFAULT_LIMIT)
+                stack.append((positions[0], positions[-1] + 1, length + 1))
+
+    def _top(self, ids, limit: int) -> List[int]:
+        """The limit ids coming first in collation order."""
+        return heapq.nsmallest(limit, ids, key=self._rank.__getitem__)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def search(self, prefix: str, limit: int = DEFAULT_LIMIT) -> List[LookupResult]:
+        """
+        Items with a word starting with prefix, in Slovenian alphabetical order.
+
+        Args:
+            prefix: Searched text (case, punctuation and diacritics are ignored)
+            limit: Maximum number of results
+
+        Returns:
+            The first limit matching items
+        """
+        prefix = canonical_answer(prefix)
+        if not prefix:
+            return []
+
+        frequent = self._frequent.get(prefix)
+        if frequent is not None and limit <= DEFAULT_LIMIT:
+            return [self.results[i] for i in frequent[:limit]]
+
+        keys = self._keys
+        found = set()
+        pos = bisect_left(keys, prefix)
+        while pos < len(keys) and keys[pos].startswith(prefix):
+            found.add(self._ids[pos])
+            pos += 1
+
+        return [self.results[i] for i in self._top(found, limit)]
+
+
+def load_index(lessons=None) -> LookupIndex:
+    """Build the index of the lessons of the menu (default: all of them)."""
+    # imported here: vocab_snapshot loads the lessons lazily
+    from vocab_snapshot import load_lesson
+
+    if lessons is None:
+        lessons = LESSONS
+
+    def items(module: str) -> List[Item]:
+        dict_slo, _ = load_lesson(module)
+        return [item for same_question in dict_slo.values() for item in same_question]
+
+    return LookupIndex((lesson.module, items(lesson.module)) for lesson in lessons)
+
+
+_index = None
+
+
+def default_index() -> LookupIndex:
+    """Index of all the lessons, built on first use."""
+    global _index
+    if _index is None:
+        _index = load_index()
+    return _index
+
+
+def print_results(results: List[LookupResult]) -> None:
+    if not results:
+        print("nessun risultato")
+    for result in results:
+        print(result)
+
+
+def run_lookup() -> None:
+    """Interactive search, until an empty line."""
+    index = default_index()
+    while True:
+        try:
+            text = input("cerca (invio per tornare al menu): ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+        if not text:
+            return
+        print_results(index.search(text))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        print_results(default_index().search(" ".join(argv)))
+    else:
+        run_lookup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
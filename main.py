@@ -1,53 +1,36 @@
-import enota1
-import enota2
-import enota3
-import enota4
-import enota5
-import enota6
-import enota_extra
-import enota_numbers
-import enota_time
-import enota_verbs
+from lessons import LESSONS, get_lesson, load_manifest
+from utilities import run_lesson_menu
+from vocab_snapshot import load_lesson
+
+# the menu is built from the lesson registry and the precomputed manifest:
+# only the lesson chosen by the user is loaded
+manifest = load_manifest()
 
 while 1:
 
-    print("a: enota 1")
-    print("b: enota 2")
-    # print("c: enota 3")
-    # print("d: enota 4")
-    print("e: enota 5")
-    print("f: enota 6")
-    print("g: extra")
-    print("h: numbers")
-    print("i: time")
-    print("l: verbs")
+    for lesson in LESSONS:
+        if lesson.hidden:
+            continue
+        info = manifest.get(lesson.module)
+        if info:
+            print(f"{lesson.key}: {lesson.title} ({info['items']} quiz)")
+        else:
+            print(f"{lesson.key}: {lesson.title}")
     # print("z: tutti i test")
+    print("?: cerca una parola")
     print("q: esci")
 
     cmd = input("scegli il test:")
 
+    lesson = get_lesson(cmd)
     if cmd == 'q':
         print("bye!")
         exit(0)
-    elif cmd == 'a':
-        enota1.run_me()
-    elif cmd == 'b':
-        enota2.run_me()
-    elif cmd == 'c':
-        enota3.run_me()
-    elif cmd == 'd':
-        enota4.run_me()
-    elif cmd == 'e':
-        enota5.run_me()
-    elif cmd == 'f':
-        enota6.run_me()
-    elif cmd == 'g':
-        enota_extra.run_me()
-    elif cmd == 'h':
-        enota_numbers.run_me()
-    elif cmd == 'i':
-        enota_time.run_me()
-    elif cmd == 'l':
-        enota_verbs.run_me()
+    elif cmd == '?':
+        # imported here: the index loads all the lessons
+        from lookup import run_lookup
+        run_lookup()
+    elif lesson is not None:
+        run_lesson_menu(*load_lesson(lesson.module), lesson=lesson.module)
     else:
-        print("non ho capito la scelta!")
\ No newline at end of file
+        print("non ho capito la scelta!")
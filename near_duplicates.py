@@ -0,0 +1,298 @@
+"""
+Ricerca dei quasi-doppioni nelle lezioni
+
+Trova le voci quasi uguali (es. "moram plačati" / "moram plačati
+najemnino", "on/ona je" / "on je") tra tutti gli Item prodotti da
+process_dictionary, senza confrontare tutte le coppie:
+- ogni testo è ridotto all'insieme dei suoi shingle di caratteri (3-grammi)
+- una firma MinHash stima la similarità di Jaccard tra due insiemi
+- il locality-sensitive hashing (LSH) divide la firma in bande: solo i
+  testi con almeno una banda uguale diventano coppie candidate
+- ogni coppia candidata è verificata con la similarità di Jaccard esatta,
+  e le coppie sopra la soglia sono unite in gruppi (union-find)
+
+Il costo è lineare nel numero di testi più il numero di coppie candidate,
+quindi il controllo resta praticabile anche su mazzi di 10^5 voci.
+
+I doppioni esatti sono già segnalati da check_duplicates.py e qui vengono
+ignorati.
+
+Usage:
+    python near_duplicates.py                      # parole slovene
+    python near_duplicates.py --field italiansko   # traduzioni italiane
+    python near_duplicates.py --threshold 0.7 --strict
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import argparse
+import importlib
+import random
+import sys
+import zlib
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple, Iterable, FrozenSet
+
+from lessons import LESSONS
+from utilities import Item, VocabularyStore, process_dictionary, normalize_text, expand_alternatives
+
+SHINGLE_SIZE = 3
+
+# 32 bands of 4 rows: pairs with similarity 0.5 become candidates with
+# probability 0.87, 0.6 with 0.99, while pairs at 0.2 only with 0.05
+NUM_PERM = 128
+BANDS = 32
+DEFAULT_THRESHOLD = 0.5
+
+# LSH buckets with more texts than this are skipped: they come from very
+# common shingles and would bring back the quadratic number of pairs
+MAX_BUCKET = 200
+
+_PRIME = (1 << 61) - 1
+
+
+@dataclass
+class Occurrence:
+    """An Item of a lesson."""
+    lesson: str
+    category: str
+    slovensko: str
+    italiansko: str
+
+    def __str__(self) -> str:
+        return f"{self.lesson}, {self.category}: '{self.slovensko}' -> '{self.italiansko}'"
+
+
+@dataclass
+class Cluster:
+    """
+    Group of similar texts.
+
+    Attributes:
+        texts: The (normalized) similar texts
+        similarity: Highest Jaccard similarity between two texts of the group
+        occurrences: Items the texts come from
+    """
+    texts: List[str]
+    similarity: float
+    occurrences: List[Occurrence] = field(default_factory=list)
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> FrozenSet[int]:
+    """
+    Hashed character k-grams of a normalized text, padded with spaces so
+    that short words and word boundaries count too.
+    """
+    padded = f" {text} "
+    if len(padded) <= k:
+        return frozenset((zlib.crc32(padded.encode("utf-8")),))
+    return frozenset(zlib.crc32(padded[i:i + k].encode("utf-8")) for i in range(len(padded) - k + 1))
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Jaccard similarity of two sets."""
+    if not a and not b:
+        return 1.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+class MinHasher:
+    """
+    MinHash signatures with num_perm hash functions (a * x + b) mod p.
+
+    The probability that two signatures agree in a position equals the
+    Jaccard similarity of the two sets.
+
+    The same shingles recur in many texts, so the num_perm hashes of every
+    shingle are computed once and cached; a signature is then just the
+    element-wise minimum of the cached vectors.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._cache = {}
+
+    def _hashes(self, shingle: int) -> Tuple[int, ...]:
+        hashes = self._cache.get(shingle)
+        if hashes is None:
+            hashes = self._cache[shingle] = tuple([(a * shingle + b) % _PRIME for a, b in self._coefficients])
+        return hashes
+
+    def signature(self, shingle_set: FrozenSet[int]) -> Tuple[int, ...]:
+        vectors = [self._hashes(shingle) for shingle in shingle_set]
+        if len(vectors) == 1:
+            return vectors[0]
+        return tuple(map(min, *vectors))
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing of MinHash signatures.
+
+    A signature is split in bands of rows values; texts with the same
+    values in at least one band land in the same bucket and are candidate
+    pairs. With similarity s, the probability of becoming a candidate is
+    1 - (1 - s^rows)^bands.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, max_bucket: int = MAX_BUCKET):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_bucket = max_bucket
+        self._buckets = {}
+
+    def add(self, key: int, signature: Tuple[int, ...]) -> None:
+        rows = self.rows
+        for band in range(self.bands):
+            self._buckets.setdefault((band, signature[band * rows:(band + 1) * rows]), []).append(key)
+
+    def candidate_pairs(self) -> Iterable[Tuple[int, int]]:
+        """Distinct (i, j) pairs, i < j, sharing at least one bucket."""
+        seen = set()
+        for keys in self._buckets.values():
+            if len(keys) < 2 or len(keys) > self.max_bucket:
+                continue
+            for i, first in enumerate(keys):
+                for second in keys[i + 1:]:
+                    pair = (first, second) if first < second else (second, first)
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def find_near_duplicates(
+        items: Iterable[Tuple[str, Item]],
+        field_name: str = "slovensko",
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = NUM_PERM,
+        bands: int = BANDS,
+        seed: int = 1
+) -> List[Cluster]:
+    """
+    Group the items whose texts are similar.
+
+    Texts are normalized (case, whitespace) and their slash alternatives
+    expanded, so "on/ona je" is compared as "on je" and "ona je".
+
+    Args:
+        items: (lesson name, Item) pairs
+        field_name: Text compared, "slovensko" or "italiansko"
+        threshold: Minimum Jaccard similarity of the shingle sets
+        num_perm: MinHash signature length
+        bands: LSH bands (num_perm must be a multiple of bands)
+        seed: Seed of the MinHash functions
+
+    Returns:
+        Clusters of at least two different texts, most similar first
+    """
+    # distinct texts, each with the items it comes from
+    texts = []
+    text_ids = {}
+    occurrences = []
+    for lesson, item in items:
+        text = getattr(item, field_name)
+        if not text:
+            continue
+        occurrence = Occurrence(lesson, str(item.category), item.slovensko, item.italiansko)
+        for form in expand_alternatives(normalize_text(text)):
+            text_id = text_ids.get(form)
+            if text_id is None:
+                text_id = text_ids[form] = len(texts)
+                texts.append(form)
+                occurrences.append([])
+            occurrences[text_id].append(occurrence)
+
+    hasher = MinHasher(num_perm, seed)
+    index = LSHIndex(num_perm, bands)
+    shingle_sets = [shingles(text) for text in texts]
+    for text_id, shingle_set in enumerate(shingle_sets):
+        index.add(text_id, hasher.signature(shingle_set))
+
+    parent = list(range(len(texts)))
+    best = {}
+    for i, j in index.candidate_pairs():
+        similarity = jaccard(shingle_sets[i], shingle_sets[j])
+        if similarity < threshold:
+            continue
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+            best[root_i] = max(best.get(root_i, 0.0), best.pop(root_j, 0.0))
+        best[root_i] = max(best.get(root_i, 0.0), similarity)
+
+    groups = {}
+    for text_id in range(len(texts)):
+        groups.setdefault(_find(parent, text_id), []).append(text_id)
+
+    def originals(entries: List[Occurrence]) -> int:
+        return len({normalize_text(getattr(occurrence, field_name)) for occurrence in entries})
+
+    clusters = []
+    for root, members in groups.items():
+        # the same item may appear under several of its alternatives
+        cluster_occurrences = list({id(occurrence): occurrence
+                                    for text_id in members for occurrence in occurrences[text_id]}.values())
+        # a text shared only by identical entries is an exact duplicate
+        # (see check_duplicates.py), not a near one
+        if originals(cluster_occurrences) < 2:
+            continue
+        # an expanded alternative equal to another entry ("on/ona je", "on je")
+        shared = any(originals(occurrences[text_id]) > 1 for text_id in members)
+        similarity = 1.0 if shared else best[root]
+        clusters.append(Cluster([texts[text_id] for text_id in members], similarity, cluster_occurrences))
+
+    clusters.sort(key=lambda cluster: (-cluster.similarity, cluster.texts[0]))
+    return clusters
+
+
+def load_items() -> List[Tuple[str, Item]]:
+    """(lesson name, Item) pairs of all the lessons of the menu."""
+    result = []
+    for lesson in LESSONS:
+        module = importlib.import_module(lesson.module)
+        store = VocabularyStore()
+        process_dictionary(getattr(module, lesson.attr), store=store)
+        result.extend((lesson.module, item) for item in store.items())
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ricerca dei quasi-doppioni nelle lezioni")
+    parser.add_argument("--field", choices=("slovensko", "italiansko"), default="slovensko",
+                        help="testo da confrontare (default: slovensko)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"similarità minima, tra 0 e 1 (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--strict", action="store_true", help="exit status 1 se ci sono quasi-doppioni")
+    args = parser.parse_args(argv)
+
+    items = load_items()
+    clusters = find_near_duplicates(items, args.field, args.threshold)
+
+    for cluster in clusters:
+        print(f"≈ similarità {cluster.similarity:.2f}: {' | '.join(cluster.texts)}")
+        for occurrence in cluster.occurrences:
+            print(f"     - {occurrence}")
+    print()
+    if clusters:
+        print(f"🔍 GRUPPI DI QUASI-DOPPIONI: {len(clusters)}")
+    else:
+        print("✅ NESSUN QUASI-DOPPIONE trovato!")
+    print(f"   Totale voci analizzate: {len(items)}")
+    return 1 if args.strict and clusters else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
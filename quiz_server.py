@@ -0,0 +1,349 @@
+"""
+Quiz Server for the Local Network
+
+A small HTTP/JSON server (asyncio, standard library only) serving quizzes
+to many learners from a single process, e.g. to a classroom:
+
+    GET    /lessons                      lessons available
+    POST   /sessions                     start a session
+           {"lesson": "enota1", "slo2ita": true, "max_questions": 20,
+            "number_of_answers": 5, "seed": 0, "mode": "choice"}
+    GET    /sessions/<id>/question       the question to answer
+    POST   /sessions/<id>/answer         {"answer": 2} (option index) or
+                                         {"answer": "text"} (typed mode)
+    DELETE /sessions/<id>                end the session, with its results
+
+Modes: "choice" (multiple choice), "hard" (multiple choice with
+distractors close to the answer) and "typed" (see typed_quiz.py).
+
+All the lessons are loaded once when the server starts (see
+vocab_snapshot.load_lesson) and every session is a QuizSession on the
+same read-only dict_slo/dict_ita, sharing their distractor indexes.
+Multiple choice sessions are kept as their SessionState only (a few
+hundred bytes: seed, parameters and position), and the current question
+is recomputed from it at every request (see CompactSession). Requests are
+handled on the event loop without blocking: the handlers only touch
+in-memory data. Sessions idle for more than SESSION_TTL seconds are
+dropped.
+
+Usage:
+    python quiz_server.py                      # http://0.0.0.0:8080
+    python quiz_server.py --port 9000 --history
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import traceback
+import uuid
+from typing import Optional, List, Dict, Tuple, Iterable
+
+from history import AnswerHistory, default_history
+from lessons import LESSONS, Lesson
+from typed_quiz import TypedAnswerQuiz
+from utilities import Item, QuizSession, QuizQuestion, Feedback, SessionState, CompactSession, \
+    shared_distractor_index
+from vocab_snapshot import load_lesson
+
+DEFAULT_PORT = 8080
+
+# sessions idle for longer than this are dropped (seconds)
+SESSION_TTL = 60 * 60
+# idle sessions are looked for at most once in this interval (seconds)
+EXPIRY_INTERVAL = 60
+MAX_SESSIONS = 10000
+MAX_BODY = 64 * 1024
+
+MODES = ("choice", "hard", "typed")
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    """An error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def item_json(item: Item) -> Dict:
+    return {"slovensko": item.slovensko, "italiansko": item.italiansko}
+
+
+def question_json(question: Optional[QuizQuestion]) -> Optional[Dict]:
+    if question is None:
+        return None
+    return {"number": question.number, "total": question.total, "text": question.text,
+            "options": question.options, "slo2ita": question.slo2ita}
+
+
+def feedback_json(feedback: Feedback) -> Dict:
+    return {"correct": feedback.correct, "correct_answer": item_json(feedback.correct_answer),
+            "note": feedback.note, "latency": feedback.latency, "answered": feedback.answered,
+            "correct_answers": feedback.correct_answers, "score_percentage": feedback.score_percentage}
+
+
+class QuizServer:
+    """
+    Sessions of the server and the request handler.
+
+    handle() is independent of the transport, so the server logic can be
+    used (and tested) without sockets; serve() runs it over HTTP.
+
+    Attributes:
+        lessons: The lessons served, by module name
+        decks: (dict_slo, dict_ita) of every lesson, shared by all the sessions
+        history: Optional AnswerHistory where every answer is saved
+    """
+
+    def __init__(
+            self,
+            lessons: Iterable[Lesson] = LESSONS,
+            history: Optional[AnswerHistory] = None,
+            clock=time.monotonic
+    ):
+        """
+        Load the lessons and build their distractor indexes.
+
+        Args:
+            lessons: Lessons to serve
+            history: Optional AnswerHistory where every answer is saved
+            clock: Function returning the current time in seconds
+        """
+        self.lessons = {lesson.module: lesson for lesson in lessons}
+        self.history = history
+        self.clock = clock
+        self.decks = {}
+        for module in self.lessons:
+            dict_slo, dict_ita = self.decks[module] = load_lesson(module)
+            shared_distractor_index(dict_slo, True)
+            shared_distractor_index(dict_ita, False)
+        # session id -> [SessionState (multiple choice) or QuizSession (typed), last use]
+        self._sessions = {}
+        self._next_expiry = clock() + EXPIRY_INTERVAL
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def handle(self, method: str, path: str, body: Optional[Dict] = None) -> Tuple[int, Dict]:
+        """
+        Handle a request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            body: Decoded JSON body, if any
+
+        Returns:
+            Tuple (HTTP status, JSON response)
+        """
+        try:
+            parts = [part for part in path.split("?")[0].split("/") if part]
+            if parts == ["lessons"]:
+                self._allow(method, "GET")
+                return 200, {"lessons": [{"key": lesson.key, "module": lesson.module, "title": lesson.title}
+                                         for lesson in self.lessons.values()]}
+            if parts == ["sessions"]:
+                self._allow(method, "POST")
+                return 201, self._start(body or {})
+            if len(parts) == 2 and parts[0] == "sessions":
+                self._allow(method, "DELETE")
+                return 200, self._end(parts[1])
+            if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "question":
+                self._allow(method, "GET")
+                return 200, self._state(self._session(parts[1]))
+            if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "answer":
+                self._allow(method, "POST")
+                return 200, self._answer(parts[1], (body or {}).get("answer"))
+            raise HttpError(404, f"unknown path {path}")
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except Exception:
+            # a bug must not drop the connection of a (keep-alive) client without an answer
+            traceback.print_exc()
+            return 500, {"error": "internal error"}
+
+    @staticmethod
+    def _allow(method: str, allowed: str) -> None:
+        if method != allowed:
+            raise HttpError(405, f"use {allowed}")
+
+    def _start(self, body: Dict) -> Dict:
+        lesson = body.get("lesson")
+        if lesson not in self.decks:
+            raise HttpError(400, f"unknown lesson {lesson!r}")
+        mode = body.get("mode", "choice")
+        if mode not in MODES:
+            raise HttpError(400, f"unknown mode {mode!r}")
+        slo2ita = body.get("slo2ita", True)
+        max_questions = body.get("max_questions", 0)
+        number_of_answers = body.get("number_of_answers", 5)
+        seed = body.get("seed", 0)
+        # JSON booleans and integers only: "false" or 2.5 are not quietly converted
+        if not isinstance(slo2ita, bool) \
+                or not all(isinstance(value, int) and not isinstance(value, bool)
+                           for value in (max_questions, number_of_answers, seed)):
+            raise HttpError(400, "invalid session parameters")
+        if max_questions < 0 or not 2 <= number_of_answers <= 26:
+            raise HttpError(400, "invalid session parameters")
+
+        self._expire()
+        if len(self._sessions) >= MAX_SESSIONS:
+            raise HttpError(503, "too many sessions")
+
+        session_id = uuid.uuid4().hex
+        if mode == "typed":
+            dict_slo, dict_ita = self.decks[lesson]
+            quiz = TypedAnswerQuiz(dict_slo if slo2ita else dict_ita, seed, self.history, lesson)
+            session = QuizSession(quiz, slo2ita, max_questions, number_of_answers)
+            self._sessions[session_id] = [session, self.clock()]
+        else:
+            # multiple choice sessions are kept as their compact state only
+            state = SessionState(lesson, seed or random.randrange(1, 1 << 31), slo2ita, mode == "hard",
+                                 max_questions, number_of_answers)
+            self._sessions[session_id] = [state, self.clock()]
+            session = self._session(session_id)
+        response = {"session": session_id}
+        response.update(self._state(session))
+        return response
+
+    def _session(self, session_id: str) -> QuizSession:
+        """The session, resumed from its state if it is a compact one."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            raise HttpError(404, f"unknown session {session_id}")
+        entry[1] = self.clock()
+        session = entry[0]
+        if isinstance(session, SessionState):
+            dict_slo, dict_ita = self.decks[session.deck]
+            return CompactSession(dict_slo if session.slo2ita else dict_ita, session, self.history)
+        return session
+
+    @staticmethod
+    def _state(session: QuizSession) -> Dict:
+        question = session.next_question()
+        if question is None:
+            return {"question": None, "results": session.results()}
+        return {"question": question_json(question)}
+
+    def _answer(self, session_id: str, answer) -> Dict:
+        session = self._session(session_id)
+        question = session.next_question()
+        if question is None:
+            raise HttpError(400, "the session is over")
+        if question.options:
+            if not isinstance(answer, int) or isinstance(answer, bool):
+                raise HttpError(400, "answer must be an option index")
+        elif not isinstance(answer, str):
+            raise HttpError(400, "answer must be a text")
+        try:
+            feedback = session.submit(answer)
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        response = {"feedback": feedback_json(feedback)}
+        response.update(self._state(session))
+        return response
+
+    def _end(self, session_id: str) -> Dict:
+        session = self._session(session_id)
+        session.close()
+        del self._sessions[session_id]
+        return {"results": session.results()}
+
+    def _expire(self) -> None:
+        """Drop the sessions idle for longer than SESSION_TTL."""
+        now = self.clock()
+        if now < self._next_expiry and len(self._sessions) < MAX_SESSIONS:
+            return
+        self._next_expiry = now + EXPIRY_INTERVAL
+        limit = now - SESSION_TTL
+        for session_id in [sid for sid, entry in self._sessions.items() if entry[1] < limit]:
+            session = self._sessions.pop(session_id)[0]
+            if isinstance(session, QuizSession):
+                session.close()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of a connection (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split(None, 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, response = 413, {"error": "request too large"}
+                    keep_alive = False
+                else:
+                    data = await reader.readexactly(length) if length else b""
+                    keep_alive = (headers.get("connection", "").lower() != "close"
+                                  and version.strip().upper() == "HTTP/1.1")
+                    try:
+                        body = json.loads(data) if data else None
+                    except ValueError:
+                        status, response = 400, {"error": "invalid JSON"}
+                    else:
+                        if body is not None and not isinstance(body, dict):
+                            status, response = 400, {"error": "the body must be a JSON object"}
+                        else:
+                            status, response = self.handle(method.upper(), path, body)
+
+                payload = json.dumps(response, ensure_ascii=False).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                             + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Start listening (port 0: any free port, see server.sockets)."""
+        return await asyncio.start_server(self._client, host, port)
+
+
+async def serve(host: str, port: int, history: Optional[AnswerHistory] = None) -> None:
+    server = QuizServer(history=history)
+    listener = await server.start(host, port)
+    print(f"server dei quiz in ascolto su http://{host}:{port} ({len(server.decks)} lezioni)")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="server HTTP/JSON dei quiz per la rete locale")
+    parser.add_argument("--host", default="0.0.0.0", help="indirizzo (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"porta (default: {DEFAULT_PORT})")
+    parser.add_argument("--history", action="store_true", help="salva le risposte nella cronologia")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, default_history() if args.history else None))
+    except KeyboardInterrupt:
+        print("bye!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+Spaced-Repetition Quiz Mode
+
+Implements an SM-2 style scheduler on top of LanguageQuiz: every question
+(a key of dict_slo or dict_ita) has a review state (interval, ease, due
+time) that is kept in a local JSON file between sessions, and a review
+session asks the questions that are due, most overdue first.
+
+Due questions are kept in a binary heap ordered by due time, so the next
+due question is found in O(log n) without scanning the whole deck; a
+rescheduled question is simply pushed again and its old heap entry is
+skipped when it surfaces (lazy deletion). The due times are also kept
+in a sorted list, so the number of due questions is a binary search;
+keeping that list sorted costs O(size) per push or pop (a memmove of
+the list, a few microseconds for decks of thousands of words).
+
+Example:
+    >>> dict_slo, dict_ita = process_dictionary(enota)
+    >>> start_review(dict_slo, max_questions=20)
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import bisect
+import heapq
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Tuple, Iterator, Any
+
+from history import AnswerHistory
+from utilities import Item, LanguageQuiz, shared_distractor_index
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".learnslo_review.json")
+
+DAY = 24 * 60 * 60
+
+# a wrong answer is asked again after this delay (in seconds)
+RELEARN_DELAY = 10 * 60
+
+MIN_EASE = 1.3
+
+
+@dataclass
+class ReviewState:
+    """
+    SM-2 review state of a question.
+
+    Attributes:
+        interval: Days until the next review after a correct answer
+        ease: Ease factor (how fast the interval grows)
+        repetitions: Consecutive correct answers
+        lapses: Number of wrong answers
+        due: Time (seconds since the epoch) of the next review
+    """
+    interval: float = 0.0
+    ease: float = 2.5
+    repetitions: int = 0
+    lapses: int = 0
+    due: float = 0.0
+
+    def review(self, quality: int, now: float) -> None:
+        """
+        Update the state after an answer (SM-2).
+
+        Args:
+            quality: Answer quality, 0 (blackout) to 5 (perfect); < 3 is wrong
+            now: Time of the answer
+        """
+        if quality < 3:
+            self.repetitions = 0
+            self.lapses += 1
+            self.interval = 1.0
+            self.due = now + RELEARN_DELAY
+        else:
+            if self.repetitions == 0:
+                self.interval = 1.0
+            elif self.repetitions == 1:
+                self.interval = 6.0
+            else:
+                self.interval = round(self.interval * self.ease, 2)
+            self.repetitions += 1
+            self.due = now + self.interval * DAY
+
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+
+class ReviewStore:
+    """
+    Review states of all the questions ever answered, saved as a JSON file.
+
+    Keys are "<direction>:<question>", so the same word shares its review
+    state across lessons.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self.states = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for key, values in json.load(f).items():
+                    self.states[key] = ReviewState(*values)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    @staticmethod
+    def key(question: str, slo2ita: bool) -> str:
+        return f"{'slo' if slo2ita else 'ita'}:{question}"
+
+    def get(self, key: str) -> Optional[ReviewState]:
+        return self.states.get(key)
+
+    def put(self, key: str, state: ReviewState) -> None:
+        self.states[key] = state
+
+    def save(self) -> None:
+        """Write the states to disk (atomically, through a temporary file)."""
+        data = {key: [s.interval, s.ease, s.repetitions, s.lapses, s.due] for key, s in self.states.items()}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class DueQueue:
+    """
+    Priority queue of questions ordered by due time.
+
+    New questions (never reviewed) are due immediately, in random order.
+    Rescheduling a question pushes a new entry; outdated entries are
+    discarded lazily when they reach the top of the heap. The due times of
+    the scheduled questions are also kept in a sorted list, so that
+    count_due is a binary search; inserting in and deleting from that list
+    shifts its tail, O(size).
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self._heap = []
+        self._due = {}
+        self._times = []
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def push(self, question: str, due: float) -> None:
+        """Schedule (or reschedule) a question, O(size) (see the class docstring)."""
+        if question in self._due:
+            self._remove_time(self._due[question])
+        self._due[question] = due
+        bisect.insort(self._times, due)
+        heapq.heappush(self._heap, (due, self._rng.random(), question))
+
+    def build(self, entries: List[Tuple[str, float]]) -> None:
+        """Schedule many questions at once, O(n)."""
+        for question, due in entries:
+            self._due[question] = due
+            self._heap.append((due, self._rng.random(), question))
+        heapq.heapify(self._heap)
+        self._times = sorted(self._due.values())
+
+    def _remove_time(self, due: float) -> None:
+        del self._times[bisect.bisect_left(self._times, due)]
+
+    def _discard_outdated(self) -> None:
+        heap = self._heap
+        while heap and self._due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def peek(self) -> Optional[Tuple[float, str]]:
+        """(due time, question) of the first question due, None if empty."""
+        self._discard_outdated()
+        if not self._heap:
+            return None
+        due, _, question = self._heap[0]
+        return due, question
+
+    def pop_due(self, now: float, n: int = 1) -> List[str]:
+        """
+        Remove and return up to n questions due at time now, most overdue first.
+
+        Costs O(n log size) for the heap plus O(n size) to keep the sorted
+        due times up to date (see the class docstring).
+        """
+        result = []
+        while len(result) < n:
+            top = self.peek()
+            if top is None or top[0] > now:
+                break
+            heapq.heappop(self._heap)
+            del self._due[top[1]]
+            self._remove_time(top[0])
+            result.append(top[1])
+        return result
+
+    def count_due(self, now: float) -> int:
+        """Number of questions due at time now, O(log n)."""
+        return bisect.bisect_right(self._times, now)
+
+
+class SpacedRepetitionQuiz(LanguageQuiz):
+    """
+    LanguageQuiz asking the questions that are due for review.
+
+    Questions are scheduled with SM-2: a correct answer pushes the next
+    review further away (1 day, 6 days, then growing by the ease factor),
+    a wrong one brings the question back after a few minutes. The review
+    states are saved at the end of the session.
+
+    Attributes:
+        store: ReviewStore with the review states
+        queue: DueQueue of the questions of dict_lang
+    """
+
+    # the next question depends on the previous answers: no prefetching
+    prefetch = 0
+
+    def __init__(
+            self,
+            dict_lang: Dict[str, List[Item]],
+            seed: int = 0,
+            slo2ita: bool = True,
+            store: Optional[ReviewStore] = None,
+            clock=time.time,
+            history: Optional[AnswerHistory] = None,
+            lesson: Optional[str] = None
+    ):
+        """
+        Initialize the review session.
+
+        Args:
+            dict_lang: Dictionary mapping text to Item lists
+            seed: Random seed (0 for random, >0 for reproducible sequences)
+            slo2ita: Translation direction the states are kept for
+            store: ReviewStore (default: the one in the user's home directory)
+            clock: Function returning the current time in seconds
+            history: Optional AnswerHistory where every answer is saved
+            lesson: Optional lesson name saved with the history
+        """
+        super().__init__(dict_lang, seed, history, lesson)
+        self.slo2ita = slo2ita
+        self.store = store if store is not None else ReviewStore()
+        self.clock = clock
+
+        self.queue = DueQueue(self.rng)
+        entries = []
+        for question in dict_lang:
+            state = self.store.get(ReviewStore.key(question, slo2ita))
+            entries.append((question, state.due if state is not None else 0.0))
+        self.queue.build(entries)
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        """Number of questions due at time now (see DueQueue.count_due)."""
+        if now is None:
+            now = self.clock()
+        return self.queue.count_due(now)
+
+    def iter_questions(
+            self,
+            slo2ita: bool = True,
+            max_questions: int = 0,
+            number_of_answers: int = 5
+    ) -> Iterator[Tuple[str, Item, List[Item]]]:
+        """
+        Generate the questions that are due, most overdue first.
+
+        The next question is chosen only when requested, so questions
+        answered wrongly earlier in the session come back once due again.
+
+        Args:
+            slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
+            max_questions: Maximum questions (0 for all the due ones)
+            number_of_answers: Number of multiple choice options
+
+        Yields:
+            Tuples: (question_text, correct_answer, all_possible_answers)
+        """
+        index = shared_distractor_index(self.dict_lang, slo2ita, self.hard)
+
+        count = 0
+        while max_questions == 0 or count < max_questions:
+            due = self.queue.pop_due(self.clock())
+            if not due:
+                break
+            count += 1
+
+            yield self._build_question(due[0], index, number_of_answers, slo2ita)
+
+    def _expected_questions(self, max_questions: int) -> Optional[int]:
+        due = self.due_count()
+        return due if max_questions == 0 else min(due, max_questions)
+
+    def _record_answer(
+            self,
+            question: str,
+            correct_answer: Item,
+            user_answer: Item,
+            possible_answers: List[Item],
+            latency: float,
+            correct: bool
+    ) -> None:
+        super()._record_answer(question, correct_answer, user_answer, possible_answers, latency, correct)
+        now = self.clock()
+        key = ReviewStore.key(question, self.slo2ita)
+        state = self.store.get(key) or ReviewState()
+        state.review(4 if correct else 1, now)
+        self.store.put(key, state)
+        self.queue.push(question, state.due)
+
+    def run_quiz(
+            self,
+            slo2ita: bool = True,
+            max_questions: int = 0,
+            number_of_answers: int = 5
+    ) -> Dict[str, Any]:
+        try:
+            return super().run_quiz(slo2ita, max_questions, number_of_answers)
+        finally:
+            self.store.save()
+
+
+def start_review(
+        dict_lang: Dict[str, List[Item]],
+        int_seed: int = 0,
+        slo2ita: bool = True,
+        max_questions: int = 20,
+        number_of_answers: int = 5,
+        store: Optional[ReviewStore] = None,
+        history: Optional[AnswerHistory] = None,
+        lesson: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run a spaced-repetition review session (see start_tests).
+
+    Args:
+        dict_lang: Vocabulary dictionary
+        int_seed: Random seed for reproducible quizzes
+        slo2ita: Translation direction (True: Slo->Ita, False: Ita->Slo)
+        max_questions: Maximum questions to ask (0 for all the due ones)
+        number_of_answers: Multiple choice options count
+        store: ReviewStore (default: the one in the user's home directory)
+        history: Optional AnswerHistory where every answer is saved
+        lesson: Optional lesson name saved with the history
+
+    Returns:
+        Quiz results dictionary with statistics
+    """
+    quiz = SpacedRepetitionQuiz(dict_lang, int_seed, slo2ita, store, history=history, lesson=lesson)
+    if quiz.due_count() == 0:
+        print("Nessuna parola da ripassare, torna più tardi!")
+    return quiz.run_quiz(slo2ita, max_questions, number_of_answers)
@@ -0,0 +1,210 @@
+"""
+Timed Speed-Drill Mode
+
+A countdown session (60 seconds by default) asking as many questions as
+possible, for fluency practice with numbers and verb forms; the score is
+the number of answers per minute.
+
+The whole question stream is generated before the clock starts: enough
+questions for the fastest learner (MAX_ANSWERS_PER_SECOND for the whole
+duration), in passes over the deck, each key at most once per pass. No
+question generation falls inside the timed window, and the stream is the
+same for the same seed.
+
+An answer given after the end of the countdown is not counted.
+
+Example:
+    >>> dict_slo, dict_ita = process_dictionary(enota_numbers)
+    >>> start_speed_drill(dict_slo, duration=60)
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import time
+from itertools import islice
+from typing import Optional, List, Dict, Tuple, Iterator, Any
+
+from history import AnswerHistory
+from utilities import Item, LanguageQuiz
+
+DEFAULT_DURATION = 60
+
+# questions generated before the clock starts, per second of the drill
+MAX_ANSWERS_PER_SECOND = 2
+
+
+class SpeedDrillQuiz(LanguageQuiz):
+    """
+    LanguageQuiz asking questions until the countdown expires.
+
+    Attributes:
+        duration: Length of the drill in seconds
+        clock: Function returning the current time in seconds
+        started: Time the countdown started (None before the first question)
+    """
+
+    # the questions are generated before the countdown starts
+    prefetch = 0
+
+    def __init__(
+            self,
+            dict_lang: Dict[str, List[Item]],
+            seed: int = 0,
+            duration: float = DEFAULT_DURATION,
+            clock=time.monotonic,
+            history: Optional[AnswerHistory] = None,
+            lesson: Optional[str] = None,
+            hard: bool = False
+    ):
+        """
+        Initialize the drill.
+
+        Args:
+            dict_lang: Dictionary mapping text to Item lists
+            seed: Random seed (0 for random, >0 for reproducible sequences)
+            duration: Length of the drill in seconds
+            clock: Function returning the current time in seconds
+            history: Optional AnswerHistory where every answer is saved
+            lesson: Optional lesson name saved with the history
+            hard: Prefer distractors orthographically close to the correct answer
+        """
+        super().__init__(dict_lang, seed, history, lesson, hard)
+        self.duration = duration
+        self.clock = clock
+        self.started = None
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return None if self.started is None else self.started + self.duration
+
+    def remaining(self) -> float:
+        """Seconds left in the drill (the whole duration before it starts)."""
+        if self.started is None:
+            return self.duration
+        return max(0.0, self.deadline - self.clock())
+
+    def generate_questions(
+            self,
+            slo2ita: bool = True,
+            max_questions: int = 0,
+            number_of_answers: int = 5
+    ) -> List[Tuple[str, Item, List[Item]]]:
+        """
+        Generate the question stream of the drill.
+
+        Args:
+            slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
+            max_questions: Maximum questions (0: as many as can be answered
+                           in the duration)
+            number_of_answers: Number of multiple choice options
+
+        Returns:
+            List of tuples: (question_text, correct_answer, all_possible_answers)
+        """
+        count = int(self.duration * MAX_ANSWERS_PER_SECOND) + 1
+        if max_questions:
+            count = min(count, max_questions)
+        if not self.dict_lang:
+            return []
+
+        questions = []
+        while len(questions) < count:
+            passes = super().iter_questions(slo2ita, 0, number_of_answers)
+            questions.extend(islice(passes, count - len(questions)))
+        return questions
+
+    def iter_questions(
+            self,
+            slo2ita: bool = True,
+            max_questions: int = 0,
+            number_of_answers: int = 5
+    ) -> Iterator[Tuple[str, Item, List[Item]]]:
+        """
+        Generate the whole question stream, then start the countdown and
+        yield the questions until it expires.
+
+        Yields:
+            Tuples: (question_text, correct_answer, all_possible_answers)
+        """
+        questions = self.generate_questions(slo2ita, max_questions, number_of_answers)
+
+        self.started = self.clock()
+        for question in questions:
+            if self.remaining() <= 0:
+                break
+            yield question
+
+    def _expected_questions(self, max_questions: int) -> Optional[int]:
+        return None
+
+    def _show_question(self, question: str, possible_answers: List[Item], slo2ita: bool) -> None:
+        print(f"⏱ {self.remaining():.0f} s")
+        super()._show_question(question, possible_answers, slo2ita)
+
+    def _get_user_input(self, possible_answers: List[Item]) -> Optional[Item]:
+        """Read the answer; an answer given after the countdown does not count."""
+        answer = super()._get_user_input(possible_answers)
+        if answer is not None and self.remaining() <= 0:
+            print("Tempo scaduto!")
+            return None
+        return answer
+
+    def results(self) -> Dict[str, Any]:
+        """
+        Statistics of the drill.
+
+        Returns:
+            The results of LanguageQuiz.results, plus:
+            - duration: Seconds the drill lasted (less than the countdown if
+              the learner quit)
+            - answers_per_minute: Answers given per minute
+            - correct_per_minute: Correct answers per minute
+        """
+        results = super().results()
+
+        elapsed = 0.0
+        if self.started is not None:
+            elapsed = min(self.clock(), self.deadline) - self.started
+        minutes = elapsed / 60
+        results["duration"] = elapsed
+        results["answers_per_minute"] = self.number_of_questions / minutes if minutes else 0.0
+        results["correct_per_minute"] = self.correct_answers / minutes if minutes else 0.0
+        return results
+
+    def _display_results(self) -> Dict[str, Any]:
+        """Display the results, with the answers per minute."""
+        results = super()._display_results()
+        print(f"Risposte al minuto: {results['answers_per_minute']:.1f} "
+              f"(corrette: {results['correct_per_minute']:.1f})")
+        return results
+
+
+def start_speed_drill(
+        dict_lang: Dict[str, List[Item]],
+        int_seed: int = 0,
+        slo2ita: bool = True,
+        duration: float = DEFAULT_DURATION,
+        number_of_answers: int = 5,
+        history: Optional[AnswerHistory] = None,
+        lesson: Optional[str] = None,
+        hard: bool = False
+) -> Dict[str, Any]:
+    """
+    Run a speed drill (see start_tests).
+
+    Args:
+        dict_lang: Vocabulary dictionary
+        int_seed: Random seed for reproducible quizzes
+        slo2ita: Translation direction (True: Slo->Ita, False: Ita->Slo)
+        duration: Length of the drill in seconds
+        number_of_answers: Multiple choice options count
+        history: Optional AnswerHistory where every answer is saved
+        lesson: Optional lesson name saved with the history
+        hard: Prefer distractors orthographically close to the correct answer
+
+    Returns:
+        Quiz results dictionary with statistics and answers per minute
+    """
+    quiz = SpeedDrillQuiz(dict_lang, int_seed, duration, history=history, lesson=lesson, hard=hard)
+    return quiz.run_quiz(slo2ita, 0, number_of_answers)
@@ -0,0 +1,26 @@
+import unittest
+
+from benchmark import make_lesson, run_benchmarks, compare_results
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_make_lesson(self):
+        lesson = make_lesson(250, seed=3)
+        self.assertEqual(sum(len(rows) for rows in lesson.values()), 250)
+        self.assertEqual(lesson, make_lesson(250, seed=3))
+
+    def test_compare_results(self):
+        results = run_benchmarks(sizes=[200], questions=20)
+        self.assertEqual(compare_results(results, results), [])
+
+        slower = {"results": {"200": {"process_dictionary": {"rows_per_second": 1.0, "peak_memory_bytes": 1e12}}}}
+        faster = {"results": {"200": {"process_dictionary": {"rows_per_second": 1e12, "peak_memory_bytes": 1e12}}}}
+        self.assertEqual(compare_results(results, slower), [])
+        regressions = compare_results(results, faster, threshold=0.5)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("rows_per_second", regressions[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
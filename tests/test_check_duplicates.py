@@ -0,0 +1,27 @@
+import unittest
+
+from check_duplicates import analyze
+
+
+class TestCheckDuplicates(unittest.TestCase):
+
+    def test_analyze(self):
+        lessons = [
+            ("lesson1", {"cat1": (("jaz", "io"), ("danes", "oggi"), ("Tam", "Là"), ("", ""))}),
+            ("lesson2", {"cat2": (("jaz", "io"), ("Danes ", "Oggi"), (("tam", "tja"), "là"), ("kdo", "chi"))}),
+            ("lesson3", {"cat3": (("kdo", "chi è"),)}),
+        ]
+        report = analyze(lessons)
+
+        self.assertEqual(report.rows, 9)
+        self.assertEqual([[(o.lesson, o.position) for o in group] for group in report.exact],
+                         [[("lesson1", 0), ("lesson2", 0)], [("lesson2", 3), ("lesson3", 0)]])
+        self.assertEqual([group[0].slovensko for group in report.case_whitespace], ["danes", "Tam"])
+        self.assertEqual([group[0].slovensko for group in report.conflicts], ["kdo"])
+        self.assertTrue(report.has_problems())
+
+        self.assertFalse(analyze([("lesson1", {"cat1": (("jaz", "io"),)})]).has_problems())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import os
+import tempfile
+import unittest
+
+from exam_variants import generate_variants, make_variant, render_text
+
+
+class TestExamVariants(unittest.TestCase):
+
+    def test_variants_are_reproducible_and_distinct(self):
+        with tempfile.TemporaryDirectory() as parallel, tempfile.TemporaryDirectory() as serial:
+            written = list(generate_variants("enota_numbers", 12, questions=8, options=4, base_seed=5,
+                                             output=parallel, workers=2))
+            self.assertEqual(len(written), 12)
+            list(generate_variants("enota_numbers", 12, questions=8, options=4, base_seed=5,
+                                   output=serial, workers=0))
+
+            exams = []
+            for name in sorted(os.listdir(parallel)):
+                with open(os.path.join(parallel, name), encoding="utf-8") as f:
+                    text = f.read()
+                with open(os.path.join(serial, name), encoding="utf-8") as f:
+                    self.assertEqual(f.read(), text)
+                exams.append(json.loads(text))
+
+        self.assertEqual([exam["seed"] for exam in exams], list(range(5, 17)))
+        self.assertEqual(len({json.dumps(exam["questions"]) for exam in exams}), 12)
+        # variant 3 alone is the same as in the whole run
+        self.assertEqual(make_variant("enota_numbers", 3, 8, 8, 4), exams[3])
+
+    def test_answer_key(self):
+        exam = make_variant("enota_numbers", 0, 1, 3, 4)
+        for entry in exam["questions"]:
+            self.assertEqual(len(entry["options"]), 4)
+        key = ", ".join(f"{e['number']}-{'abcd'[e['answer']]}" for e in exam["questions"])
+        self.assertTrue(render_text(exam).endswith(f"Soluzioni: {key}\n"))
+
+    def test_seed_zero_is_refused(self):
+        with self.assertRaises(ValueError):
+            list(generate_variants("enota_numbers", 1, base_seed=0, output=tempfile.gettempdir(), workers=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
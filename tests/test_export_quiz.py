@@ -0,0 +1,61 @@
+import contextlib
+import csv
+import io
+import json
+import unittest
+
+from utilities import process_dictionary, LanguageQuiz
+from export_quiz import export_questions, generate_questions, warn_shortfall
+
+
+class TestExportQuiz(unittest.TestCase):
+
+    def setUp(self):
+        my_dict = {'category1': [(f'slo{i}', f'ita{i}') for i in range(20)]}
+        self.dict_slo, self.dict_ita = process_dictionary(my_dict)
+
+    def test_jsonl(self):
+        out = io.StringIO()
+        count = export_questions(LanguageQuiz(self.dict_slo, seed=1).iter_questions(number_of_answers=4), out,
+                                 number_of_answers=4)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, 20)
+        self.assertEqual(sorted(row["question"] for row in rows), sorted(self.dict_slo))
+        for row in rows:
+            self.assertEqual(row["options"][row["answer"]], row["correct"])
+            self.assertEqual(row["correct"], "ita" + row["question"][3:])
+
+    def test_csv(self):
+        out = io.StringIO()
+        export_questions(generate_questions(self.dict_ita, 5, 3, slo2ita=False), out, "csv", slo2ita=False,
+                         number_of_answers=3)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(rows[0], ["number", "question", "option_a", "option_b", "option_c",
+                                   "answer", "correct", "category"])
+        self.assertEqual(len(rows), 6)
+        for row in rows[1:]:
+            self.assertEqual(row[2 + "abc".index(row[5])], row[6])
+
+    def test_generated_questions_repeat_the_deck_in_passes(self):
+        questions = generate_questions(self.dict_slo, 50, 4, seed=3)
+        texts = [question for question, _, _ in questions]
+        self.assertEqual(len(texts), 50)
+        self.assertEqual(sorted(texts[:20]), sorted(self.dict_slo))
+        self.assertEqual(sorted(texts[20:40]), sorted(self.dict_slo))
+        self.assertNotEqual(texts[:20], texts[20:40])
+        self.assertEqual([q for q, _, _ in generate_questions(self.dict_slo, 50, 4, seed=3)], texts)
+
+    def test_deck_smaller_than_the_options(self):
+        dict_slo, _ = process_dictionary({'category1': [('ena', 'uno'), ('dva', 'due'), ('tri', 'tre')]})
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out):
+            count = export_questions(warn_shortfall(generate_questions(dict_slo, 6, 5), 5, err), out,
+                                     number_of_answers=5)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual((count, len(rows)), (6, 6))
+        self.assertTrue(all(len(row["options"]) == 3 for row in rows))
+        self.assertEqual(err.getvalue().count("Warning: Could only find 3 answers out of 5"), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
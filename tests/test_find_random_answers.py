@@ -0,0 +1,89 @@
+import unittest
+
+from utilities import QuestionGroup, process_dictionary, find_random_answers, DistractorIndex, \
+    EditNeighbourIndex, levenshtein
+
+
+class TestFindRandomAnswers(unittest.TestCase):
+
+    def setUp(self):
+        my_dict = {
+            'category1': (
+                ('jaz', 'io'),
+                ('ti', 'tu'),
+                ('on', 'lui'),
+                ('ona', 'lei'),
+                ('poklic', ('professione', 'mestiere')),
+                ('kako si?', 'come stai?'),
+                ('kdo je to?', 'chi è questo?'),
+                ('preberite', 'leggere', QuestionGroup("verbo")),
+                ('poslušajte', 'ascoltare', QuestionGroup("verbo")),
+                ('ponovite', 'ripetere', QuestionGroup("verbo")),
+            ),
+        }
+        self.dict_slo, self.dict_ita = process_dictionary(my_dict)
+
+    def test_answers_are_distinct(self):
+        index = DistractorIndex(self.dict_slo)
+        for _ in range(50):
+            answers = find_random_answers(self.dict_slo, 'jaz', self.dict_slo['jaz'][0], 4, index=index)
+            self.assertEqual(len(answers), 4)
+            self.assertIs(answers[0], self.dict_slo['jaz'][0])
+            self.assertEqual(len({a.italiansko for a in answers}), 4)
+
+    def test_same_question_is_never_a_distractor(self):
+        index = DistractorIndex(self.dict_slo)
+        correct = self.dict_slo['poklic'][0]
+        for _ in range(50):
+            answers = find_random_answers(self.dict_slo, 'poklic', correct, 5, index=index)
+            self.assertNotIn('mestiere', [a.italiansko for a in answers])
+
+    def test_prefers_question_group_and_features(self):
+        index = DistractorIndex(self.dict_slo)
+        for _ in range(50):
+            answers = find_random_answers(self.dict_slo, 'preberite', self.dict_slo['preberite'][0], 3, index=index)
+            self.assertEqual({a.slovensko for a in answers}, {'preberite', 'poslušajte', 'ponovite'})
+
+            answers = find_random_answers(self.dict_slo, 'kako si?', self.dict_slo['kako si?'][0], 2, index=index)
+            self.assertTrue(all(a.is_question for a in answers))
+
+    def test_small_dictionary_relaxes_constraints(self):
+        answers = find_random_answers(self.dict_ita, 'io', self.dict_ita['io'][0], 20, slo2ita=False)
+        # 'professione' and 'mestiere' both show 'poklic'
+        self.assertEqual(len(answers), len(self.dict_slo))
+
+    def test_synonyms_are_never_distractors(self):
+        my_dict = {'category1': (('tam', 'là'), ('tja', 'là'), ('tam', 'lì'), ('tukaj', 'qui'),
+                                 ('danes', 'oggi'), ('jutri', 'domani'))}
+        dict_slo, dict_ita = process_dictionary(my_dict)
+        index = DistractorIndex(dict_slo)
+        for _ in range(20):
+            answers = find_random_answers(dict_slo, 'tja', dict_slo['tja'][0], 4, index=index)
+            self.assertEqual(len(answers), 4)
+            self.assertNotIn('lì', [a.italiansko for a in answers])
+
+    def test_edit_neighbours(self):
+        self.assertEqual(levenshtein("jutri", "jutro"), 1)
+        self.assertEqual(levenshtein("kitten", "sitting"), 3)
+        self.assertEqual(levenshtein("kitten", "sitting", max_distance=1), 2)
+
+        index = EditNeighbourIndex(["jutri", "jutro", "danes", "plačam", "plačaš", "plača"])
+        self.assertEqual(index.neighbours("jutri"), ["jutro"])
+        self.assertEqual(index.neighbours("plačam"), ["plačaš", "plača"])
+        self.assertEqual(index.neighbours("včeraj"), [])
+
+    def test_hard_mode_prefers_close_answers(self):
+        my_dict = {'category1': (('jutri', 'domani'), ('jutro', 'mattina'), ('danes', 'oggi'),
+                                 ('včeraj', 'ieri'), ('zvečer', 'stasera'), ('juhe', 'zuppe'))}
+        dict_slo, dict_ita = process_dictionary(my_dict)
+        index = DistractorIndex(dict_ita, slo2ita=False, hard=True)
+        for _ in range(20):
+            answers = find_random_answers(dict_ita, 'domani', dict_ita['domani'][0], 2, slo2ita=False, index=index)
+            self.assertEqual([a.slovensko for a in answers], ['jutri', 'jutro'])
+
+        answers = find_random_answers(dict_ita, 'domani', dict_ita['domani'][0], 4, slo2ita=False, hard=True)
+        self.assertEqual(len(answers), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import builtins
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import history as history_module
+from history import AnswerHistory, item_key
+from utilities import process_dictionary, LanguageQuiz
+
+
+class TestAnswerHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "history.sqlite3")
+        self.dict_slo, _ = process_dictionary({'c': [(f'slo{i}', f'ita{i}') for i in range(10)]})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_record_and_query(self):
+        history = AnswerHistory(self.path, batch_size=4)
+        item, other = self.dict_slo['slo1'][0], self.dict_slo['slo2'][0]
+
+        session = history.start_session("lesson", slo2ita=True)
+        for i in range(10):
+            history.record(session, item, item if i % 2 else other, bool(i % 2), True, 0.5, [item, other])
+        history.flush()
+
+        entries = history.item_history(item_key(item))
+        self.assertEqual(len(entries), 10)
+        self.assertEqual(entries[0]["options"], ["ita1", "ita2"])
+        self.assertEqual(entries[0]["question"], "slo1")
+        self.assertEqual(sum(entry["correct"] for entry in entries), 5)
+
+        sessions = history.last_sessions(5)
+        self.assertEqual([(s["id"], s["lesson"], s["answers"], s["correct"]) for s in sessions],
+                         [(session, "lesson", 10, 5)])
+        history.close()
+
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        conn.close()
+
+    def test_quiz_saves_every_answer(self):
+        history = AnswerHistory(self.path)
+        answers = iter("abcq")
+        original_input = builtins.input
+        builtins.input = lambda prompt="": next(answers)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                LanguageQuiz(self.dict_slo, seed=1, history=history, lesson="test").run_quiz(number_of_answers=3)
+        finally:
+            builtins.input = original_input
+        history.close()
+
+        history = AnswerHistory(self.path)
+        self.assertEqual(history.last_sessions()[0]["answers"], 3)
+        history.close()
+
+
+    def test_failed_batch_is_retried(self):
+        class FlakyConnection(sqlite3.Connection):
+            failures = 1
+
+            def execute(self, sql, *args):
+                if sql.startswith("INSERT") and FlakyConnection.failures:
+                    FlakyConnection.failures -= 1
+                    raise sqlite3.OperationalError("database is locked")
+                return super().execute(sql, *args)
+
+        with mock.patch.object(history_module, "RETRY_DELAY", 0), \
+                mock.patch.object(history_module, "_connect", lambda path: sqlite3.connect(path, factory=FlakyConnection)):
+            history = AnswerHistory(self.path)
+            item = self.dict_slo['slo1'][0]
+            history.record(history.start_session("lesson"), item, item, True, True, 0.5, [item])
+            history.close()
+        self.assertEqual(FlakyConnection.failures, 0)
+
+        history = AnswerHistory(self.path)
+        self.assertEqual(len(history.item_history(item_key(item))), 1)
+        history.close()
+
+    def test_record_after_close_raises(self):
+        history = AnswerHistory(self.path)
+        session = history.start_session("lesson")
+        history.close()
+        history.close()
+        item = self.dict_slo['slo1'][0]
+        with self.assertRaises(RuntimeError):
+            history.record(session, item, item, True)
+        with self.assertRaises(RuntimeError):
+            history.start_session("lesson")
+
+
+if __name__ == '__main__':
+    unittest.main()
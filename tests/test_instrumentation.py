@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from instrumentation import metrics, Metrics, enabled_by_environment
+from utilities import process_dictionary, find_random_answers
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.was_enabled = metrics.enabled
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.enabled = self.was_enabled
+        metrics.reset()
+
+    def test_disabled_records_nothing(self):
+        m = Metrics()
+        with m.stage("x"):
+            m.count("c")
+            m.observe("h", 3)
+        self.assertEqual(m.to_dict(), {"stages": {}, "counters": {}, "histograms": {}})
+
+    def test_environment_variable(self):
+        for value, enabled in (("1", True), ("true", True), ("Yes", True), ("0", False), ("false", False), ("", False)):
+            with mock.patch.dict(os.environ, {"LEARNSLO_METRICS": value}):
+                self.assertEqual(enabled_by_environment(), enabled, value)
+
+    def test_threads_do_not_lose_updates(self):
+        m = Metrics(enabled=True)
+
+        def work():
+            for i in range(2000):
+                m.count("c")
+                m.observe("h", i % 3)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        data = m.to_dict()
+        self.assertEqual(data["counters"]["c"], 8000)
+        self.assertEqual(data["histograms"]["h"]["count"], 8000)
+
+    def test_pipeline_is_instrumented(self):
+        metrics.enable()
+        dict_slo, _ = process_dictionary({'c': (('jaz', 'io'), ('ti', 'tu'), ('on', 'lui'))})
+        find_random_answers(dict_slo, 'jaz', dict_slo['jaz'][0], 3)
+        find_random_answers(dict_slo, 'jaz', dict_slo['jaz'][0], 10)
+
+        data = metrics.to_dict()
+        self.assertEqual(data["stages"]["process_dictionary"]["count"], 1)
+        self.assertEqual(data["stages"]["distractor_index"]["count"], 2)
+        self.assertEqual(data["counters"]["items_created"], 3)
+        self.assertEqual(data["counters"]["distractor_shortfall"], 1)
+        self.assertEqual(data["histograms"]["distractor_attempts"]["count"], 2)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = metrics.export_json(os.path.join(tmpdir, "metrics.json"))
+            with open(path) as f:
+                self.assertEqual(json.load(f)["counters"], data["counters"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,229 @@
+import builtins
+import contextlib
+import io
+import json
+import random
+import threading
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from utilities import (process_dictionary, LanguageQuiz, QuestionPrefetcher, QuizSession, TimedAnswer, WordType,
+                       latency_percentiles, latency_statistics, shared_distractor_index, FeistelPermutation,
+                       SessionState, CompactSession)
+
+
+class TestLanguageQuiz(unittest.TestCase):
+
+    def setUp(self):
+        my_dict = {
+            'category1': [(f'slo{i}', f'ita{i}') for i in range(30)],
+        }
+        self.dict_slo, self.dict_ita = process_dictionary(my_dict)
+
+    def test_iter_questions_is_lazy(self):
+        quiz = LanguageQuiz(self.dict_slo, seed=1)
+        questions = quiz.iter_questions(number_of_answers=4)
+        self.assertIsInstance(questions, types.GeneratorType)
+
+        question, correct, options = next(questions)
+        self.assertIn(question, self.dict_slo)
+        self.assertIn(correct, self.dict_slo[question])
+        self.assertIn(correct, options)
+        self.assertEqual(len(options), 4)
+
+    def test_each_question_is_asked_once(self):
+        quiz = LanguageQuiz(self.dict_slo, seed=1)
+        questions = [q for q, _, _ in quiz.prepare_questions()]
+        self.assertEqual(sorted(questions), sorted(self.dict_slo))
+
+        questions = quiz.prepare_questions(max_questions=10)
+        self.assertEqual(len(questions), 10)
+
+    def _questions(self, quiz):
+        return [(q, c.id, [a.id for a in options]) for q, c, options in quiz.iter_questions(number_of_answers=4)]
+
+    def test_seeded_quizzes_are_reproducible(self):
+        expected = self._questions(LanguageQuiz(self.dict_slo, seed=7))
+
+        # interleaved quizzes and other users of the random module do not interfere
+        first = LanguageQuiz(self.dict_slo, seed=7).iter_questions(number_of_answers=4)
+        second = LanguageQuiz(self.dict_slo, seed=7).iter_questions(number_of_answers=4)
+        interleaved = []
+        for a, b in zip(first, second):
+            random.random()
+            interleaved.append(a)
+            self.assertEqual((a[0], a[1].id), (b[0], b[1].id))
+        self.assertEqual([(q, c.id, [a.id for a in options]) for q, c, options in interleaved], expected)
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: self._questions(LanguageQuiz(self.dict_slo, seed=7)), range(8)))
+        self.assertTrue(all(r == expected for r in results))
+
+        self.assertNotEqual(self._questions(LanguageQuiz(self.dict_slo, seed=8)), expected)
+
+    def test_prefetched_questions_are_the_same(self):
+        expected = self._questions(LanguageQuiz(self.dict_slo, seed=7))
+        quiz = LanguageQuiz(self.dict_slo, seed=7)
+        with contextlib.closing(QuestionPrefetcher(quiz.iter_questions(number_of_answers=4), 3)) as questions:
+            prefetched = [(q, c.id, [a.id for a in options]) for q, c, options in questions]
+        self.assertEqual(prefetched, expected)
+
+    def test_prefetch_errors_reach_the_quiz(self):
+        def questions():
+            yield 1
+            raise ValueError("broken")
+
+        prefetcher = QuestionPrefetcher(questions(), 2)
+        self.assertEqual(next(prefetcher), 1)
+        with self.assertRaises(ValueError):
+            next(prefetcher)
+        prefetcher.close()
+
+    def test_quitting_stops_the_prefetch_thread(self):
+        answers = iter("aq")
+        original_input = builtins.input
+        builtins.input = lambda prompt="": next(answers)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                LanguageQuiz(self.dict_slo, seed=1).run_quiz(number_of_answers=3)
+        finally:
+            builtins.input = original_input
+        self.assertFalse([t for t in threading.enumerate() if t.name == "question-prefetch"])
+
+    def test_shortfall_warning_is_shown_with_its_question(self):
+        dict_slo, _ = process_dictionary({'category1': [('ena', 'uno'), ('dva', 'due'), ('tri', 'tre')]})
+        answers = iter("aq")
+        original_input = builtins.input
+        builtins.input = lambda prompt="": next(answers)
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                LanguageQuiz(dict_slo, seed=1).run_quiz(number_of_answers=5)
+        finally:
+            builtins.input = original_input
+        # not printed by the prefetch thread in the middle of a prompt, but with each question
+        lines = output.getvalue().splitlines()
+        warnings = [i for i, line in enumerate(lines) if line.startswith("Warning: Could only find 3 answers")]
+        self.assertEqual(len(warnings), 2)
+        self.assertTrue(all(lines[i - 1].startswith("Quiz #") for i in warnings))
+
+    def test_latency_percentiles(self):
+        self.assertEqual(latency_percentiles([]), {"count": 0})
+        summary = latency_percentiles([float(t) for t in range(10, 0, -1)])
+        self.assertEqual((summary["count"], summary["p50"], summary["p90"], summary["max"]), (10, 5.0, 9.0, 10.0))
+        self.assertEqual(summary["mean"], 5.5)
+
+    def test_latency_statistics_are_grouped(self):
+        dict_slo, _ = process_dictionary({
+            'verbs': [('biti', 'essere', WordType.VERB), ('imeti', 'avere', WordType.VERB)],
+            'other': [('danes', 'oggi')],
+        })
+        biti, imeti, danes = (dict_slo[word][0] for word in ('biti', 'imeti', 'danes'))
+        answers = [TimedAnswer('biti', biti, 1.0, True), TimedAnswer('biti', biti, 3.0, True),
+                   TimedAnswer('imeti', imeti, 2.0, False), TimedAnswer('danes', danes, 8.0, True)]
+        stats = latency_statistics(answers)
+        self.assertEqual(stats["all"]["count"], 4)
+        self.assertEqual(stats["items"]["biti\tessere"]["max"], 3.0)
+        self.assertEqual(stats["categories"]["verbs"]["count"], 3)
+        self.assertEqual(stats["wordtypes"], {"VERB": latency_percentiles([1.0, 3.0, 2.0]),
+                                              "NOP": latency_percentiles([8.0])})
+
+    def test_results_include_response_times(self):
+        answers = iter("abq")
+        original_input = builtins.input
+        builtins.input = lambda prompt="": next(answers)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                quiz = LanguageQuiz(self.dict_slo, seed=1)
+                results = quiz.run_quiz(number_of_answers=3)
+        finally:
+            builtins.input = original_input
+        self.assertEqual(len(quiz.answers), 2)
+        self.assertTrue(all(answer.latency >= 0 for answer in quiz.answers))
+        self.assertEqual(results["latency"]["all"]["count"], 2)
+        self.assertEqual(results["latency"]["categories"]["category1"]["count"], 2)
+
+    def test_headless_session(self):
+        expected = self._questions(LanguageQuiz(self.dict_slo, seed=7))[:5]
+        session = QuizSession(LanguageQuiz(self.dict_slo, seed=7), max_questions=5, number_of_answers=4,
+                              clock=lambda: 10.0)
+        asked = []
+        question = session.next_question()
+        while question is not None:
+            self.assertIs(session.next_question(), question)  # until answered
+            self.assertEqual(question.options, [item.italiansko for item in session.possible_answers])
+            correct = session.possible_answers.index(session._current[1])
+            asked.append((question.text, session._current[1].id, [a.id for a in session.possible_answers]))
+            feedback = session.submit(correct if question.number % 2 else (correct + 1) % 4)
+            self.assertEqual(feedback.correct, bool(question.number % 2))
+            self.assertEqual(feedback.answered, question.number)
+            self.assertEqual(feedback.latency, 0.0)
+            question = session.next_question()
+
+        self.assertEqual(asked, expected)
+        self.assertTrue(session.finished)
+        results = session.results()
+        self.assertEqual((results["total_questions"], results["correct_answers"]), (5, 3))
+        with self.assertRaises(ValueError):
+            session.submit(0)
+
+    def test_submit_checks_the_option(self):
+        session = QuizSession(LanguageQuiz(self.dict_slo, seed=1), number_of_answers=3)
+        session.next_question()
+        with self.assertRaises(ValueError):
+            session.submit(3)
+        session.close()
+        self.assertIsNone(session.next_question())
+
+    def test_quizzes_share_the_distractor_index(self):
+        index = shared_distractor_index(self.dict_slo)
+        self.assertIs(shared_distractor_index(self.dict_slo), index)
+        self.assertIsNot(shared_distractor_index(self.dict_slo, slo2ita=False), index)
+        self.assertIsNot(shared_distractor_index(self.dict_ita), index)
+
+    def test_feistel_permutation(self):
+        for size in (0, 1, 2, 3, 30, 64, 1000):
+            permutation = FeistelPermutation(size, seed=5)
+            self.assertEqual(sorted(permutation[k] for k in range(size)), list(range(size)))
+        self.assertNotEqual([FeistelPermutation(30, 1)[k] for k in range(30)],
+                            [FeistelPermutation(30, 2)[k] for k in range(30)])
+        with self.assertRaises(IndexError):
+            FeistelPermutation(3, 1)[3]
+
+    def test_question_at_depends_on_seed_and_position_only(self):
+        quiz = LanguageQuiz(self.dict_slo, seed=9)
+        questions = [quiz.question_at(k, number_of_answers=4) for k in range(30)]
+        self.assertEqual(sorted(q for q, _, _ in questions), sorted(self.dict_slo))
+        for q, correct, options in questions:
+            self.assertIn(correct, options)
+
+        # any position, in any order, from a new quiz
+        q, correct, options = LanguageQuiz(self.dict_slo, seed=9).question_at(17, number_of_answers=4)
+        self.assertEqual((q, correct.id, [a.id for a in options]),
+                         (questions[17][0], questions[17][1].id, [a.id for a in questions[17][2]]))
+
+    def test_compact_session_resumes_from_its_state(self):
+        state = SessionState("test", seed=11, max_questions=4, number_of_answers=3)
+        session = CompactSession(self.dict_slo, state)
+        first = session.next_question()
+        session.submit(0)
+        second = session.next_question()
+
+        # the state is all it takes to resume the session, e.g. after JSON
+        restored = SessionState.from_dict(json.loads(json.dumps(state.to_dict())))
+        self.assertEqual(restored, state)
+        resumed = CompactSession(self.dict_slo, restored)
+        self.assertEqual(resumed.next_question(), second)
+        self.assertNotEqual(first.text, second.text)
+        while resumed.next_question() is not None:
+            resumed.submit(1)
+        self.assertEqual(restored.cursor, 4)
+        self.assertEqual(resumed.results()["total_questions"], 4)
+
+        with self.assertRaises(ValueError):
+            CompactSession(self.dict_slo, SessionState("test", seed=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
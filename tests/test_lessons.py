@@ -0,0 +1,31 @@
+import os
+import unittest
+
+from lessons import LESSONS, MANIFEST_PATH, get_lesson, load_manifest, source_path, content_hash
+
+
+class TestLessons(unittest.TestCase):
+
+    def test_registry(self):
+        keys = [lesson.key for lesson in LESSONS]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertNotIn('q', keys)
+        self.assertEqual(get_lesson('a').module, "enota1")
+        self.assertIsNone(get_lesson('q'))
+        for lesson in LESSONS:
+            self.assertIsNotNone(source_path(lesson.module), lesson.module)
+
+    def test_manifest_is_up_to_date(self):
+        """lessons_manifest.json must be rebuilt (python lessons.py) after editing a lesson."""
+        manifest = load_manifest()
+        self.assertEqual(sorted(manifest), sorted(lesson.module for lesson in LESSONS))
+        for lesson in LESSONS:
+            entry = manifest[lesson.module]
+            path = os.path.join(os.path.dirname(MANIFEST_PATH), entry["path"])
+            self.assertEqual(entry["sha256"], content_hash(path), lesson.module)
+            if not lesson.hidden:
+                self.assertGreater(entry["items"], 0, lesson.module)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest import mock
+
+import lookup
+from lookup import LookupIndex, collation_key
+from utilities import VocabularyStore, process_dictionary
+
+
+def lesson_items(lesson):
+    store = VocabularyStore()
+    process_dictionary(lesson, store=store)
+    return list(store.items())
+
+
+class TestLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LookupIndex([
+            ("enota1", lesson_items({"cat1": (("čas", "tempo"), ("cesta", "strada"), ("prosti čas", "tempo libero"),
+                                              ("dan", "giorno"), ("šola", "scuola"), ("sok", "succo"))})),
+            ("enota2", lesson_items({"cat2": (("časopis", "giornale"), ("zdaj/sedaj", "adesso"),
+                                              ("kaj je to?", "che cos'è?"))})),
+        ])
+
+    def test_collation(self):
+        words = ["šola", "čas", "zima", "cesta", "sok", "žaba", "dan"]
+        self.assertEqual(sorted(words, key=collation_key), ["cesta", "čas", "dan", "sok", "šola", "zima", "žaba"])
+
+    def test_prefix_and_folded_search(self):
+        self.assertEqual([r.item.slovensko for r in self.index.search("cas")], ["čas", "časopis", "prosti čas"])
+        self.assertEqual([r.item.slovensko for r in self.index.search("Časo")], ["časopis"])
+        # both languages, any word, in Slovenian order
+        self.assertEqual([r.item.slovensko for r in self.index.search("giorn")], ["časopis", "dan"])
+        self.assertEqual([r.item.slovensko for r in self.index.search("s")], ["cesta", "sok", "šola", "zdaj/sedaj"])
+        self.assertEqual([r.item.slovensko for r in self.index.search("cos'")], ["kaj je to?"])
+        self.assertEqual(self.index.search("xyz"), [])
+        self.assertEqual(self.index.search(" "), [])
+
+        result = self.index.search("sedaj")[0]
+        self.assertEqual(str(result), "[enota2, cat2] slovensko='zdaj/sedaj' italiano='adesso'")
+
+    def test_frequent_prefixes(self):
+        items = lesson_items({"cat": tuple((f"beseda{i}", f"parola{i}") for i in range(300))})
+        with mock.patch.object(lookup, "SCAN_LIMIT", 50):
+            index = LookupIndex([("big", items)])
+        self.assertIn("beseda", index._frequent)
+        for prefix in ("b", "beseda", "beseda1", "beseda12", "parola29"):
+            expected = sorted((r for r in index.results if any(
+                word.startswith(prefix) for text in (r.item.slovensko, r.item.italiansko) for word in text.split())),
+                key=lambda r: collation_key(r.item.slovensko))[:lookup.DEFAULT_LIMIT]
+            self.assertEqual(index.search(prefix), expected, prefix)
+
+
+if __name__ == '__main__':
+    unittest.main()
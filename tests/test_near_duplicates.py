@@ -0,0 +1,53 @@
+import unittest
+
+from near_duplicates import shingles, jaccard, MinHasher, LSHIndex, find_near_duplicates
+from utilities import VocabularyStore, process_dictionary, expand_alternatives
+
+
+def lesson_items(name, lesson):
+    store = VocabularyStore()
+    process_dictionary(lesson, store=store)
+    return [(name, item) for item in store.items()]
+
+
+class TestNearDuplicates(unittest.TestCase):
+
+    def test_expand_alternatives(self):
+        self.assertEqual(expand_alternatives("on/ona je"), ["on je", "ona je"])
+        self.assertEqual(expand_alternatives("zdaj/sedaj"), ["zdaj", "sedaj"])
+        self.assertEqual(expand_alternatives("dober dan"), ["dober dan"])
+
+    def test_minhash_estimates_jaccard(self):
+        a = shingles("moram plačati")
+        b = shingles("moram plačati najemnino")
+        hasher = MinHasher(num_perm=256)
+        sig_a, sig_b = hasher.signature(a), hasher.signature(b)
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / 256
+        self.assertAlmostEqual(estimate, jaccard(a, b), delta=0.1)
+        self.assertEqual(hasher.signature(a), sig_a)
+
+        with self.assertRaises(ValueError):
+            LSHIndex(num_perm=100, bands=32)
+
+    def test_find_near_duplicates(self):
+        items = lesson_items("lesson1", {"cat1": (("moram plačati", "devo pagare"),
+                                                  ("on/ona je", "lui/lei è"),
+                                                  ("jabolko", "mela"))})
+        items += lesson_items("lesson2", {"cat2": (("moram plačati najemnino", "devo pagare l'affitto"),
+                                                   ("on je", "lui è"),
+                                                   ("jabolko", "mela"),
+                                                   ("hvala", "grazie"))})
+        clusters = find_near_duplicates(items)
+
+        self.assertEqual([(cluster.texts, cluster.similarity) for cluster in clusters][0], (["on je"], 1.0))
+        self.assertEqual(len(clusters), 2)
+        self.assertEqual(clusters[1].texts, ["moram plačati", "moram plačati najemnino"])
+        self.assertGreaterEqual(clusters[1].similarity, 0.5)
+        self.assertEqual({o.lesson for o in clusters[1].occurrences}, {"lesson1", "lesson2"})
+
+        # exact duplicates (jabolko) are left to check_duplicates
+        self.assertFalse(any("jabolko" in cluster.texts for cluster in clusters))
+
+
+if __name__ == '__main__':
+    unittest.main()
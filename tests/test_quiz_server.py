@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+import io
+import json
+import unittest
+
+from lessons import Lesson
+from quiz_server import QuizServer
+
+
+async def request(port, method, path, body=None):
+    """Send a request to the server on localhost, return (status, JSON response)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+class TestQuizServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = QuizServer([Lesson('h', "numbers", "enota_numbers")])
+
+    def test_session_over_http(self):
+        async def scenario():
+            listener = await self.server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                status, lessons = await request(port, "GET", "/lessons")
+                self.assertEqual((status, lessons["lessons"][0]["module"]), (200, "enota_numbers"))
+
+                status, started = await request(port, "POST", "/sessions",
+                                                {"lesson": "enota_numbers", "max_questions": 3, "seed": 5})
+                self.assertEqual(status, 201)
+                session = started["session"]
+                self.assertEqual(len(started["question"]["options"]), 5)
+
+                answered = 0
+                state = started
+                while state["question"] is not None:
+                    status, state = await request(port, "POST", f"/sessions/{session}/answer", {"answer": 0})
+                    self.assertEqual(status, 200)
+                    answered += 1
+                    self.assertEqual(state["feedback"]["answered"], answered)
+                self.assertEqual((answered, state["results"]["total_questions"]), (3, 3))
+
+                status, ended = await request(port, "DELETE", f"/sessions/{session}")
+                self.assertEqual((status, ended["results"]["total_questions"]), (200, 3))
+                status, _ = await request(port, "GET", f"/sessions/{session}/question")
+                self.assertEqual(status, 404)
+            finally:
+                listener.close()
+                await listener.wait_closed()
+
+        asyncio.run(scenario())
+
+    def test_sessions_are_independent(self):
+        first = self.server.handle("POST", "/sessions", {"lesson": "enota_numbers", "seed": 3})[1]
+        second = self.server.handle("POST", "/sessions", {"lesson": "enota_numbers", "seed": 3})[1]
+        self.assertNotEqual(first["session"], second["session"])
+        self.assertEqual(first["question"], second["question"])
+
+        self.server.handle("POST", f"/sessions/{first['session']}/answer", {"answer": 1})
+        status, state = self.server.handle("GET", f"/sessions/{second['session']}/question")
+        self.assertEqual(state["question"], second["question"])
+
+    def test_typed_session(self):
+        started = self.server.handle("POST", "/sessions",
+                                     {"lesson": "enota_numbers", "mode": "typed", "max_questions": 1})[1]
+        self.assertEqual(started["question"]["options"], [])
+        path = f"/sessions/{started['session']}/answer"
+        self.assertEqual(self.server.handle("POST", path, {"answer": 0})[0], 400)
+        status, state = self.server.handle("POST", path, {"answer": "?"})
+        self.assertEqual((status, state["feedback"]["correct"], state["question"]), (200, False, None))
+
+    def test_errors(self):
+        self.assertEqual(self.server.handle("POST", "/sessions", {"lesson": "nope"})[0], 400)
+        self.assertEqual(self.server.handle("GET", "/sessions")[0], 405)
+        self.assertEqual(self.server.handle("GET", "/nowhere")[0], 404)
+        started = self.server.handle("POST", "/sessions", {"lesson": "enota_numbers"})[1]
+        path = f"/sessions/{started['session']}/answer"
+        self.assertEqual(self.server.handle("POST", path, {"answer": "a"})[0], 400)
+        self.assertEqual(self.server.handle("POST", path, {"answer": 99})[0], 400)
+
+    def test_invalid_session_parameters(self):
+        for parameters in ({"slo2ita": "false"}, {"slo2ita": 0}, {"max_questions": 2.5},
+                           {"max_questions": True}, {"number_of_answers": "5"}, {"seed": 1e400}):
+            body = dict(parameters, lesson="enota_numbers")
+            self.assertEqual(self.server.handle("POST", "/sessions", body),
+                             (400, {"error": "invalid session parameters"}), parameters)
+
+    def test_internal_error(self):
+        server = QuizServer([])
+        server._start = None
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(server.handle("POST", "/sessions", {}), (500, {"error": "internal error"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import builtins
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from utilities import process_dictionary
+from spaced_repetition import ReviewState, ReviewStore, DueQueue, SpacedRepetitionQuiz, DAY, RELEARN_DELAY
+
+
+class TestSpacedRepetition(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "review.json")
+        self.dict_slo, _ = process_dictionary({'c': [(f'slo{i}', f'ita{i}') for i in range(20)]})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_sm2_intervals(self):
+        state = ReviewState()
+        state.review(4, 0)
+        self.assertEqual(state.due, DAY)
+        state.review(4, 0)
+        self.assertEqual(state.due, 6 * DAY)
+        state.review(4, 0)
+        self.assertEqual(state.interval, 15.0)
+        state.review(1, 100)
+        self.assertEqual((state.repetitions, state.lapses, state.due), (0, 1, 100 + RELEARN_DELAY))
+
+    def test_due_queue(self):
+        queue = DueQueue()
+        queue.build([("a", 30), ("b", 10), ("c", 20)])
+        queue.push("b", 40)  # rescheduled: the old entry is skipped
+        self.assertEqual([queue.count_due(now) for now in (10, 20, 30, 40)], [0, 1, 2, 3])
+        self.assertEqual(queue.pop_due(25, n=5), ["c"])
+        self.assertEqual(queue.count_due(100), 2)
+        self.assertEqual(queue.pop_due(100, n=5), ["a", "b"])
+        self.assertEqual(queue.pop_due(100), [])
+
+    def test_review_session(self):
+        now = [1000.0]
+        answers = iter("aaaaaaaaaaq")
+        store = ReviewStore(self.path)
+        quiz = SpacedRepetitionQuiz(self.dict_slo, seed=1, store=store, clock=lambda: now[0])
+        self.assertEqual(quiz.due_count(), 20)
+
+        original_input = builtins.input
+        builtins.input = lambda prompt="": next(answers)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = quiz.run_quiz(max_questions=10, number_of_answers=2)
+        finally:
+            builtins.input = original_input
+
+        self.assertEqual(results["total_questions"], 10)
+        self.assertEqual(quiz.due_count(), 10)
+
+        # states are saved and reloaded
+        store = ReviewStore(self.path)
+        self.assertEqual(len(store.states), 10)
+        quiz = SpacedRepetitionQuiz(self.dict_slo, seed=1, store=store, clock=lambda: now[0])
+        self.assertEqual(quiz.due_count(), 10)
+        self.assertEqual(quiz.due_count(now[0] + RELEARN_DELAY), 10 + results["total_questions"] - results["correct_answers"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import builtins
+import contextlib
+import io
+import unittest
+
+from utilities import process_dictionary
+from speed_drill import SpeedDrillQuiz
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSpeedDrill(unittest.TestCase):
+
+    def setUp(self):
+        my_dict = {'numbers': [(f'slo{i}', f'ita{i}') for i in range(5)]}
+        self.dict_slo, _ = process_dictionary(my_dict)
+
+    def test_questions_are_generated_before_the_clock_starts(self):
+        clock = FakeClock()
+        quiz = SpeedDrillQuiz(self.dict_slo, seed=2, duration=10, clock=clock)
+        questions = quiz.iter_questions(number_of_answers=3)
+        next(questions)
+        self.assertEqual(quiz.started, 1000.0)
+
+        # more questions than keys: the deck is repeated, each key once per pass
+        stream = SpeedDrillQuiz(self.dict_slo, seed=2, duration=10).generate_questions(number_of_answers=3)
+        self.assertEqual(len(stream), 21)
+        self.assertEqual(sorted(q for q, _, _ in stream[:5]), sorted(self.dict_slo))
+        again = SpeedDrillQuiz(self.dict_slo, seed=2, duration=10).generate_questions(number_of_answers=3)
+        self.assertEqual([(q, c.id) for q, c, _ in stream], [(q, c.id) for q, c, _ in again])
+
+    def test_drill_stops_at_the_deadline(self):
+        clock = FakeClock()
+
+        def answer(prompt=""):
+            # every answer takes 4 seconds: the third one comes after the deadline
+            clock.now += 4
+            return "a"
+
+        quiz = SpeedDrillQuiz(self.dict_slo, seed=2, duration=10, clock=clock)
+        original_input = builtins.input
+        builtins.input = answer
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = quiz.run_quiz(number_of_answers=3)
+        finally:
+            builtins.input = original_input
+
+        self.assertEqual(results["total_questions"], 2)
+        self.assertEqual(results["duration"], 10)
+        self.assertEqual(results["answers_per_minute"], 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import builtins
+import contextlib
+import io
+import unittest
+
+from utilities import process_dictionary, answer_forms, canonical_answer, QuizSession
+from typed_quiz import AnswerGrader, TypedAnswerQuiz
+
+
+class TestTypedQuiz(unittest.TestCase):
+
+    def setUp(self):
+        my_dict = {'c': (('dan', '(il) giorno'), ('zdaj/sedaj', 'adesso'), ('žlička', 'cucchiaino'),
+                         ('tam', 'là'), ('tja', 'là'), ('tam', 'lì'), ('kaj si po poklicu?', 'che lavoro fai?'))}
+        self.dict_slo, self.dict_ita = process_dictionary(my_dict)
+
+    def test_answer_forms(self):
+        self.assertEqual(answer_forms("(il) giorno"), {"giorno", "il giorno"})
+        self.assertEqual(answer_forms("zdaj/sedaj"), {"zdaj", "sedaj"})
+        self.assertEqual(answer_forms("on/ona je"), {"on je", "ona je"})
+        self.assertEqual(canonical_answer(" Žlička? "), "zlicka")
+
+    def test_grading(self):
+        grader = AnswerGrader(slo2ita=True)
+        giorno = self.dict_slo['dan']
+        self.assertEqual(grader.grade("Giorno", giorno).distance, 0)
+        self.assertEqual(grader.grade("il giorno", giorno).distance, 0)
+        self.assertEqual(grader.grade("giormo", giorno).distance, 1)
+        self.assertFalse(grader.grade("notte", giorno).correct)
+
+        grader = AnswerGrader(slo2ita=False)
+        self.assertTrue(grader.grade("zlicka", self.dict_ita['cucchiaino']).correct)
+        self.assertTrue(grader.grade("sedaj", self.dict_ita['adesso']).correct)
+        # no typos accepted in short answers
+        self.assertFalse(grader.grade("zda", self.dict_ita['adesso']).correct)
+
+    def test_typed_session(self):
+        answers = {"là": "lì", "lì": "là", "(il) giorno": "giorno", "adesso": "adeso",
+                   "cucchiaino": "forchetta", "che lavoro fai?": "che lavoro fai"}
+        quiz = TypedAnswerQuiz(self.dict_slo, seed=3)
+        questions = {question: correct for question, correct, _ in quiz.prepare_questions()}
+        replies = iter([answers[questions[question].italiansko] for question in questions])
+
+        quiz = TypedAnswerQuiz(self.dict_slo, seed=3)
+        original_input = builtins.input
+        builtins.input = lambda prompt="": next(replies)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = quiz.run_quiz()
+        finally:
+            builtins.input = original_input
+
+        # synonyms are accepted ("lì" for "tja"), wrong answers are not
+        self.assertEqual(results["total_questions"], 6)
+        self.assertEqual(results["correct_answers"], 5)
+        self.assertEqual([item.slovensko for item in quiz.wrong_answers], ['žlička'])
+
+    def test_headless_typed_session(self):
+        session = QuizSession(TypedAnswerQuiz(self.dict_slo, seed=3), max_questions=1)
+        question = session.next_question()
+        self.assertEqual(question.options, [])
+        with self.assertRaises(ValueError):
+            session.submit(0)
+        answer = session.possible_answers[0].italiansko
+        feedback = session.submit(answer[:-1] + "x" if len(answer) > 8 else answer)
+        self.assertTrue(feedback.correct)
+        self.assertIsNone(session.next_question())
+
+
+if __name__ == '__main__':
+    unittest.main()
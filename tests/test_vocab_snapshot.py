@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+import enota1
+from utilities import process_dictionary
+from vocab_snapshot import compile_snapshot, Snapshot, SnapshotError, load_lesson
+
+
+class TestVocabSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "vocabulary.snapshot")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_snapshot_matches_process_dictionary(self):
+        compile_snapshot(self.path, {"enota1": "enota"})
+        snapshot = Snapshot(self.path)
+        try:
+            self.assertTrue(snapshot.is_fresh("enota1"))
+            self.assertFalse(snapshot.is_fresh("enota2"))
+
+            for expected, loaded in zip(process_dictionary(enota1.enota), snapshot.load_lesson("enota1")):
+                self.assertEqual(list(expected), list(loaded))
+                for key in expected:
+                    self.assertEqual([str(item) for item in expected[key]], [str(item) for item in loaded[key]])
+                    self.assertEqual([item.question_groups for item in expected[key]],
+                                     [item.question_groups for item in loaded[key]])
+        finally:
+            snapshot.close()
+
+    def test_missing_or_corrupt_snapshot(self):
+        with self.assertRaises(SnapshotError):
+            Snapshot(self.path)
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot at all")
+        with self.assertRaises(SnapshotError):
+            Snapshot(self.path)
+
+        # falls back to the lesson module
+        dict_slo, dict_ita = load_lesson("enota1", self.path)
+        self.assertIn("dober dan", dict_slo)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from utilities import VocabularyStore, Item, WordType, Level, Gender, WebLink, QuestionGroup, SentenceCategory, \
+    VocabularyRegistry, process_dictionary
+
+
+class TestVocabularyStore(unittest.TestCase):
+
+    def test_item_view_fields(self):
+        store = VocabularyStore()
+        item = Item(slovensko="Kako si?", italiansko="Come stai?", category="pozdravi", bookpage=7,
+                    wordtype=WordType.SENTENCE, level=Level.EASY, gender=Gender.NEUTRAL,
+                    weblink=WebLink("http://example.com"), question_groups=[QuestionGroup("domanda")],
+                    store=store)
+
+        self.assertEqual(len(store), 1)
+        self.assertEqual(item.slovensko, "kako si?")
+        self.assertEqual(item.italiansko, "come stai?")
+        self.assertEqual(item.category, "pozdravi")
+        self.assertEqual(item.bookpage, 7)
+        self.assertEqual(item.wordtype, WordType.SENTENCE)
+        self.assertEqual(item.level, Level.EASY)
+        self.assertEqual(item.gender, Gender.NEUTRAL)
+        self.assertEqual(item.sentence_category, SentenceCategory.INTERROGATIVE)
+        self.assertEqual(item.weblink, WebLink("http://example.com"))
+        self.assertEqual(item.question_groups, [QuestionGroup("domanda")])
+        self.assertTrue(item.is_question)
+        self.assertTrue(item.slo_multiple_words)
+        self.assertTrue(item.ita_multiple_words)
+        self.assertFalse(item.ends_with_ite)
+        self.assertEqual(item.slovensko_num_words, 2)
+        self.assertEqual(store.question_groups, {"domanda": [item.id]})
+
+    def test_views_are_equal_and_hashable(self):
+        store = VocabularyStore()
+        dict_slo, dict_ita = process_dictionary({'category1': (('preberite', ('leggere', 'leggete')),)}, store=store)
+
+        self.assertEqual(len(store), 2)
+        self.assertEqual(dict_slo['preberite'], [dict_ita['leggere'][0], dict_ita['leggete'][0]])
+        self.assertEqual(len({store.item(0), dict_ita['leggere'][0]}), 1)
+        self.assertNotEqual(store.item(0), store.item(1))
+        self.assertTrue(store.item(1).ends_with_ite)
+
+    def test_strings_are_interned(self):
+        store = VocabularyStore()
+        for i in range(100):
+            store.add(f"beseda{i}", "parola", "kategorija")
+        self.assertEqual(store.intern("parola"), store.intern("parola"))
+        self.assertEqual(len(store._strings), 102)
+
+    def test_synonym_classes(self):
+        store = VocabularyStore()
+        dict_slo, _ = process_dictionary({'cat': (("Tam", "Là"), ("tja", "Là"), ("tam", "lì"), ("no", "sì"),
+                                                  ("ja", "sì"), ("a", "no"), ("x", ""), ("y", ""))}, store=store)
+        classes = [store.synonym_class(i) for i in range(len(store))]
+
+        self.assertEqual(len({classes[0], classes[1], classes[2]}), 1)
+        self.assertEqual(classes[3], classes[4])
+        # the same text in the two languages ("no") links nothing
+        self.assertNotEqual(classes[3], classes[5])
+        self.assertNotEqual(classes[0], classes[3])
+        # neither do empty translations
+        self.assertNotEqual(classes[6], classes[7])
+        self.assertEqual(dict_slo['tja'][0].synonym_class, classes[0])
+
+        # classes are recomputed when items are added
+        store.add("tamle", "lì")
+        self.assertEqual(store.synonym_class(8), store.synonym_class(0))
+
+
+class TestVocabularyRegistry(unittest.TestCase):
+
+    def test_lessons_are_processed_once(self):
+        lesson = {'category1': (('jaz', 'io', QuestionGroup("zaimek")), ('ti', 'tu', QuestionGroup("zaimek")))}
+        registry = VocabularyRegistry()
+
+        deck = registry.load(lesson)
+        for _ in range(10):
+            self.assertIs(registry.load(lesson), deck)
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(len(deck.store), 2)
+        self.assertEqual(len(deck.question_groups()["zaimek"]), 2)
+
+    def test_lessons_do_not_share_question_groups(self):
+        registry = VocabularyRegistry()
+        first = registry.load({'c': (('jaz', 'io', QuestionGroup("zaimek")),)})
+        second = registry.load({'c': (('ti', 'tu', QuestionGroup("zaimek")),)})
+
+        self.assertIsNot(first.store, second.store)
+        self.assertEqual([item.slovensko for item in first.question_groups()["zaimek"]], ['jaz'])
+        self.assertEqual([item.slovensko for item in second.question_groups()["zaimek"]], ['ti'])
+
+
+if __name__ == '__main__':
+    unittest.main()
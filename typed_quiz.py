@@ -0,0 +1,237 @@
+"""
+Typed-Answer Quiz Mode
+
+Instead of choosing among multiple options, the learner types the
+translation. Grading is tolerant:
+- case, punctuation and missing diacritics are ignored ("zlicko" for "žličko")
+- parenthetical hints are optional ("giorno" for "(il) giorno")
+- every slash alternative is accepted ("sedaj" for "zdaj/sedaj")
+- small typos are accepted (one edit for answers of 4-8 letters, two for
+  longer ones), with a warning
+
+The accepted forms of every item are compiled once (see
+utilities.answer_forms) and looked up in a set; only when the typed answer
+is not an accepted form, it is compared with the forms of similar length
+with an early-exit edit distance, bounded by the typo tolerance.
+
+Example:
+    >>> dict_slo, dict_ita = process_dictionary(enota)
+    >>> start_typed_test(dict_slo, max_questions=20)
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Tuple, Iterator, Any, FrozenSet, Iterable
+
+from history import AnswerHistory
+from utilities import Item, LanguageQuiz, answer_forms, canonical_answer, levenshtein, random_order
+
+
+def typo_tolerance(length: int) -> int:
+    """Edits accepted in an answer of the given length."""
+    if length < 4:
+        return 0
+    if length < 9:
+        return 1
+    return 2
+
+
+@dataclass
+class Grade:
+    """
+    Result of grading a typed answer.
+
+    Attributes:
+        correct: The answer is accepted
+        distance: Edits between the answer and the closest accepted form
+                  (0: exact, None: no accepted form within the tolerance)
+        form: The closest accepted form
+    """
+    correct: bool
+    distance: Optional[int] = None
+    form: Optional[str] = None
+
+
+class AnswerGrader:
+    """
+    Grades typed answers against the accepted forms of the correct items.
+
+    The forms of an item are compiled on first use and cached, so an item
+    is compiled once however many times it is asked.
+
+    Attributes:
+        slo2ita: True if the answers are Italian, False if Slovenian
+    """
+
+    def __init__(self, slo2ita: bool = True):
+        self.slo2ita = slo2ita
+        self._forms = {}
+
+    def forms(self, item: Item) -> FrozenSet[str]:
+        """Accepted canonical forms of an item's answer text."""
+        forms = self._forms.get(item)
+        if forms is None:
+            text = item.italiansko if self.slo2ita else item.slovensko
+            forms = self._forms[item] = frozenset(answer_forms(text or ""))
+        return forms
+
+    def grade(self, answer: str, accepted: Iterable[Item]) -> Grade:
+        """
+        Grade a typed answer.
+
+        Args:
+            answer: Text typed by the learner
+            accepted: Items whose answers are all correct
+
+        Returns:
+            The Grade
+        """
+        typed = canonical_answer(answer)
+        forms = set()
+        for item in accepted:
+            forms |= self.forms(item)
+
+        if typed in forms:
+            return Grade(True, 0, typed)
+
+        # closest form within the tolerance; the bound shrinks with every match
+        bound = typo_tolerance(len(typed))
+        best = Grade(False)
+        for form in forms:
+            if abs(len(form) - len(typed)) > bound:
+                continue
+            distance = levenshtein(typed, form, bound)
+            if distance <= bound:
+                best = Grade(True, distance, form)
+                bound = distance - 1
+                if bound < 1:
+                    break
+        return best
+
+
+class TypedAnswerQuiz(LanguageQuiz):
+    """
+    LanguageQuiz where the learner types the translation.
+
+    Any translation of the question, or of one of its synonyms (see
+    VocabularyStore.synonym_class), is accepted.
+    """
+
+    def __init__(
+            self,
+            dict_lang: Dict[str, List[Item]],
+            seed: int = 0,
+            history: Optional[AnswerHistory] = None,
+            lesson: Optional[str] = None
+    ):
+        super().__init__(dict_lang, seed, history, lesson)
+        self.grader = AnswerGrader()
+        self._synonyms = {}
+
+    def iter_questions(
+            self,
+            slo2ita: bool = True,
+            max_questions: int = 0,
+            number_of_answers: int = 5
+    ) -> Iterator[Tuple[str, Item, List[Item]]]:
+        """
+        Generate the questions in random order, each key at most once.
+
+        No distractors are drawn: number_of_answers is ignored and the last
+        element of each tuple is the list of accepted answers.
+
+        Yields:
+            Tuples: (question_text, correct_answer, accepted_answers)
+        """
+        if self.grader.slo2ita != slo2ita:
+            self.grader = AnswerGrader(slo2ita)
+        self._synonyms = self._synonyms_by_class()
+
+        if max_questions == 0:
+            max_questions = len(self.dict_lang)
+
+        for count, question in enumerate(random_order(list(self.dict_lang), self.rng)):
+            if count >= max_questions:
+                break
+            correct_answer = self.rng.choice(self.dict_lang[question])
+            yield question, correct_answer, self._accepted_for(question)
+
+    def _synonyms_by_class(self) -> Dict[Tuple[int, int], List[Item]]:
+        """Items of dict_lang by (store, synonym class), built once per quiz."""
+        by_class = {}
+        for items in self.dict_lang.values():
+            for item in items:
+                by_class.setdefault((id(item.store), item.synonym_class), []).append(item)
+        return by_class
+
+    def _accepted_for(self, question: str) -> List[Item]:
+        """The items of question and their synonyms."""
+        accepted = []
+        for item in self.dict_lang[question]:
+            for synonym in self._synonyms.get((id(item.store), item.synonym_class), [item]):
+                if synonym not in accepted:
+                    accepted.append(synonym)
+        return accepted
+
+    def _show_question(self, question: str, possible_answers: List[Item], slo2ita: bool) -> None:
+        if slo2ita:
+            print(f"Scrivi in italiano: '{question}'")
+        else:
+            print(f"Scrivi in sloveno: '{question}'")
+
+    def _get_user_input(self, possible_answers: List[Item]) -> Optional[str]:
+        """
+        Read the typed answer.
+
+        Returns:
+            The answer text, or None if the user quits
+        """
+        while True:
+            try:
+                data = input("Traduzione (q per uscire): ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print("\nQuiz interrotto dall'utente.")
+                return None
+            if not data:
+                continue
+            if data.lower() == "q":
+                return None
+            return data
+
+    def _option_texts(self, possible_answers: List[Item], slo2ita: bool) -> List[str]:
+        # the accepted answers are not shown
+        return []
+
+    def _grade(self, question: str, correct_answer: Item, user_answer: str) -> Tuple[bool, Optional[str]]:
+        grade = self.grader.grade(user_answer, self._accepted_for(question))
+        if grade.correct and grade.distance:
+            return True, "Quasi giusto, attenzione all'ortografia"
+        return grade.correct, None
+
+
+def start_typed_test(
+        dict_lang: Dict[str, List[Item]],
+        int_seed: int = 0,
+        slo2ita: bool = True,
+        max_questions: int = 0,
+        history: Optional[AnswerHistory] = None,
+        lesson: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run a typed-answer quiz (see start_tests).
+
+    Args:
+        dict_lang: Vocabulary dictionary
+        int_seed: Random seed for reproducible quizzes
+        slo2ita: Translation direction (True: Slo->Ita, False: Ita->Slo)
+        max_questions: Maximum questions to ask (0 for all)
+        history: Optional AnswerHistory where every answer is saved
+        lesson: Optional lesson name saved with the history
+
+    Returns:
+        Quiz results dictionary with statistics
+    """
+    quiz = TypedAnswerQuiz(dict_lang, int_seed, history, lesson)
+    return quiz.run_quiz(slo2ita, max_questions)
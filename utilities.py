@@ -17,9 +17,21 @@ Python: 3.7+ (requires dataclasses)
 
 from __future__ import annotations
 from enum import Enum
-from typing import Optional, List, Dict, Tuple, Union
-from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple, Iterator, Callable, Any
+from dataclasses import dataclass, asdict
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import closing
+import queue
 import random
+import re
+import threading
+import unicodedata
+import time
+
+from history import AnswerHistory, default_history, item_key
+from instrumentation import metrics, latency_percentiles
 
 
 # =============================================================================
@@ -179,11 +191,243 @@ class AudioLink:
         return f"url={self.url}"
 
 
+# =============================================================================
+# VOCABULARY STORAGE
+# =============================================================================
+
+class VocabularyStore:
+    """
+    Compact struct-of-arrays storage for vocabulary items.
+
+    Instead of one Python object per vocabulary item, every field is kept
+    in its own column, indexed by an integer item id:
+    - texts, categories and links are interned once in a string table and
+      stored as integer string ids
+    - WordType, SentenceCategory, Level and Gender are stored as small
+      integer codes (position in the enum, -1 for None)
+    - the auto-computed boolean features are packed in one byte per item
+
+    Item objects are lightweight views (store + item id) created on
+    demand, so large word lists cost a few dozen bytes per word instead of
+    a full dataclass instance per word.
+
+    Items sharing a Slovenian or an Italian text, directly or through
+    other items (e.g. "tam" -> "là" <- "tja"), form a synonym class: their
+    answers are all correct for each other's questions. Classes are
+    computed once, on first use after the items have been added.
+
+    Attributes:
+        question_groups: {question group id: [item id, ...]}
+    """
+
+    # Bits of the packed feature column
+    SLO_MULTIPLE_WORDS = 1
+    ITA_MULTIPLE_WORDS = 2
+    IS_QUESTION = 4
+    ENDS_WITH_ITE = 8
+
+    NONE = -1
+
+    _ENUMS = {
+        "wordtype": tuple(WordType),
+        "sentence_category": tuple(SentenceCategory),
+        "level": tuple(Level),
+        "gender": tuple(Gender),
+    }
+    _ENUM_CODES = {name: {member: code for code, member in enumerate(members)}
+                   for name, members in _ENUMS.items()}
+
+    def __init__(self):
+        # string table
+        self._strings = []
+        self._string_ids = {}
+
+        # columns (one entry per item)
+        self._slovensko = array('l')
+        self._italiansko = array('l')
+        self._category = array('l')
+        self._weblink = array('l')
+        self._bookpage = array('l')
+        self._wordtype = array('b')
+        self._sentence_category = array('b')
+        self._level = array('b')
+        self._gender = array('b')
+        self._flags = bytearray()
+        self._slovensko_num_words = array('H')
+        self._italiansko_num_words = array('H')
+
+        # sparse column: only items belonging to question groups are listed
+        self._item_groups = {}
+
+        self.question_groups = {}
+
+        # derived column, see synonym_class()
+        self._synonym_classes = None
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def intern(self, value) -> int:
+        """Return the string id of value (adding it to the string table if needed)."""
+        if value is None:
+            return self.NONE
+        sid = self._string_ids.get(value)
+        if sid is None:
+            sid = len(self._strings)
+            self._string_ids[value] = sid
+            self._strings.append(value)
+        return sid
+
+    def string(self, sid: int):
+        """Inverse of intern()."""
+        return None if sid == self.NONE else self._strings[sid]
+
+    def _code(self, column: str, value) -> int:
+        return self.NONE if value is None else self._ENUM_CODES[column][value]
+
+    def _member(self, column: str, code: int):
+        return None if code == self.NONE else self._ENUMS[column][code]
+
+    def add(
+            self,
+            slovensko: Optional[str] = None,
+            italiansko: Optional[str] = None,
+            category: Optional[str] = None,
+            bookpage: Optional[int] = None,
+            wordtype: Optional[WordType] = None,
+            sentence_category: Optional[SentenceCategory] = None,
+            level: Optional[Level] = None,
+            gender: Optional[Gender] = None,
+            weblink: Optional[WebLink] = None,
+            question_groups: Optional[List[QuestionGroup]] = None
+    ) -> int:
+        """
+        Append a vocabulary item and compute its linguistic features.
+
+        The texts are normalized to lowercase, words are counted in both
+        languages, multi-word expressions and questions (sentences ending
+        with '?') are detected.
+
+        Returns:
+            The new item id
+        """
+        flags = 0
+        slovensko_num_words = italiansko_num_words = 0
+
+        # Process Slovenian text
+        if slovensko:
+            slovensko = slovensko.lower()
+            slovensko_num_words = len(slovensko.split())
+            if slovensko_num_words > 1:
+                flags |= self.SLO_MULTIPLE_WORDS
+            if slovensko.endswith("?"):
+                flags |= self.IS_QUESTION
+            if slovensko.endswith("ite"):
+                flags |= self.ENDS_WITH_ITE
+
+        # Process Italian text
+        if italiansko:
+            italiansko = italiansko.lower()
+            italiansko_num_words = len(italiansko.split())
+            if italiansko_num_words > 1:
+                flags |= self.ITA_MULTIPLE_WORDS
+
+        if flags & self.IS_QUESTION and sentence_category is None:
+            sentence_category = SentenceCategory.INTERROGATIVE
+
+        item_id = len(self)
+        self._slovensko.append(self.intern(slovensko))
+        self._italiansko.append(self.intern(italiansko))
+        self._category.append(self.intern(category))
+        self._weblink.append(self.intern(weblink.url if weblink is not None else None))
+        self._bookpage.append(self.NONE if bookpage is None else bookpage)
+        self._wordtype.append(self._code("wordtype", wordtype))
+        self._sentence_category.append(self._code("sentence_category", sentence_category))
+        self._level.append(self._code("level", level))
+        self._gender.append(self._code("gender", gender))
+        self._flags.append(flags)
+        self._slovensko_num_words.append(min(slovensko_num_words, 0xFFFF))
+        self._italiansko_num_words.append(min(italiansko_num_words, 0xFFFF))
+
+        if question_groups:
+            self._item_groups[item_id] = tuple(self.intern(gp.id) for gp in question_groups)
+            for gp in question_groups:
+                self.question_groups.setdefault(gp.id, []).append(item_id)
+
+        return item_id
+
+    def item(self, item_id: int) -> 'Item':
+        """Return a lightweight Item view of an item."""
+        return Item._view(self, item_id)
+
+    def items(self) -> Iterator['Item']:
+        """Iterate over Item views of all the items, in insertion order."""
+        for item_id in range(len(self)):
+            yield Item._view(self, item_id)
+
+    def synonym_class(self, item_id: int) -> int:
+        """
+        Synonym class of an item: equal for two items of this store when
+        they are linked by shared Slovenian or Italian texts.
+        """
+        return self.synonym_classes()[item_id]
+
+    def synonym_classes(self) -> array:
+        """Synonym class column, indexed by item id."""
+        classes = self._synonym_classes
+        if classes is None or len(classes) != len(self):
+            classes = self._synonym_classes = self._build_synonym_classes()
+        return classes
+
+    def _build_synonym_classes(self) -> array:
+        """Union-find over the texts: every item joins its Slovenian and Italian text."""
+        # node 2 * sid is a Slovenian text, 2 * sid + 1 an Italian one
+        parent = array('l', range(2 * len(self._strings)))
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        # empty or missing texts link nothing
+        strings = self._strings
+        texts = [(slo_sid if slo_sid != self.NONE and strings[slo_sid] else None,
+                  ita_sid if ita_sid != self.NONE and strings[ita_sid] else None)
+                 for slo_sid, ita_sid in zip(self._slovensko, self._italiansko)]
+
+        for slo_sid, ita_sid in texts:
+            if slo_sid is not None and ita_sid is not None:
+                root_slo, root_ita = find(2 * slo_sid), find(2 * ita_sid + 1)
+                if root_slo != root_ita:
+                    parent[root_ita] = root_slo
+
+        classes = array('l')
+        for item_id, (slo_sid, ita_sid) in enumerate(texts):
+            if slo_sid is not None:
+                classes.append(find(2 * slo_sid))
+            elif ita_sid is not None:
+                classes.append(find(2 * ita_sid + 1))
+            else:
+                classes.append(-1 - item_id)  # no text: a class of its own
+        return classes
+
+    def has_flag(self, item_id: int, flag: int) -> bool:
+        return bool(self._flags[item_id] & flag)
+
+    def get_all_questions(self) -> List['Item']:
+        """Return the items that have been identified as questions."""
+        return [self.item(i) for i, flags in enumerate(self._flags) if flags & self.IS_QUESTION]
+
+
+# Store used by Items created without an explicit store
+_default_store = VocabularyStore()
+
+
 # =============================================================================
 # CORE VOCABULARY ITEM CLASS
 # =============================================================================
 
-@dataclass
 class Item:
     """
     Core vocabulary learning item with Slovenian and Italian translations.
@@ -192,6 +436,10 @@ class Item:
     system, containing the source and target language texts along with
     comprehensive metadata for learning optimization.
 
+    The data lives in a VocabularyStore: an Item is only a lightweight view
+    (store + item id), so creating and holding many Items is cheap. Two
+    Items are equal when they refer to the same entry of the same store.
+
     The class automatically processes text to extract linguistic features
     like word count, question detection, and case normalization.
 
@@ -209,6 +457,8 @@ class Item:
         is_question: Auto-detected flag for question sentences
         slovensko_num_words: Auto-computed word count for Slovenian
         italiansko_num_words: Auto-computed word count for Italian
+        synonym_class: Items of the same store with equal synonym_class
+                       are valid answers for each other's questions
 
     Example:
         >>> item = Item(slovensko="kako si", italiansko="come stai", 
@@ -216,92 +466,147 @@ class Item:
         >>> print(item.is_question)  # False
         >>> print(item.slo_multiple_words)  # True (2 words)
     """
-    # Class variables for tracking and organizing items
-    _next_id = 1
-    _all_instances = []
-    _all_question_groups = {}
+    __slots__ = ("_store", "_index")
 
+    def __init__(
+            self,
+            slovensko: Optional[str] = None,
+            italiansko: Optional[str] = None,
+            category: Optional[str] = None,
+            bookpage: Optional[int] = None,
+            wordtype: Optional[WordType] = None,
+            sentence_category: Optional[SentenceCategory] = None,
+            level: Optional[Level] = None,
+            gender: Optional[Gender] = None,
+            weblink: Optional[WebLink] = None,
+            question_groups: Optional[List[QuestionGroup]] = None,
+            store: Optional[VocabularyStore] = None
+    ):
+        """
+        Create a new vocabulary item, appending it to store.
 
-    # Unique identifier (not passed to constructor, assigned automatically)
-    id: int = field(init=False)
+        Args:
+            store: VocabularyStore holding the item data (default: a
+                   module-level store shared by all Items created without one)
+        """
+        if store is None:
+            store = _default_store
+        self._store = store
+        self._index = store.add(slovensko, italiansko, category, bookpage, wordtype,
+                                sentence_category, level, gender, weblink, question_groups)
+
+    @classmethod
+    def _view(cls, store: VocabularyStore, index: int) -> 'Item':
+        """Create a view on an existing store entry (no data is copied)."""
+        item = object.__new__(cls)
+        item._store = store
+        item._index = index
+        return item
+
+    @property
+    def store(self) -> VocabularyStore:
+        return self._store
+
+    # Unique identifier within the store
+    @property
+    def id(self) -> int:
+        return self._index
 
     # Core translation data
-    slovensko: Optional[str] = None
-    italiansko: Optional[str] = None
+    @property
+    def slovensko(self) -> Optional[str]:
+        return self._store.string(self._store._slovensko[self._index])
+
+    @property
+    def italiansko(self) -> Optional[str]:
+        return self._store.string(self._store._italiansko[self._index])
+
+    # Organizational metadata
+    @property
+    def category(self) -> Optional[str]:
+        return self._store.string(self._store._category[self._index])
 
-    # Organizational metadata  
-    category: Optional[str] = None
-    bookpage: Optional[int] = None
+    @property
+    def bookpage(self) -> Optional[int]:
+        page = self._store._bookpage[self._index]
+        return None if page == VocabularyStore.NONE else page
 
     # Linguistic metadata
-    wordtype: Optional[WordType] = None
-    sentence_category: Optional[SentenceCategory] = None
-    level: Optional[Level] = None
-    gender: Optional[Gender] = None
+    @property
+    def wordtype(self) -> Optional[WordType]:
+        return self._store._member("wordtype", self._store._wordtype[self._index])
+
+    @property
+    def sentence_category(self) -> Optional[SentenceCategory]:
+        return self._store._member("sentence_category", self._store._sentence_category[self._index])
+
+    @property
+    def level(self) -> Optional[Level]:
+        return self._store._member("level", self._store._level[self._index])
+
+    @property
+    def gender(self) -> Optional[Gender]:
+        return self._store._member("gender", self._store._gender[self._index])
 
     # Reference links
-    weblink: Optional[WebLink] = None
+    @property
+    def weblink(self) -> Optional[WebLink]:
+        url = self._store.string(self._store._weblink[self._index])
+        return None if url is None else WebLink(url)
 
-    # Auto-computed linguistic features (not set via constructor)
-    slo_multiple_words: bool = field(init=False, default=False)
-    ita_multiple_words: bool = field(init=False, default=False)
-    is_question: bool = field(init=False, default=False)
-    slovensko_num_words: int = field(init=False, default=0)
-    italiansko_num_words: int = field(init=False, default=0)
-    ends_with_ite: bool = field(init=False, default=False)
+    # Auto-computed linguistic features
+    @property
+    def slo_multiple_words(self) -> bool:
+        return self._store.has_flag(self._index, VocabularyStore.SLO_MULTIPLE_WORDS)
 
-    question_groups: Optional[list] = field(init=True, default_factory=list)
+    @property
+    def ita_multiple_words(self) -> bool:
+        return self._store.has_flag(self._index, VocabularyStore.ITA_MULTIPLE_WORDS)
 
-    def __post_init__(self):
-        """
-        Post-initialization processing to compute linguistic features.
+    @property
+    def is_question(self) -> bool:
+        return self._store.has_flag(self._index, VocabularyStore.IS_QUESTION)
 
-        This method is automatically called after object creation to:
-        - Normalize text case (convert to lowercase)
-        - Count words in both languages
-        - Detect multi-word expressions
-        - Identify questions (sentences ending with '?')
+    @property
+    def ends_with_ite(self) -> bool:
+        return self._store.has_flag(self._index, VocabularyStore.ENDS_WITH_ITE)
 
-        The computed features are used for quiz logic, difficulty assessment,
-        and appropriate answer matching.
-        """
-        # Assign the next available ID and increment the counter
-        self.id = Item._next_id
-        Item._next_id += 1
+    @property
+    def slovensko_num_words(self) -> int:
+        return self._store._slovensko_num_words[self._index]
 
-        # Process Slovenian text
-        if self.slovensko:
-            self.slovensko = self.slovensko.lower()
-            self.slovensko_num_words = len(self.slovensko.split())
-            self.slo_multiple_words = self.slovensko_num_words > 1
-            self.is_question = self.slovensko.endswith("?")
-            self.ends_with_ite = True if self.slovensko.endswith("ite") else False
-
-        # Process Italian text  
-        if self.italiansko:
-            self.italiansko = self.italiansko.lower()
-            self.italiansko_num_words = len(self.italiansko.split())
-            self.ita_multiple_words = self.italiansko_num_words > 1
-
-        if self.is_question and self.sentence_category is None:
-            self.sentence_category = SentenceCategory.INTERROGATIVE
-
-        # Register this instance for class-level tracking
-        Item._all_instances.append(self)
-
-        # print(self.question_groups)
-        for gp in self.question_groups:
-            if gp.id not in Item._all_question_groups:
-                Item._all_question_groups[gp.id] = []
-            Item._all_question_groups[gp.id].append(self)
+    @property
+    def italiansko_num_words(self) -> int:
+        return self._store._italiansko_num_words[self._index]
+
+    @property
+    def synonym_class(self) -> int:
+        """Synonym class id within the store (see VocabularyStore.synonym_class)."""
+        return self._store.synonym_class(self._index)
+
+    @property
+    def question_groups(self) -> List[QuestionGroup]:
+        return [QuestionGroup(self._store.string(sid)) for sid in self._store._item_groups.get(self._index, ())]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Item):
+            return NotImplemented
+        return self._store is other._store and self._index == other._index
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._index))
+
+    def __repr__(self) -> str:
+        return f"Item(id={self.id}, slovensko={self.slovensko!r}, italiansko={self.italiansko!r})"
 
     @classmethod
     def get_all_questions(cls) -> List['Item']:
         """
         Return all Item instances where is_question is True.
 
-        This method searches through all created Item instances and returns
-        only those that have been identified as questions (sentences ending with '?').
+        This method searches through all the Items created without an
+        explicit store and returns only those that have been identified
+        as questions (sentences ending with '?').
 
         Returns:
             List of Item objects where is_question is True
@@ -313,10 +618,10 @@ class Item:
             >>> print(len(questions))  # 1
             >>> print(questions[0].slovensko)  # kako si?
         """
-        return [item for item in cls._all_instances if item.is_question]
+        return _default_store.get_all_questions()
 
     @classmethod
-    def from_row(cls, row: Tuple, category: str) -> 'Item':
+    def from_row(cls, row: Tuple, category: str, store: Optional[VocabularyStore] = None) -> 'Item':
         """
         Factory method to create Item from structured tuple data.
 
@@ -329,6 +634,7 @@ class Item:
                  where metadata can include WordType, Level, Gender, 
                  BookPage, WebLink, AudioLink objects
             category: Thematic category string for the vocabulary item
+            store: VocabularyStore to add the item to (default: shared store)
 
         Returns:
             New Item instance with all metadata properly assigned
@@ -339,7 +645,7 @@ class Item:
             >>> print(item.wordtype)  # WordType.SENTENCE
         """
         # Initialize with category
-        kwargs = {'category': category, 'question_groups': []}
+        kwargs = {'category': category, 'question_groups': [], 'store': store}
 
         # Process each element in the tuple
         for count, val in enumerate(row):
@@ -395,6 +701,192 @@ class Item:
         return result
 
 
+# =============================================================================
+# TEXT NORMALIZATION AND SIMILARITY
+# =============================================================================
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase text with runs of whitespace collapsed to single spaces.
+
+    Example:
+        >>> normalize_text("  Dober   dan ")  # 'dober dan'
+    """
+    return " ".join(text.split()).lower()
+
+
+def expand_alternatives(text: str, limit: int = 16) -> List[str]:
+    """
+    Expand the slash alternatives used in the lessons into separate texts.
+
+    Every word containing '/' is replaced in turn by each of its
+    alternatives, e.g. "zdaj/sedaj" -> ["zdaj", "sedaj"] and
+    "on/ona je" -> ["on je", "ona je"].
+
+    Args:
+        text: Text to expand
+        limit: Maximum number of texts returned
+
+    Returns:
+        The expanded texts (just [text] if there are no alternatives)
+    """
+    expanded = [[]]
+    for word in text.split():
+        options = [option for option in word.split("/") if option] if "/" in word else [word]
+        expanded = [prefix + [option] for prefix in expanded for option in options][:limit]
+    return [" ".join(words) for words in expanded]
+
+
+def fold_diacritics(text: str) -> str:
+    """
+    Remove the diacritics (č -> c, š -> s, ž -> z, è -> e, ...).
+
+    Example:
+        >>> fold_diacritics("žličko")  # 'zlicko'
+    """
+    return "".join(char for char in unicodedata.normalize("NFD", text) if not unicodedata.combining(char))
+
+
+# characters ignored when comparing typed answers
+_ANSWER_PUNCTUATION = str.maketrans("", "", "?!.,;:¿¡\"()")
+_HINT = re.compile(r"\([^)]*\)")
+
+
+def canonical_answer(text: str) -> str:
+    """
+    Form of an answer used for comparisons: lowercase, without diacritics,
+    punctuation and parentheses, with whitespace collapsed.
+
+    Example:
+        >>> canonical_answer("  Kako  si? ")  # 'kako si'
+    """
+    return normalize_text(fold_diacritics(text).translate(_ANSWER_PUNCTUATION))
+
+
+def answer_forms(text: str, limit: int = 16) -> set:
+    """
+    All the canonical forms of an answer text that a learner may type.
+
+    Parenthetical hints are optional ("(il) giorno" accepts "giorno" and
+    "il giorno"), and both the phrase alternatives ("mestiere/che lavoro
+    fai") and the word alternatives ("zdaj/sedaj") are expanded.
+
+    Args:
+        text: Answer text, e.g. an Item's italiansko
+        limit: Maximum number of expansions of each alternative
+
+    Returns:
+        Set of canonical_answer forms
+    """
+    variants = {text}
+    if "(" in text:
+        variants.add(_HINT.sub(" ", text))
+    for variant in list(variants):
+        # phrase alternatives: every part is a phrase of its own
+        parts = variant.split("/")
+        if len(parts) > 1 and all(len(part.split()) > 1 for part in parts):
+            variants.update(parts)
+
+    forms = set()
+    for variant in variants:
+        for alternative in expand_alternatives(variant, limit):
+            form = canonical_answer(alternative)
+            if form:
+                forms.add(form)
+    return forms
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Edit distance (insertions, deletions, substitutions) between two texts.
+
+    With max_distance, the computation stops as soon as the distance is
+    known to exceed it, and max_distance + 1 is returned instead.
+
+    Example:
+        >>> levenshtein("jutri", "jutro")  # 1
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is None:
+        max_distance = len(a)
+    if len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
+
+
+class EditNeighbourIndex:
+    """
+    Index of texts for finding the ones within edit distance 1 of a query.
+
+    Every text is indexed under itself and under each of the texts
+    obtained by deleting one of its characters ("symmetric delete"): two
+    texts at distance 1 always share one of these keys, e.g. "jutri" and
+    "jutro" share "jutr". A query therefore costs len(query) + 1 binary
+    searches, whatever the number of texts.
+
+    The keys are stored as hashes in parallel sorted arrays (like the
+    VocabularyStore columns), about 18 bytes per key, together with the
+    position of the deleted character: two texts sharing a key are one
+    edit apart when one of them is the undeleted text (insertion or
+    deletion) or both lost the character at the same position
+    (substitution), so no string comparison is needed.
+
+    Example:
+        >>> index = EditNeighbourIndex(["jutri", "jutro", "danes"])
+        >>> index.neighbours("jutri")  # ['jutro']
+    """
+
+    # position of the "deleted" character for the undeleted text
+    WHOLE = -1
+
+    def __init__(self, texts: List[str]):
+        self.texts = list(texts)
+        entries = sorted(
+            (hash(key), text_id, pos)
+            for text_id, text in enumerate(self.texts)
+            for key, pos in self._keys(text)
+        )
+        self._hashes = array('q', [entry[0] for entry in entries])
+        self._ids = array('l', [entry[1] for entry in entries])
+        self._positions = array('h', [entry[2] for entry in entries])
+
+    @classmethod
+    def _keys(cls, text: str) -> List[Tuple[str, int]]:
+        keys = [(text, cls.WHOLE)]
+        keys.extend((text[:i] + text[i + 1:], i) for i in range(len(text)))
+        return keys
+
+    def neighbours(self, text: str) -> List[str]:
+        """Indexed texts at edit distance exactly 1 from text."""
+        found = set()
+        hashes, ids, positions = self._hashes, self._ids, self._positions
+        size = len(hashes)
+        whole = self.WHOLE
+        for key, pos in self._keys(text):
+            h = hash(key)
+            i = bisect_left(hashes, h)
+            while i < size and hashes[i] == h:
+                if pos == whole or positions[i] == whole or positions[i] == pos:
+                    found.add(ids[i])
+                i += 1
+        texts = self.texts
+        return [texts[text_id] for text_id in sorted(found) if texts[text_id] != text]
+
+
 # =============================================================================
 # DICTIONARY PROCESSING FUNCTIONS  
 # =============================================================================
@@ -402,7 +894,8 @@ class Item:
 def process_dictionary(
         my_dict: Dict[str, List[Tuple]],
         dict_slo: Optional[Dict[str, List[Item]]] = None,
-        dict_ita: Optional[Dict[str, List[Item]]] = None
+        dict_ita: Optional[Dict[str, List[Item]]] = None,
+        store: Optional[VocabularyStore] = None
 ) -> Tuple[Dict[str, List[Item]], Dict[str, List[Item]]]:
     """
     Process structured vocabulary data into searchable dictionaries.
@@ -422,6 +915,8 @@ def process_dictionary(
                  {category: [(slovensko, italiansko, metadata...), ...]}
         dict_slo: Optional existing Slovenian->Item dictionary to extend
         dict_ita: Optional existing Italian->Item dictionary to extend
+        store: Optional VocabularyStore holding the item data
+               (default: a new store, scoped to the processed lesson)
 
     Returns:
         Tuple of (slovenian_dict, italian_dict) where:
@@ -447,6 +942,8 @@ def process_dictionary(
         dict_slo = {}
     if dict_ita is None:
         dict_ita = {}
+    if store is None:
+        store = VocabularyStore()
 
     def append_to_dict(d: Dict[str, List[Item]], key: str, item: Item) -> None:
         """
@@ -501,7 +998,7 @@ def process_dictionary(
                     # Create new row with single Slovenian variant
                     new_row = list(row)
                     new_row[0] = slo_variant
-                    items.append(Item.from_row(tuple(new_row), category))
+                    items.append(Item.from_row(tuple(new_row), category, store))
 
         # Handle Italian variants: one Slovenian word -> multiple Italian
         elif isinstance(row[1], (tuple, list)):
@@ -510,49 +1007,374 @@ def process_dictionary(
                     # Create new row with single Italian variant
                     new_row = list(row)
                     new_row[1] = ita_variant
-                    items.append(Item.from_row(tuple(new_row), category))
+                    items.append(Item.from_row(tuple(new_row), category, store))
 
         # Handle simple case: direct slovensko -> italiansko mapping
         else:
             if row[0]:  # Skip entries with empty Slovenian text
-                items.append(Item.from_row(row, category))
+                items.append(Item.from_row(row, category, store))
 
         return items
 
     # Main processing loop - iterate through all categories
-    for category, rows in my_dict.items():
-        print(f"Processing category: {category}")
+    with metrics.stage("process_dictionary"):
+        for category, rows in my_dict.items():
+            print(f"Processing category: {category}")
+
+            # Process each vocabulary entry in the category
+            for row in rows:
+                try:
+                    # Generate Item objects (may be multiple due to variants)
+                    items = process_row_variants(row, category)
+
+                    # Index each item in both dictionaries
+                    metrics.count("items_created", len(items))
+                    for item in items:
+                        append_to_dict(dict_slo, item.slovensko, item)
+                        append_to_dict(dict_ita, item.italiansko, item)
+
+                except Exception as e:
+                    # Log errors but continue processing other entries
+                    metrics.count("row_errors")
+                    print(f"Error processing row {row} in category {category}: {e}")
+                    continue
 
-        # Process each vocabulary entry in the category
-        for row in rows:
-            try:
-                # Generate Item objects (may be multiple due to variants)
-                items = process_row_variants(row, category)
+    return dict_slo, dict_ita
 
-                # Index each item in both dictionaries
-                for item in items:
-                    append_to_dict(dict_slo, item.slovensko, item)
-                    append_to_dict(dict_ita, item.italiansko, item)
 
-            except Exception as e:
-                # Log errors but continue processing other entries
-                print(f"Error processing row {row} in category {category}: {e}")
-                continue
+# =============================================================================
+# LESSON REGISTRY
+# =============================================================================
 
-    return dict_slo, dict_ita
+@dataclass
+class Deck:
+    """
+    A processed lesson: its VocabularyStore and the two lookup dictionaries.
+
+    Attributes:
+        store: VocabularyStore holding the items of the deck
+        dict_slo: {slovenian_text: [Item, ...]}
+        dict_ita: {italian_text: [Item, ...]}
+    """
+    store: VocabularyStore
+    dict_slo: Dict[str, List[Item]]
+    dict_ita: Dict[str, List[Item]]
+
+    def question_groups(self) -> Dict[str, List[Item]]:
+        """Items of this deck by question group id."""
+        return {gp: [self.store.item(i) for i in ids] for gp, ids in self.store.question_groups.items()}
+
+
+class VocabularyRegistry:
+    """
+    Session-scoped registry of processed lessons.
+
+    Every lesson gets its own VocabularyStore, so item ids and question
+    groups are never mixed across lessons, and a lesson is processed only
+    once per registry: re-entering a lesson (e.g. from the main.py menu)
+    returns the same Deck instead of allocating its items again.
+    """
+
+    def __init__(self):
+        self._decks = {}
+        # keep the processed lesson dicts alive, so that their id() stays unique
+        self._sources = {}
+
+    def __len__(self) -> int:
+        return len(self._decks)
+
+    def deck(self, key, build: Callable[[VocabularyStore], Tuple[Dict[str, List[Item]], Dict[str, List[Item]]]]) -> Deck:
+        """
+        Return the deck registered as key, building it on first use.
+
+        Args:
+            key: Hashable key identifying the lesson
+            build: Function filling a new VocabularyStore and returning
+                   (dict_slo, dict_ita), called only if key is not registered
+
+        Returns:
+            The memoized Deck
+        """
+        deck = self._decks.get(key)
+        if deck is None:
+            store = VocabularyStore()
+            dict_slo, dict_ita = build(store)
+            deck = Deck(store, dict_slo, dict_ita)
+            self._decks[key] = deck
+        return deck
+
+    def load(self, lesson_dict: Dict[str, List[Tuple]]) -> Deck:
+        """
+        Process a lesson dictionary (see process_dictionary), memoized by identity.
+
+        Args:
+            lesson_dict: Lesson data, e.g. enota1.enota
+
+        Returns:
+            The Deck of the lesson
+        """
+        key = ("dict", id(lesson_dict))
+        self._sources[key] = lesson_dict
+        return self.deck(key, lambda store: process_dictionary(lesson_dict, store=store))
+
+    def clear(self) -> None:
+        """Forget all the registered decks."""
+        self._decks.clear()
+        self._sources.clear()
+
+
+# Registry used by generic_run_me and the main.py menu
+registry = VocabularyRegistry()
 
 
 # =============================================================================
 # QUIZ GENERATION FUNCTIONS
 # =============================================================================
 
+def random_order(pool: List, rng: Optional[random.Random] = None) -> Iterator:
+    """
+    Yield the elements of pool in random order without copying it.
+
+    This is a lazy Fisher-Yates shuffle: swapped positions are kept in a
+    small dict, so each draw costs O(1) no matter how large the pool is
+    and only the drawn elements are ever touched.
+
+    Args:
+        pool: List to draw from (not modified)
+        rng: Random generator to draw with (default: the random module)
+
+    Yields:
+        Elements of pool, each exactly once, in random order
+    """
+    randrange = (rng or random).randrange
+    size = len(pool)
+    swaps = {}
+    for i in range(size):
+        j = randrange(i, size)
+        yield pool[swaps.get(j, j)]
+        swaps[j] = swaps.get(i, i)
+
+
+class FeistelPermutation:
+    """
+    Pseudo-random permutation of range(size), computed one position at a time.
+
+    A balanced Feistel network on the smallest even number of bits covering
+    size, with round keys drawn from the seed, is a bijection of that
+    power-of-two range; positions falling outside range(size) are mapped
+    again (cycle walking), less than 4 times on average. permutation[k]
+    costs O(1) and needs no memory, so the k-th element of a shuffled deck
+    can be found without shuffling or remembering anything.
+
+    Example:
+        >>> permutation = FeistelPermutation(10, seed=1)
+        >>> sorted(permutation[k] for k in range(10))
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size: int, seed: int):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._mask = (1 << self._half) - 1
+        rng = random.Random(seed)
+        self._keys = [rng.getrandbits(32) for _ in range(self.ROUNDS)]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _round(self, value: int, key: int) -> int:
+        value = ((value ^ key) * 0x45D9F3B) & 0xFFFFFFFF
+        value ^= value >> 16
+        return ((value * 0x45D9F3B) & 0xFFFFFFFF) & self._mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._half, value & self._mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self._half) | right
+
+    def __getitem__(self, position: int) -> int:
+        if not 0 <= position < self.size:
+            raise IndexError(position)
+        value = self._encrypt(position)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class DistractorIndex:
+    """
+    Prebuilt buckets of candidate wrong answers for a vocabulary dictionary.
+
+    Items are grouped once by the features used to pick plausible
+    distractors (question group, question/non-question, "-ite" ending and
+    single/multi word translation), so that each distractor is drawn
+    directly from the right bucket instead of rejection-sampling the
+    whole dictionary.
+
+    For a given correct answer the buckets are visited from the most
+    specific to the least specific one:
+    1. (hard mode only) items whose answer text is one edit away from the
+       correct one, e.g. "jutro" for "jutri"
+    2. items sharing a question group with the correct answer
+    3. items with the same question / "-ite" / multi-word features
+    4. items with the same "-ite" ending
+    5. any item
+    so when a bucket is too small the constraints are relaxed in the same
+    order used by the original sampling loop.
+
+    Attributes:
+        dict_lang: Dictionary the index was built from
+        slo2ita: Quiz direction the index was built for
+        hard: Prefer distractors orthographically close to the correct answer
+        questions: Keys of dict_lang, in order
+    """
+
+    # Buckets, from the most to the least specific
+    TIER_CLOSE = 0
+    TIER_GROUP = 1
+    TIER_FEATURES = 2
+    TIER_ITE = 3
+    TIER_ANY = 4
+
+    def __init__(self, dict_lang: Dict[str, List[Item]], slo2ita: bool = True, hard: bool = False):
+        """
+        Build the distractor buckets for a dictionary.
+
+        Args:
+            dict_lang: Dictionary mapping question text to Item lists
+            slo2ita: True for Slovenian->Italian quiz, False for Italian->Slovenian
+            hard: Also index the answer texts by edit distance (hard mode)
+        """
+        self.dict_lang = dict_lang
+        self.slo2ita = slo2ita
+        self.hard = hard
+        self.questions = list(dict_lang)
+
+        self._all = []
+        self._by_features = {}
+        self._by_ite = {}
+        self._by_group = {}
+        self._by_text = {}
+        self._close = None
+
+        with metrics.stage("distractor_index"):
+            for items in dict_lang.values():
+                for item in items:
+                    self._all.append(item)
+                    self._by_features.setdefault(self._features(item), []).append(item)
+                    self._by_ite.setdefault(item.ends_with_ite, []).append(item)
+                    for gp in item.question_groups:
+                        self._by_group.setdefault(gp.id, []).append(item)
+                    if hard:
+                        self._by_text.setdefault(normalize_text(self.display_text(item)), []).append(item)
+
+            if hard:
+                self._close = EditNeighbourIndex(list(self._by_text))
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def _features(self, item: Item) -> Tuple[bool, bool, Optional[bool]]:
+        """Bucket key: word count similarity only matters for non-questions."""
+        if item.is_question:
+            return True, item.ends_with_ite, None
+        multiple_words = item.ita_multiple_words if self.slo2ita else item.slo_multiple_words
+        return False, item.ends_with_ite, multiple_words
+
+    def display_text(self, item: Item) -> str:
+        """Text shown to the user for an answer option."""
+        return item.italiansko if self.slo2ita else item.slovensko
+
+    def candidates(self, current_answer: Item, rng: Optional[random.Random] = None) -> Iterator[Tuple[int, Item]]:
+        """
+        Yield candidate distractors for current_answer, most similar buckets first.
+
+        Each bucket is traversed in random order; an item may be yielded
+        again by a later (wider) bucket, callers are expected to skip
+        answers they have already chosen.
+
+        The index itself is never modified while drawing, so it can be
+        shared by quizzes running on different threads, each with its own rng.
+
+        Args:
+            current_answer: The correct Item
+            rng: Random generator to draw with (default: the random module)
+
+        Yields:
+            Tuples (tier, item), where tier is one of the TIER_* constants
+            identifying the bucket the item was drawn from
+        """
+        if rng is None:
+            rng = random
+
+        if self._close is not None:
+            close = self._close.neighbours(normalize_text(self.display_text(current_answer)))
+            for text in random_order(close, rng):
+                for item in random_order(self._by_text[text], rng):
+                    yield self.TIER_CLOSE, item
+
+        groups = list(current_answer.question_groups)
+        rng.shuffle(groups)
+        for gp in groups:
+            for item in random_order(self._by_group.get(gp.id, []), rng):
+                yield self.TIER_GROUP, item
+
+        tiers = (
+            (self.TIER_FEATURES, self._by_features.get(self._features(current_answer), [])),
+            (self.TIER_ITE, self._by_ite.get(current_answer.ends_with_ite, [])),
+            (self.TIER_ANY, self._all),
+        )
+        for tier, bucket in tiers:
+            for item in random_order(bucket, rng):
+                yield tier, item
+
+
+# indexes shared by the quizzes on the same dictionary, most recently used last;
+# each entry keeps its dictionary alive, so that its id() stays unique
+_shared_indexes = OrderedDict()
+_shared_indexes_lock = threading.Lock()
+SHARED_INDEXES = 64
+
+
+def shared_distractor_index(dict_lang: Dict[str, List[Item]], slo2ita: bool = True, hard: bool = False) -> DistractorIndex:
+    """
+    DistractorIndex of a dictionary, built once and shared by all its quizzes.
+
+    The index is never modified while drawing, so quizzes (and sessions of
+    a server) on the same deck can share it; it is rebuilt if the number of
+    keys of the dictionary changes. The SHARED_INDEXES most recently used
+    indexes are kept.
+    """
+    key = (id(dict_lang), slo2ita, hard)
+    with _shared_indexes_lock:
+        entry = _shared_indexes.get(key)
+        if entry is not None and entry[1] == len(dict_lang):
+            _shared_indexes.move_to_end(key)
+            return entry[2]
+
+    index = DistractorIndex(dict_lang, slo2ita, hard)
+    with _shared_indexes_lock:
+        _shared_indexes[key] = (dict_lang, len(dict_lang), index)
+        _shared_indexes.move_to_end(key)
+        while len(_shared_indexes) > SHARED_INDEXES:
+            _shared_indexes.popitem(last=False)
+    return index
+
+
 def find_random_answers(
         dict_lang: Dict[str, List[Item]],
         current_question: str,
         current_answer: Item,
         number_of_answers: int = 5,
         slo2ita: bool = True,
-        max_attempts: int = 1000
+        max_attempts: int = 1000,
+        index: Optional[DistractorIndex] = None,
+        rng: Optional[random.Random] = None,
+        hard: bool = False
 ) -> List[Item]:
     """
     Generate a list of plausible wrong answers plus the correct answer.
@@ -562,110 +1384,209 @@ def find_random_answers(
     making the quiz challenging but fair.
 
     The selection algorithm prioritizes:
+    - In hard mode, answers one edit away from the correct one
+      (e.g. "plačaš" for "plačam")
+    - Items in the same question group(s)
     - Similar word count (single words vs phrases)
     - Different translations (no duplicates)
+    - No synonyms of the correct answer: items linked to it by shared
+      Slovenian or Italian texts (e.g. "tja" for "tam", both "là") are
+      equally correct and are never shown as wrong answers
     - Variety in incorrect options
 
+    Distractors are drawn from a DistractorIndex; pass a prebuilt one when
+    generating many questions from the same dictionary, otherwise it is
+    built on the fly (O(N) per call).
+
     Args:
         dict_lang: Dictionary to select answers from
         current_question: The question text (to exclude from wrong answers)
         current_answer: The correct Item object
         number_of_answers: Total answers to return (including correct)
         slo2ita: True for Slovenian->Italian quiz, False for Italian->Slovenian
-        max_attempts: Maximum tries to find suitable wrong answers
+        max_attempts: Maximum candidates to examine to find suitable wrong answers
+        index: Optional prebuilt DistractorIndex for dict_lang and slo2ita
+        rng: Random generator to draw with (default: the random module);
+             pass a seeded random.Random for reproducible answers
+        hard: Prefer distractors orthographically close to the correct
+              answer (only used when index is None, otherwise the mode of
+              the index applies)
 
     Returns:
-        List of Item objects with correct answer and wrong answers
+        List of Item objects with correct answer and wrong answers; fewer
+        than number_of_answers if the dictionary has not enough distinct
+        translations (counted as distractor_shortfall in the metrics, the
+        terminal quiz warns when it shows the question)
 
     """
+    if index is None:
+        index = DistractorIndex(dict_lang, slo2ita, hard)
+
     # Start with correct answer
     answers = [current_answer]
+    shown = {index.display_text(current_answer)}
 
-    # Get all possible questions except current one
-    available_keys = [key for key in dict_lang.keys() if key != current_question]
+    # Other correct answers for the same question, and synonyms of the
+    # correct answer, must not become distractors
+    same_question = dict_lang.get(current_question, [])
+    answer_store = current_answer.store
+    synonym_classes = answer_store.synonym_classes()
+    answer_class = synonym_classes[current_answer.id]
 
     attempts = 0
-    while len(answers) < number_of_answers and attempts < max_attempts:
+    relaxed = False
+    for tier, candidate in index.candidates(current_answer, rng):
+        if len(answers) >= number_of_answers or attempts >= max_attempts:
+            break
         attempts += 1
 
-        random_answer = None
+        # Skip duplicate translations (this also skips the correct answer itself)
+        text = index.display_text(candidate)
+        if text in shown:
+            continue
 
-        try:
+        if candidate._store is answer_store and synonym_classes[candidate._index] == answer_class:
+            continue
 
-            if current_answer.question_groups and attempts*2 < max_attempts:
-                # try to choose other (wrong) answers from the same question group(s) to which the correct answer belongs
+        if candidate in same_question:
+            continue
 
-                qg = random.choice(current_answer.question_groups)
+        answers.append(candidate)
+        shown.add(text)
+        if tier >= DistractorIndex.TIER_ITE:
+            relaxed = True
 
-                # for qg in current_answer.question_groups:
-                question_group = qg.id
+    if metrics.enabled:
+        metrics.observe("distractor_attempts", attempts)
+        if relaxed:
+            metrics.count("distractor_relaxed")
 
-                random_answer = random.choice(Item._all_question_groups[question_group])
-                if random_answer.id == current_answer.id:
-                    continue
+    # Questions may be built on a prefetch thread or for an export: no print here
+    if len(answers) < number_of_answers:
+        metrics.count("distractor_shortfall")
 
-            else:
+    return answers
 
-                # Select random question and random answer for that question
-                random_key = random.choice(available_keys)
-                random_answer = random.choice(dict_lang[random_key])
-
-                # find other questions
-                if current_answer.is_question:
-                    if not random_answer.is_question and attempts < max_attempts/5:
-                        continue
-
-                if current_answer.ends_with_ite:
-                    if not random_answer.ends_with_ite and attempts < max_attempts/3:
-                        continue
-
-                # find other non questions
-                if not current_answer.is_question:
-                    if random_answer.is_question and attempts < max_attempts/5:
-                        continue
-
-                # Ensure structural similarity (word count matching)
-                # This makes single-word questions have single-word wrong answers
-                if not current_answer.is_question:
-                    if not slo2ita:
-                        if random_answer.slo_multiple_words != current_answer.slo_multiple_words and attempts < max_attempts/5:
-                            continue
-                    else:
-                        if random_answer.ita_multiple_words != current_answer.ita_multiple_words and attempts < max_attempts/5:
-                            continue
 
-            # Skip if this answer is already selected
-            if random_answer in answers:
-                continue
+# =============================================================================
+# QUIZ INTERFACE CLASS
+# =============================================================================
+
+@dataclass
+class TimedAnswer:
+    """
+    An answer given during a quiz.
 
-            # Check for duplicate translations based on quiz direction
-            if slo2ita:
-                # For Slo->Ita quiz, check Italian translations
-                if any(item.italiansko == random_answer.italiansko for item in answers):
-                    continue
-            else:
-                # For Ita->Slo quiz, check Slovenian translations  
-                if any(item.slovensko == random_answer.slovensko for item in answers):
-                    continue
+    Attributes:
+        question: The question text
+        item: The correct Item
+        latency: Seconds from the display of the question to a valid answer
+        correct: True if the answer was graded correct
+    """
+    question: str
+    item: Item
+    latency: float
+    correct: bool
 
-            # Add this answer to our collection
-            answers.append(random_answer)
 
-        except (IndexError, ValueError):
-            # Handle edge cases where random selection fails
-            continue
+def latency_statistics(answers: List[TimedAnswer]) -> Dict[str, Dict]:
+    """
+    Response time percentiles of a quiz, overall and grouped.
 
-    # Warn if we couldn't find enough answers
-    if len(answers) < number_of_answers:
-        print(f"Warning: Could only find {len(answers)} answers out of "
-              f"{number_of_answers} requested for question '{current_question}'")
+    Args:
+        answers: The answers of the quiz
 
-    return answers
+    Returns:
+        Dictionary with:
+        - all: percentiles of all the answers
+        - items: percentiles by item (see history.item_key)
+        - categories: percentiles by lesson category
+        - wordtypes: percentiles by WordType name (NOP if not classified)
+    """
+    items = {}
+    categories = {}
+    wordtypes = {}
+    for answer in answers:
+        item = answer.item
+        items.setdefault(item_key(item), []).append(answer.latency)
+        categories.setdefault(str(item.category), []).append(answer.latency)
+        wordtypes.setdefault((item.wordtype or WordType.NOP).name, []).append(answer.latency)
+
+    return {
+        "all": latency_percentiles([answer.latency for answer in answers]),
+        "items": {key: latency_percentiles(values) for key, values in items.items()},
+        "categories": {key: latency_percentiles(values) for key, values in categories.items()},
+        "wordtypes": {key: latency_percentiles(values) for key, values in wordtypes.items()},
+    }
+
+
+class QuestionPrefetcher:
+    """
+    Iterate over questions prepared ahead of time by a background thread.
 
+    The worker thread consumes the question generator and keeps up to
+    size prepared questions in a bounded queue, so the next question is
+    usually ready while the learner is still answering the current one.
+    The generator is consumed in order by a single thread, so the
+    questions (and the random draws behind them) are the same as without
+    prefetching; only generators whose next question does not depend on
+    the previous answers may be prefetched.
+
+    close() stops the worker and waits for it, discarding the questions
+    prepared but not yet asked.
+
+    Example:
+        >>> with closing(QuestionPrefetcher(quiz.iter_questions(), 2)) as questions:
+        ...     for question in questions:
+        ...         ...
+    """
+
+    _DONE = object()
+
+    def __init__(self, questions: Iterator, size: int = 2):
+        self._questions = questions
+        self._queue = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        self._error = None
+        self._worker = threading.Thread(target=self._fill, name="question-prefetch", daemon=True)
+        self._worker.start()
+
+    def _fill(self) -> None:
+        try:
+            for question in self._questions:
+                self._queue.put(question)
+                if self._stop.is_set():
+                    return
+        except Exception as e:
+            self._error = e
+        finally:
+            if not self._stop.is_set():
+                self._queue.put(self._DONE)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        question = self._queue.get()
+        if question is self._DONE:
+            self._queue.put(self._DONE)
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+        return question
+
+    def close(self) -> None:
+        """Stop the worker thread (it may be blocked on a full queue)."""
+        self._stop.set()
+        while self._worker.is_alive():
+            try:
+                self._queue.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        self._worker.join()
+        if hasattr(self._questions, "close"):
+            self._questions.close()
 
-# =============================================================================
-# QUIZ INTERFACE CLASS
-# =============================================================================
 
 class LanguageQuiz:
     """
@@ -680,77 +1601,162 @@ class LanguageQuiz:
     The quiz supports both translation directions (Slovenian->Italian and
     Italian->Slovenian) and provides detailed feedback on performance.
 
+    Every quiz owns its random generator, so quizzes created with the same
+    seed produce the same questions even when several quizzes run in the
+    same process (or on different threads) or other code uses the random
+    module.
+
     Attributes:
         dict_lang: Vocabulary dictionary for quiz generation
         seed: Random seed for reproducible quiz sequences
+        rng: Random generator of this quiz
+        history: Optional AnswerHistory where every answer is saved
+        lesson: Optional lesson name saved with the history
+        hard: Prefer distractors orthographically close to the correct answer
         wrong_answers: List of incorrectly answered items
+        answers: TimedAnswer of every answer, with its response time
         number_of_questions: Count of questions attempted
         correct_answers: Count of correct responses
+        prefetch: Questions prepared ahead by a background thread during
+                  run_quiz (0 to prepare each question when it is asked)
     """
 
-    def __init__(self, dict_lang: Dict[str, List[Item]], seed: int = 0):
+    prefetch = 2
+
+    def __init__(
+            self,
+            dict_lang: Dict[str, List[Item]],
+            seed: int = 0,
+            history: Optional[AnswerHistory] = None,
+            lesson: Optional[str] = None,
+            hard: bool = False
+    ):
         """
         Initialize quiz system with vocabulary dictionary.
 
         Args:
             dict_lang: Dictionary mapping text to Item lists
             seed: Random seed (0 for random, >0 for reproducible sequences)
+            history: Optional AnswerHistory where every answer is saved
+            lesson: Optional lesson name saved with the history
+            hard: Prefer distractors orthographically close to the correct
+                  answer (e.g. "jutro" for "jutri")
         """
         self.dict_lang = dict_lang
         self.seed = seed
+        self.history = history
+        self.lesson = lesson
+        self.hard = hard
+        self._session_id = None
+        self._slo2ita = True
+        self._permutation = None
         self.reset_stats()
 
-        # Set random seed for reproducible quiz sequences
-        if seed != 0:
-            random.seed(seed)
-        else:
-            random.seed()
+        # Private generator for reproducible quiz sequences
+        self.rng = random.Random(seed if seed != 0 else None)
 
     def reset_stats(self) -> None:
         """Reset quiz statistics for new quiz session."""
         self.wrong_answers = []
+        self.answers = []
         self.number_of_questions = 0
         self.correct_answers = 0
 
-    def prepare_questions(
+    def iter_questions(
             self,
             slo2ita: bool = True,
             max_questions: int = 0,
             number_of_answers: int = 5
-    ) -> List[Tuple[str, Item, List[Item]]]:
+    ) -> Iterator[Tuple[str, Item, List[Item]]]:
         """
-        Prepare randomized quiz questions with multiple choice answers.
+        Lazily generate randomized quiz questions with multiple choice answers.
 
-        This method generates a complete quiz by:
-        1. Selecting random vocabulary items from the dictionary
-        2. Finding appropriate wrong answers for each question
-        3. Shuffling answer options to randomize positions
+        Questions are produced one at a time, so the first question is
+        available without preparing the whole quiz. The dictionary keys are
+        visited in random order (each key at most once) and, for each
+        question, the wrong answers are drawn from a DistractorIndex built
+        once for all the quizzes on the dictionary (see shared_distractor_index).
 
         Args:
             slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
             max_questions: Maximum questions (0 for all available)
             number_of_answers: Number of multiple choice options
 
-        Returns:
-            List of tuples: (question_text, correct_answer, all_possible_answers)
+        Yields:
+            Tuples: (question_text, correct_answer, all_possible_answers)
         """
         # Determine quiz length
         if max_questions == 0:
             max_questions = len(self.dict_lang)
 
-        # Create list of available questions (copy to avoid modifying original)
+        # Bucket the candidate wrong answers once for all the quizzes on this dictionary
+        index = shared_distractor_index(self.dict_lang, slo2ita, self.hard)
+
+        # Visit the questions in random order, each one at most once
         dict_keys = list(self.dict_lang.keys())
-        questions_and_answers = []
+        for count, current_question in enumerate(random_order(dict_keys, self.rng)):
+            if count >= max_questions:
+                break
+
+            yield self._build_question(current_question, index, number_of_answers, slo2ita)
+
+    def question_at(
+            self,
+            position: int,
+            slo2ita: bool = True,
+            number_of_answers: int = 5
+    ) -> Tuple[str, Item, List[Item]]:
+        """
+        Question number position (from 0) of a quiz computed from (seed, position) alone.
+
+        The keys are visited in the order of a FeistelPermutation of the
+        seed, and the answers of each question are drawn with a generator
+        seeded by (seed, position), so any question is computed in O(1)
+        without generating the previous ones: a session only needs to
+        remember its seed and position (see CompactSession). The seed must
+        not be 0. These questions differ from the ones of iter_questions.
+
+        Args:
+            position: Question number, 0 <= position < len(dict_lang)
+            slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
+            number_of_answers: Number of multiple choice options
+
+        Returns:
+            Tuple (question_text, correct_answer, all_possible_answers)
+        """
+        index = shared_distractor_index(self.dict_lang, slo2ita, self.hard)
+        if self._permutation is None or len(self._permutation) != len(index.questions):
+            self._permutation = FeistelPermutation(len(index.questions), self.seed)
+        question = index.questions[self._permutation[position]]
+        rng = random.Random((self.seed << 32) + position)
+        return self._build_question(question, index, number_of_answers, slo2ita, rng)
+
+    def _build_question(
+            self,
+            current_question: str,
+            index: DistractorIndex,
+            number_of_answers: int,
+            slo2ita: bool,
+            rng: Optional[random.Random] = None
+    ) -> Tuple[str, Item, List[Item]]:
+        """
+        Pick the correct answer and the shuffled options for one question.
 
-        # Generate questions until we reach the limit or run out of vocabulary
-        while dict_keys and len(questions_and_answers) < max_questions:
-            # Select random question and remove it from available pool
-            current_question = random.choice(dict_keys)
-            dict_keys.remove(current_question)
+        Args:
+            current_question: The question text
+            index: DistractorIndex of dict_lang
+            number_of_answers: Number of multiple choice options
+            slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
+            rng: Random generator to draw with (default: the quiz's own)
 
+        Returns:
+            Tuple (question_text, correct_answer, all_possible_answers)
+        """
+        rng = rng or self.rng
+        with metrics.stage("prepare_question"):
             # Select random correct answer for this question
             # (some questions may have multiple correct answers)
-            correct_answer = random.choice(self.dict_lang[current_question])
+            correct_answer = rng.choice(self.dict_lang[current_question])
 
             # Generate multiple choice options including the correct answer
             possible_answers = find_random_answers(
@@ -758,27 +1764,53 @@ class LanguageQuiz:
                 current_question,
                 correct_answer,
                 number_of_answers,
-                slo2ita
+                slo2ita,
+                index=index,
+                rng=rng
             )
 
             # Randomize answer order so correct answer isn't always in same position
-            random.shuffle(possible_answers)
+            rng.shuffle(possible_answers)
+
+        return current_question, correct_answer, possible_answers
+
+    def prepare_questions(
+            self,
+            slo2ita: bool = True,
+            max_questions: int = 0,
+            number_of_answers: int = 5
+    ) -> List[Tuple[str, Item, List[Item]]]:
+        """
+        Prepare randomized quiz questions with multiple choice answers.
 
-            # Store complete question data
-            questions_and_answers.append((current_question, correct_answer, possible_answers))
+        This method generates a complete quiz by:
+        1. Selecting random vocabulary items from the dictionary
+        2. Finding appropriate wrong answers for each question
+        3. Shuffling answer options to randomize positions
+
+        Use iter_questions() to get the same questions one at a time.
+
+        Args:
+            slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
+            max_questions: Maximum questions (0 for all available)
+            number_of_answers: Number of multiple choice options
 
-        return questions_and_answers
+        Returns:
+            List of tuples: (question_text, correct_answer, all_possible_answers)
+        """
+        return list(self.iter_questions(slo2ita, max_questions, number_of_answers))
 
     def run_quiz(
             self,
             slo2ita: bool = True,
             max_questions: int = 0,
             number_of_answers: int = 5
-    ) -> Dict[str, Union[int, float]]:
+    ) -> Dict[str, Any]:
         """
         Execute the complete interactive quiz session.
 
-        This method runs the full quiz experience:
+        This is the terminal front end of a QuizSession; it runs the full
+        quiz experience:
         - Displays questions with multiple choice answers
         - Collects and validates user input
         - Provides immediate feedback on each answer
@@ -795,46 +1827,122 @@ class LanguageQuiz:
             - total_questions: Number of questions attempted
             - correct_answers: Number of correct responses  
             - score_percentage: Success rate as percentage
+            - latency: Response time percentiles, overall and by item,
+              category and WordType
         """
-        # Prepare all quiz questions
-        questions_and_answers = self.prepare_questions(slo2ita, max_questions, number_of_answers)
-        self.reset_stats()
+        # The session generates the questions lazily, a few questions ahead
+        # in a background thread, and grades the answers
+        session = QuizSession(self, slo2ita, max_questions, number_of_answers, self.prefetch)
+
+        with closing(session):
+            while True:
+                question = session.next_question()
+                if question is None:
+                    break
+
+                with metrics.stage("render"):
+                    if question.total is None:
+                        print(f"\nQuiz #{question.number}")
+                    else:
+                        print(f"\nQuiz #{question.number} / {question.total}")
+                    # Shown with the question: the question may come from the prefetch thread
+                    if 0 < len(question.options) < number_of_answers:
+                        print(f"Warning: Could only find {len(question.options)} answers out of "
+                              f"{number_of_answers} requested for question '{question.text}'")
+                    self._show_question(question.text, session.possible_answers, slo2ita)
+
+                # Get and validate user input, timing the answer
+                prompt_time = time.monotonic()
+                with metrics.stage("user_input"):
+                    user_answer = self._get_user_input(session.possible_answers)
+                if user_answer is None:  # User chose to quit
+                    break
+
+                self._show_feedback(session.submit(user_answer, time.monotonic() - prompt_time))
 
-        # Execute quiz question by question
-        for current_pos, (current_question, correct_answer, possible_answers) in enumerate(questions_and_answers, 1):
-            print(f"\nQuiz #{current_pos} / {len(questions_and_answers)}")
+        # Display final results
+        results = self._display_results()
 
-            # Display question based on translation direction
-            if slo2ita:
-                print(f"Cosa significa '{current_question}' ?")
-            else:
-                print(f"Come traduci '{current_question}' ?")
+        if metrics.enabled:
+            metrics.count("quiz_sessions")
+            print(f"Metriche salvate in {metrics.export_json()}")
 
-            # Display multiple choice options
-            for counter, answer in enumerate(possible_answers):
-                # Show appropriate language based on quiz direction
-                display_text = answer.italiansko if slo2ita else answer.slovensko
-                print(f"{chr(ord('a') + counter)}: {display_text}")
+        return results
 
-            # Get and validate user input
-            user_answer = self._get_user_input(possible_answers)
-            if user_answer is None:  # User chose to quit
-                break
+    def _show_question(self, question: str, possible_answers: List[Item], slo2ita: bool) -> None:
+        """Print the question and the multiple choice options."""
+        # Display question based on translation direction
+        if slo2ita:
+            print(f"Cosa significa '{question}' ?")
+        else:
+            print(f"Come traduci '{question}' ?")
 
-            self.number_of_questions += 1
+        # Display multiple choice options, in the language of the answers
+        for counter, display_text in enumerate(self._option_texts(possible_answers, slo2ita)):
+            print(f"{chr(ord('a') + counter)}: {display_text}")
 
-            # Check answer and provide feedback
-            if correct_answer == user_answer:
-                print("✓ Corretto!")
-                self.correct_answers += 1
-                print(f"Risposta: {correct_answer}")
-            else:
-                print("✗ Sbagliato")
-                print(f"Risposta corretta: {correct_answer}")
-                self.wrong_answers.append(correct_answer)
+    def _grade(self, question: str, correct_answer: Item, user_answer) -> Tuple[bool, Optional[str]]:
+        """
+        Grade an answer.
 
-        # Display final results
-        return self._display_results()
+        Args:
+            question: The question text
+            correct_answer: The correct Item
+            user_answer: The Item chosen (or the text typed) by the user
+
+        Returns:
+            Tuple (correct, note), note being an optional remark on the answer
+        """
+        return user_answer == correct_answer, None
+
+    def _show_feedback(self, feedback: 'Feedback') -> None:
+        """Print the outcome of an answer."""
+        if feedback.note:
+            print(feedback.note)
+        if feedback.correct:
+            print("✓ Corretto!")
+            print(f"Risposta: {feedback.correct_answer}")
+        else:
+            print("✗ Sbagliato")
+            print(f"Risposta corretta: {feedback.correct_answer}")
+
+    def _option_texts(self, possible_answers: List[Item], slo2ita: bool) -> List[str]:
+        """Texts of the options shown to the user (empty if the answer is typed)."""
+        return [answer.italiansko if slo2ita else answer.slovensko for answer in possible_answers]
+
+    def _expected_questions(self, max_questions: int) -> Optional[int]:
+        """Number of questions the quiz will ask (None if unknown), shown as 'Quiz #n / total'."""
+        if max_questions == 0:
+            return len(self.dict_lang)
+        return min(max_questions, len(self.dict_lang))
+
+    def _record_answer(
+            self,
+            question: str,
+            correct_answer: Item,
+            user_answer: Item,
+            possible_answers: List[Item],
+            latency: float,
+            correct: bool
+    ) -> None:
+        """
+        Called after every answer: keeps its response time and saves it in
+        the history, if any.
+
+        Subclasses extend it to keep track of the answers.
+
+        Args:
+            question: The question text
+            correct_answer: The correct Item
+            user_answer: The Item chosen (or the text typed) by the user
+            possible_answers: The options shown
+            latency: Seconds from the display of the options to the answer
+            correct: True if the answer was graded correct
+        """
+        self.answers.append(TimedAnswer(question, correct_answer, latency, correct))
+        if self.history is not None:
+            self.history.record(self._session_id, correct_answer, user_answer, correct,
+                                self._slo2ita, latency, possible_answers, question)
 
     def _get_user_input(self, possible_answers: List[Item]) -> Optional[Item]:
         """
@@ -876,7 +1984,28 @@ class LanguageQuiz:
                 print("\nQuiz interrotto dall'utente.")
                 return None
 
-    def _display_results(self) -> Dict[str, Union[int, float]]:
+    def results(self) -> Dict[str, Any]:
+        """
+        Statistics of the answers given so far.
+
+        Returns:
+            Dictionary with:
+            - total_questions: Number of questions attempted
+            - correct_answers: Number of correct responses
+            - score_percentage: Success rate as percentage
+            - latency: Response time percentiles (see latency_statistics)
+        """
+        ratio = 0
+        if self.number_of_questions > 0:
+            ratio = (self.correct_answers / self.number_of_questions) * 100
+        return {
+            "total_questions": self.number_of_questions,
+            "correct_answers": self.correct_answers,
+            "score_percentage": ratio,
+            "latency": latency_statistics(self.answers)
+        }
+
+    def _display_results(self) -> Dict[str, Any]:
         """
         Display comprehensive quiz results and return statistics.
 
@@ -884,34 +2013,353 @@ class LanguageQuiz:
         - Overall performance statistics
         - Success percentage
         - Detailed list of incorrect answers for review
+        - Median response time and the slowest correct answers
 
         Returns:
-            Dictionary with numerical results for programmatic use
+            Dictionary with numerical results for programmatic use (see results)
         """
+        results = self.results()
         print("\n" + "=" * 50)
         print("QUIZ COMPLETD!")
         print("=" * 50)
 
         if self.number_of_questions > 0:
-            # Calculate and display performance metrics
-            ratio = (self.correct_answers / self.number_of_questions) * 100
+            # Display performance metrics
             print(f"Numero di quiz: {self.number_of_questions}")
             print(f"Risposte corrette: {self.correct_answers}")
-            print(f"Punteggio: {ratio:.1f}%")
+            print(f"Punteggio: {results['score_percentage']:.1f}%")
 
             # Show incorrect answers for review
             if self.wrong_answers:
                 print(f"\nRisposte sbagliate ({len(self.wrong_answers)}):")
                 for answer in self.wrong_answers:
                     print(f"  • {answer}")
+
+            # Slow correct answers are worth reviewing as well
+            latency = results["latency"]
+            print(f"\nTempo di risposta mediano: {latency['all']['p50']:.1f} s")
+            slowest = sorted((answer for answer in self.answers if answer.correct),
+                             key=lambda answer: answer.latency, reverse=True)[:3]
+            # slow: more than twice the median, and at least a few seconds
+            slowest = [answer for answer in slowest if answer.latency > max(2 * latency['all']['p50'], 3.0)]
+            if slowest:
+                print("Risposte corrette ma lente:")
+                for answer in slowest:
+                    print(f"  • {answer.item} ({answer.latency:.1f} s)")
         else:
-            ratio = 0
             print("Nessuna risposta è stata data.")
 
+        return results
+
+
+@dataclass
+class QuizQuestion:
+    """
+    A question of a QuizSession, as plain data.
+
+    Attributes:
+        number: Position of the question in the session (from 1)
+        total: Questions the session will ask (None if unknown)
+        text: The question text
+        options: Texts of the multiple choice options (empty if the answer is typed)
+        slo2ita: True for Slovenian->Italian, False for Italian->Slovenian
+    """
+    number: int
+    total: Optional[int]
+    text: str
+    options: List[str]
+    slo2ita: bool
+
+
+@dataclass
+class Feedback:
+    """
+    Outcome of an answer submitted to a QuizSession, with the running stats.
+
+    Attributes:
+        correct: True if the answer was graded correct
+        correct_answer: The correct Item
+        note: Optional remark on the answer (e.g. a spelling warning)
+        latency: Seconds from the question to the answer
+        answered: Questions answered so far
+        correct_answers: Correct answers so far
+        score_percentage: Success rate so far
+    """
+    correct: bool
+    correct_answer: Item
+    note: Optional[str]
+    latency: float
+    answered: int
+    correct_answers: int
+    score_percentage: float
+
+
+class QuizSession:
+    """
+    Headless quiz engine: questions in, answers out, no print or input.
+
+    A session runs the questions of a LanguageQuiz (or of a subclass) and
+    grades the answers with its hooks, keeping the statistics and the
+    history as run_quiz does; run_quiz is the terminal front end of a
+    session. A quiz runs one session at a time.
+
+    Example:
+        >>> session = QuizSession(LanguageQuiz(dict_slo, seed=1), max_questions=10)
+        >>> question = session.next_question()
+        >>> while question is not None:
+        ...     feedback = session.submit(0)    # index of the chosen option
+        ...     question = session.next_question()
+        >>> session.close()
+        >>> session.results()
+    """
+
+    def __init__(
+            self,
+            quiz: LanguageQuiz,
+            slo2ita: bool = True,
+            max_questions: int = 0,
+            number_of_answers: int = 5,
+            prefetch: int = 0,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Start a session.
+
+        Args:
+            quiz: The quiz asking the questions
+            slo2ita: Translation direction (True: Slo->Ita, False: Ita->Slo)
+            max_questions: Maximum questions to ask (0 for all)
+            number_of_answers: Number of multiple choice options
+            prefetch: Questions prepared ahead by a background thread
+                      (0 to prepare each question when it is requested)
+            clock: Function returning the current time in seconds, for the
+                   latency of the answers submitted without one
+        """
+        self._setup(quiz, slo2ita, max_questions, clock)
+        self._questions = quiz.iter_questions(slo2ita, max_questions, number_of_answers)
+        if prefetch > 0:
+            self._questions = QuestionPrefetcher(self._questions, prefetch)
+
+        quiz.reset_stats()
+        quiz._slo2ita = slo2ita
+        if quiz.history is not None:
+            quiz._session_id = quiz.history.start_session(quiz.lesson, slo2ita)
+
+    def _setup(
+            self,
+            quiz: LanguageQuiz,
+            slo2ita: bool,
+            max_questions: int,
+            clock: Callable[[], float],
+            number: int = 0
+    ) -> None:
+        """Fields of a session, for QuizSession and its subclasses; number is the questions already asked."""
+        self.quiz = quiz
+        self.slo2ita = slo2ita
+        self.clock = clock
+        self._questions = None
+        self._total = quiz._expected_questions(max_questions)
+        self._number = number
+        self._current = None
+        self._question = None
+        self._asked_at = 0.0
+        self.finished = False
+
+    def _next(self) -> Tuple[str, Item, List[Item]]:
+        """The next question, StopIteration if there are no more."""
+        return next(self._questions)
+
+    def _answered(self, correct: bool) -> None:
+        """Called after every answer."""
+
+    @property
+    def possible_answers(self) -> List[Item]:
+        """Items of the current question's options (accepted answers for typed quizzes)."""
+        return self._current[2] if self._current is not None else []
+
+    def next_question(self) -> Optional[QuizQuestion]:
+        """
+        The question to answer, None when the session is over.
+
+        The same question is returned until it is answered.
+        """
+        if self._current is None and not self.finished:
+            try:
+                self._current = self._next()
+            except StopIteration:
+                self.close()
+                return None
+            question, _, possible_answers = self._current
+            self._number += 1
+            self._question = QuizQuestion(self._number, self._total, question,
+                                          self.quiz._option_texts(possible_answers, self.slo2ita), self.slo2ita)
+            self._asked_at = self.clock()
+        return self._question if self._current is not None else None
+
+    def submit(self, answer, latency: Optional[float] = None) -> Feedback:
+        """
+        Answer the current question.
+
+        Args:
+            answer: Index of the chosen option, the chosen Item or, for
+                    typed quizzes, the typed text
+            latency: Response time in seconds (default: time since the
+                     question was returned by next_question)
+
+        Returns:
+            The Feedback
+
+        Raises:
+            ValueError: If there is no question to answer or the option
+                        index is out of range
+        """
+        if self._current is None:
+            raise ValueError("no question to answer")
+        question, correct_answer, possible_answers = self._current
+        if isinstance(answer, int):
+            if not 0 <= answer < len(self._question.options):
+                raise ValueError(f"option {answer} out of range")
+            answer = possible_answers[answer]
+        if latency is None:
+            latency = self.clock() - self._asked_at
+
+        quiz = self.quiz
+        correct, note = quiz._grade(question, correct_answer, answer)
+        quiz.number_of_questions += 1
+        if correct:
+            quiz.correct_answers += 1
+        else:
+            quiz.wrong_answers.append(correct_answer)
+        quiz._record_answer(question, correct_answer, answer, possible_answers, latency, correct)
+        self._current = None
+        self._answered(correct)
+
+        return Feedback(correct, correct_answer, note, latency, quiz.number_of_questions,
+                        quiz.correct_answers, quiz.correct_answers / quiz.number_of_questions * 100)
+
+    def results(self) -> Dict[str, Any]:
+        """Statistics of the session (see LanguageQuiz.results)."""
+        return self.quiz.results()
+
+    def close(self) -> None:
+        """End the session (stops the prefetch worker, if any)."""
+        if not self.finished:
+            self.finished = True
+            self._current = None
+            if self._questions is not None:
+                self._questions.close()
+
+
+@dataclass
+class SessionState:
+    """
+    Serializable state of a CompactSession: a few numbers, no questions.
+
+    Attributes:
+        deck: Name of the deck the session runs on (e.g. the lesson module)
+        seed: Seed of the questions (not 0)
+        slo2ita: Translation direction
+        hard: Prefer distractors orthographically close to the correct answer
+        max_questions: Maximum questions to ask (0 for all)
+        number_of_answers: Number of multiple choice options
+        cursor: Number of questions answered, i.e. position of the current one
+        correct: Correct answers given
+        asked_at: Time (seconds since the epoch) the current question was
+                  first returned, 0 if not yet
+        history_session: Session id in the AnswerHistory, if any
+    """
+    deck: str
+    seed: int
+    slo2ita: bool = True
+    hard: bool = False
+    max_questions: int = 0
+    number_of_answers: int = 5
+    cursor: int = 0
+    correct: int = 0
+    asked_at: float = 0.0
+    history_session: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SessionState':
+        return cls(**data)
+
+
+class CompactSession(QuizSession):
+    """
+    QuizSession whose whole state is a SessionState.
+
+    The current question is recomputed from (seed, cursor) with
+    LanguageQuiz.question_at, so nothing else needs to be kept between two
+    requests: a server can keep (or store, or send to the client) just the
+    state of every idle session and create a CompactSession on it when a
+    request arrives. The per-answer response times are not kept: results()
+    has the counts only.
+
+    Example:
+        >>> state = SessionState("enota1", seed=1234, max_questions=10)
+        >>> session = CompactSession(dict_slo, state)
+        >>> session.submit(0)    # updates state
+        >>> json.dumps(state.to_dict())
+    """
+
+    def __init__(
+            self,
+            dict_lang: Dict[str, List[Item]],
+            state: SessionState,
+            history: Optional[AnswerHistory] = None,
+            clock: Callable[[], float] = time.time
+    ):
+        """
+        Resume a session.
+
+        Args:
+            dict_lang: The deck in the direction of the session
+            state: The session state, updated by every answer
+            history: Optional AnswerHistory where every answer is saved
+            clock: Function returning the current time in seconds
+        """
+        if state.seed == 0:
+            raise ValueError("a compact session needs a seed")
+        quiz = LanguageQuiz(dict_lang, state.seed, history, state.deck, state.hard)
+        quiz.number_of_questions = state.cursor
+        quiz.correct_answers = state.correct
+        quiz._slo2ita = state.slo2ita
+        if history is not None:
+            if state.history_session is None:
+                state.history_session = history.start_session(state.deck, state.slo2ita)
+            quiz._session_id = state.history_session
+
+        self._setup(quiz, state.slo2ita, state.max_questions, clock, state.cursor)
+        self.state = state
+
+    def _next(self) -> Tuple[str, Item, List[Item]]:
+        state = self.state
+        if state.cursor >= self._total:
+            raise StopIteration
+        return self.quiz.question_at(state.cursor, state.slo2ita, state.number_of_answers)
+
+    def next_question(self) -> Optional[QuizQuestion]:
+        question = super().next_question()
+        if question is not None and not self.state.asked_at:
+            self.state.asked_at = self.clock()
+        self._asked_at = self.state.asked_at
+        return question
+
+    def _answered(self, correct: bool) -> None:
+        self.state.cursor += 1
+        self.state.correct += correct
+        self.state.asked_at = 0.0
+
+    def results(self) -> Dict[str, Any]:
+        """Statistics of the session: total_questions, correct_answers and score_percentage."""
+        state = self.state
         return {
-            "total_questions": self.number_of_questions,
-            "correct_answers": self.correct_answers,
-            "score_percentage": ratio
+            "total_questions": state.cursor,
+            "correct_answers": state.correct,
+            "score_percentage": state.correct / state.cursor * 100 if state.cursor else 0,
         }
 
 
@@ -924,8 +2372,11 @@ def start_tests(
         int_seed: int = 0,
         slo2ita: bool = True,
         max_questions: int = 0,
-        number_of_answers: int = 5
-) -> Dict[str, Union[int, float]]:
+        number_of_answers: int = 5,
+        history: Optional[AnswerHistory] = None,
+        lesson: Optional[str] = None,
+        hard: bool = False
+) -> Dict[str, Any]:
     """
     Legacy function for backward compatibility with existing code.
 
@@ -939,11 +2390,14 @@ def start_tests(
         slo2ita: Translation direction (True: Slo->Ita, False: Ita->Slo)
         max_questions: Maximum questions to ask
         number_of_answers: Multiple choice options count
+        history: Optional AnswerHistory where every answer is saved
+        lesson: Optional lesson name saved with the history
+        hard: Prefer distractors orthographically close to the correct answer
 
     Returns:
         Quiz results dictionary with statistics
     """
-    quiz = LanguageQuiz(dict_lang, int_seed)
+    quiz = LanguageQuiz(dict_lang, int_seed, history, lesson, hard)
     return quiz.run_quiz(slo2ita, max_questions, number_of_answers)
 
 
@@ -958,6 +2412,8 @@ def prepare_list_of_questions_and_answers(
 
     Maintained for backward compatibility with code that needs to prepare
     questions but handle the quiz interface differently.
+    To write the questions to a file without keeping them in memory, see
+    export_quiz.py.
 
     Args:
         dict_lang: Vocabulary dictionary
@@ -973,13 +2429,36 @@ def prepare_list_of_questions_and_answers(
 
 
 def generic_run_me(enota_dict):
-    dict_slo, dict_ita = process_dictionary(enota_dict)
+    deck = registry.load(enota_dict)
+    run_lesson_menu(deck.dict_slo, deck.dict_ita)
+
+
+def run_lesson_menu(
+        dict_slo: Dict[str, List[Item]],
+        dict_ita: Dict[str, List[Item]],
+        lesson: Optional[str] = None
+) -> None:
+    """
+    Show the statistics and the quiz menu for an already processed lesson.
+
+    The answers are saved in the answer history (see history.py).
+
+    Args:
+        dict_slo: Slovenian->Item dictionary of the lesson
+        dict_ita: Italian->Item dictionary of the lesson
+        lesson: Lesson name saved with the history
+    """
+    items = [item for items in dict_slo.values() for item in items]
+    question_groups = {}
+    for item in items:
+        for gp in item.question_groups:
+            question_groups.setdefault(gp.id, []).append(item)
 
-    if Item._all_question_groups:
+    if question_groups:
         print()
-        print(f"Gruppi di domande (numero totale quiz: {len(Item._all_instances)}):")
-        # print(Item._all_question_groups)
-        for k,v in Item._all_question_groups.items():
+        print(f"Gruppi di domande (numero totale quiz: {len(items)}):")
+        # print(question_groups)
+        for k,v in question_groups.items():
             # print(f"{k}: {v}")
             # print(f"len: {len(v)}")
             print(f"'{k}': {len(v)} quiz")
@@ -991,17 +2470,44 @@ def generic_run_me(enota_dict):
 
     print("1 - test da sloveno a italiano")
     print("2 - test da italiano a sloveno")
+    print("3 - ripasso da sloveno a italiano (ripetizione dilazionata)")
+    print("4 - ripasso da italiano a sloveno (ripetizione dilazionata)")
+    print("5 - test da sloveno a italiano (risposte difficili)")
+    print("6 - test da italiano a sloveno (risposte difficili)")
+    print("7 - test scritto da sloveno a italiano")
+    print("8 - test scritto da italiano a sloveno")
+    print("9 - gara di velocità (60 secondi) da sloveno a italiano")
+    print("10 - gara di velocità (60 secondi) da italiano a sloveno")
     data = input("risposta (q per uscire, s per statistiche): ")
     if data is None or data == "q":
         return
     elif data == "1":
-        start_tests(dict_slo)
+        start_tests(dict_slo, history=default_history(), lesson=lesson)
     elif data == "2":
-        start_tests(dict_ita, slo2ita=False)
+        start_tests(dict_ita, slo2ita=False, history=default_history(), lesson=lesson)
+    elif data == "5":
+        start_tests(dict_slo, history=default_history(), lesson=lesson, hard=True)
+    elif data == "6":
+        start_tests(dict_ita, slo2ita=False, history=default_history(), lesson=lesson, hard=True)
+    elif data in ("7", "8"):
+        from typed_quiz import start_typed_test
+        start_typed_test(dict_slo if data == "7" else dict_ita, slo2ita=data == "7",
+                         history=default_history(), lesson=lesson)
+    elif data in ("9", "10"):
+        from speed_drill import start_speed_drill
+        start_speed_drill(dict_slo if data == "9" else dict_ita, slo2ita=data == "9",
+                          history=default_history(), lesson=lesson)
+    elif data in ("3", "4"):
+        # imported here: spaced_repetition builds on this module
+        from spaced_repetition import start_review
+        if data == "3":
+            start_review(dict_slo, history=default_history(), lesson=lesson)
+        else:
+            start_review(dict_ita, slo2ita=False, history=default_history(), lesson=lesson)
     elif data == "s":
-        print(f"numero di istanze di Item: {len(Item._all_instances)}")
+        print(f"numero di istanze di Item: {len(items)}")
         # how many questions are there?
-        questions = Item.get_all_questions()
+        questions = [item for item in items if item.is_question]
 
         print(f"numero di domande: {len(questions)}")
     else:
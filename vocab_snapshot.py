@@ -0,0 +1,431 @@
+"""
+Compiled Vocabulary Snapshot
+
+This module compiles all lesson dictionaries (enota1.py, enota2.py, etc.)
+into a single versioned binary file, and loads lessons back from it through
+a memory map, so that a cold start only needs to open one file instead of
+importing every lesson module and re-running process_dictionary.
+
+File layout (all integers little-endian):
+- magic (8 bytes) + format version (uint32) + header length (uint32)
+- header: UTF-8 JSON with the metadata (lessons, source file stats,
+  categories and the offsets of the sections below)
+- string table: count (uint32), offsets (uint32 * (count + 1)), UTF-8 blob
+- item records: one fixed-size struct per Item (see ITEM_RECORD)
+- question groups: uint32 string ids referenced by the item records
+- indexes: for every lesson, the dict_slo and dict_ita key -> items maps,
+  stored as (key string id, first, count) triples over a uint32 item list
+
+A lesson is loaded from the snapshot only if the stats (size and mtime)
+of its source file and of utilities.py match the ones recorded at compile
+time; otherwise load_lesson() falls back to importing the Python module.
+
+Usage:
+    python vocab_snapshot.py          # (re)compile the snapshot
+
+Author: Marco T.
+"""
+
+from __future__ import annotations
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Optional, List, Dict, Tuple
+
+from utilities import Item, WordType, SentenceCategory, Level, Gender, WebLink, QuestionGroup, \
+    VocabularyStore, VocabularyRegistry, process_dictionary, registry as default_registry
+import lessons as lesson_registry
+
+MAGIC = b"LSLOSNAP"
+FORMAT_VERSION = 1
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vocabulary.snapshot")
+
+# lesson module name -> name of the dictionary defined in the module
+LESSONS = {lesson.module: lesson.attr for lesson in lesson_registry.LESSONS}
+
+_PREAMBLE = struct.Struct("<8sII")
+
+# slovensko, italiansko, category, weblink (string ids), bookpage,
+# first question group, question group count, lesson,
+# wordtype, sentence_category, level, gender (enum codes, -1 for None)
+ITEM_RECORD = struct.Struct("<IIIIiIHHbbbb")
+
+# key string id, first position in the item list, number of items
+INDEX_RECORD = struct.Struct("<III")
+
+NO_STRING = 0xFFFFFFFF
+NO_PAGE = -1
+NO_CODE = -1
+
+
+def _enum_code(value) -> int:
+    """Position of an enum member in its class, -1 for None."""
+    if value is None:
+        return NO_CODE
+    return list(type(value)).index(value)
+
+
+def _enum_value(enum_class, code: int):
+    """Inverse of _enum_code."""
+    if code == NO_CODE:
+        return None
+    return list(enum_class)[code]
+
+
+def _file_stat(path: Optional[str]) -> Optional[List[int]]:
+    """Size and modification time of a file, used to detect stale snapshots."""
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+# =============================================================================
+# COMPILER
+# =============================================================================
+
+class _StringTable:
+    """Interns strings and assigns them consecutive ids."""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def add(self, text: Optional[str]) -> int:
+        if text is None:
+            return NO_STRING
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = len(self.strings)
+            self.ids[text] = sid
+            self.strings.append(text)
+        return sid
+
+    def to_bytes(self) -> bytes:
+        blobs = [s.encode("utf-8") for s in self.strings]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return (struct.pack(f"<I{len(offsets)}I", len(self.strings), *offsets) +
+                b"".join(blobs))
+
+
+def compile_snapshot(path: str = DEFAULT_PATH, lessons: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Compile the lesson dictionaries into a binary snapshot file.
+
+    Every lesson module is imported and processed with process_dictionary;
+    the resulting items and dict_slo/dict_ita indexes are written to path
+    (atomically, through a temporary file).
+
+    Args:
+        path: Destination file
+        lessons: Mapping module name -> dictionary name (default: LESSONS)
+
+    Returns:
+        The metadata header written to the snapshot
+    """
+    if lessons is None:
+        lessons = LESSONS
+
+    strings = _StringTable()
+    records = []
+    groups = []
+    index_records = []
+    index_items = []
+    lessons_meta = []
+
+    for lesson_pos, (module_name, attr) in enumerate(lessons.items()):
+        module = importlib.import_module(module_name)
+        dict_slo, dict_ita = process_dictionary(getattr(module, attr))
+
+        # every Item is listed exactly once in dict_slo
+        first_item = len(records)
+        positions = {}
+        for items in dict_slo.values():
+            for item in items:
+                positions[id(item)] = len(records)
+                records.append(ITEM_RECORD.pack(
+                    strings.add(item.slovensko),
+                    strings.add(item.italiansko),
+                    strings.add(item.category),
+                    strings.add(item.weblink.url if item.weblink else None),
+                    NO_PAGE if item.bookpage is None else item.bookpage,
+                    len(groups),
+                    len(item.question_groups),
+                    lesson_pos,
+                    _enum_code(item.wordtype),
+                    _enum_code(item.sentence_category),
+                    _enum_code(item.level),
+                    _enum_code(item.gender),
+                ))
+                groups.extend(strings.add(gp.id) for gp in item.question_groups)
+
+        indexes = {}
+        for name, d in (("slo", dict_slo), ("ita", dict_ita)):
+            indexes[name] = [len(index_records), len(d)]
+            for key, items in d.items():
+                index_records.append(INDEX_RECORD.pack(strings.add(key), len(index_items), len(items)))
+                index_items.extend(positions[id(item)] for item in items)
+
+        lessons_meta.append({
+            "module": module_name,
+            "attr": attr,
+            "source": _file_stat(lesson_registry.source_path(module_name)),
+            "items": [first_item, len(records) - first_item],
+            "categories": list(getattr(module, attr).keys()),
+            "indexes": indexes,
+        })
+
+    sections = [
+        ("strings", strings.to_bytes()),
+        ("items", b"".join(records)),
+        ("groups", struct.pack(f"<{len(groups)}I", *groups)),
+        ("index", b"".join(index_records)),
+        ("index_items", struct.pack(f"<{len(index_items)}I", *index_items)),
+    ]
+
+    header = {
+        "utilities": _file_stat(lesson_registry.source_path("utilities")),
+        "lessons": lessons_meta,
+        "sections": {},
+    }
+    offset = 0
+    for name, data in sections:
+        header["sections"][name] = [offset, len(data)]
+        offset += len(data)
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for _, data in sections:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+    return header
+
+
+# =============================================================================
+# LOADER
+# =============================================================================
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or of another format version."""
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a compiled vocabulary snapshot.
+
+    Only the header is parsed when the file is opened; strings, item
+    records and indexes are decoded from the memory map on demand when a
+    lesson is loaded.
+
+    Attributes:
+        path: Snapshot file path
+        header: Metadata header (see compile_snapshot)
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Open and memory-map a snapshot file.
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            SnapshotError: If the file cannot be used
+        """
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"cannot open snapshot {path}: {e}")
+
+        try:
+            magic, version, header_len = _PREAMBLE.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                self.close()
+                raise SnapshotError(f"{path} is not a version {FORMAT_VERSION} snapshot")
+            header_start = _PREAMBLE.size
+            self.header = json.loads(self._mm[header_start:header_start + header_len].decode("utf-8"))
+        except (struct.error, ValueError) as e:
+            self.close()
+            raise SnapshotError(f"corrupt snapshot {path}: {e}")
+
+        self._base = _PREAMBLE.size + header_len
+        self._lessons = {lesson["module"]: pos for pos, lesson in enumerate(self.header["lessons"])}
+        self._strings = {}
+
+        strings_offset, _ = self._section("strings")
+        self._string_count = struct.unpack_from("<I", self._mm, strings_offset)[0]
+        self._string_offsets = strings_offset + 4
+        self._string_blob = self._string_offsets + 4 * (self._string_count + 1)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _section(self, name: str) -> Tuple[int, int]:
+        offset, length = self.header["sections"][name]
+        return self._base + offset, length
+
+    def _u32(self, section: str, pos: int) -> int:
+        offset, _ = self._section(section)
+        return struct.unpack_from("<I", self._mm, offset + 4 * pos)[0]
+
+    def string(self, sid: int) -> Optional[str]:
+        """Decode (and cache) a string of the string table."""
+        if sid == NO_STRING:
+            return None
+        text = self._strings.get(sid)
+        if text is None:
+            start, end = struct.unpack_from("<II", self._mm, self._string_offsets + 4 * sid)
+            text = self._mm[self._string_blob + start:self._string_blob + end].decode("utf-8")
+            self._strings[sid] = text
+        return text
+
+    def lesson_names(self) -> List[str]:
+        return list(self._lessons)
+
+    def is_fresh(self, module_name: str) -> bool:
+        """
+        True if the lesson is in the snapshot and neither its source file
+        nor utilities.py changed since the snapshot was compiled.
+        """
+        pos = self._lessons.get(module_name)
+        if pos is None:
+            return False
+        if self.header["utilities"] != _file_stat(lesson_registry.source_path("utilities")):
+            return False
+        return self.header["lessons"][pos]["source"] == _file_stat(lesson_registry.source_path(module_name))
+
+    def _item(self, pos: int, store: VocabularyStore) -> Item:
+        items_offset, _ = self._section("items")
+        (slo, ita, category, weblink, bookpage, first_group, group_count, _,
+         wordtype, sentence_category, level, gender) = ITEM_RECORD.unpack_from(
+            self._mm, items_offset + ITEM_RECORD.size * pos)
+
+        return Item(
+            slovensko=self.string(slo),
+            italiansko=self.string(ita),
+            category=self.string(category),
+            bookpage=None if bookpage == NO_PAGE else bookpage,
+            wordtype=_enum_value(WordType, wordtype),
+            sentence_category=_enum_value(SentenceCategory, sentence_category),
+            level=_enum_value(Level, level),
+            gender=_enum_value(Gender, gender),
+            weblink=None if weblink == NO_STRING else WebLink(self.string(weblink)),
+            question_groups=[QuestionGroup(self.string(self._u32("groups", first_group + i)))
+                             for i in range(group_count)],
+            store=store,
+        )
+
+    def load_lesson(
+            self,
+            module_name: str,
+            store: Optional[VocabularyStore] = None
+    ) -> Tuple[Dict[str, List[Item]], Dict[str, List[Item]]]:
+        """
+        Build dict_slo and dict_ita for a lesson from the prebuilt indexes.
+
+        Args:
+            module_name: Lesson module name (e.g. "enota1")
+            store: VocabularyStore to add the items to (default: a new one)
+
+        Returns:
+            Tuple of (slovenian_dict, italian_dict), as process_dictionary
+
+        Raises:
+            KeyError: If the lesson is not in the snapshot
+        """
+        lesson = self.header["lessons"][self._lessons[module_name]]
+        index_offset, _ = self._section("index")
+        if store is None:
+            store = VocabularyStore()
+
+        items = {}
+        result = []
+        for name in ("slo", "ita"):
+            first, count = lesson["indexes"][name]
+            d = {}
+            for key_sid, start, length in INDEX_RECORD.iter_unpack(
+                    self._mm[index_offset + INDEX_RECORD.size * first:
+                             index_offset + INDEX_RECORD.size * (first + count)]):
+                entries = []
+                for i in range(start, start + length):
+                    pos = self._u32("index_items", i)
+                    if pos not in items:
+                        items[pos] = self._item(pos, store)
+                    entries.append(items[pos])
+                d[self.string(key_sid)] = entries
+            result.append(d)
+
+        return result[0], result[1]
+
+
+_snapshot = None
+
+
+def open_snapshot(path: str = DEFAULT_PATH) -> Optional[Snapshot]:
+    """Open the snapshot once per process; None if it is missing or unusable."""
+    global _snapshot
+    if _snapshot is None or _snapshot.path != path:
+        try:
+            _snapshot = Snapshot(path)
+        except SnapshotError:
+            return None
+    return _snapshot
+
+
+def load_lesson(
+        module_name: str,
+        path: str = DEFAULT_PATH,
+        registry: Optional[VocabularyRegistry] = None
+) -> Tuple[Dict[str, List[Item]], Dict[str, List[Item]]]:
+    """
+    Load a lesson's dict_slo/dict_ita, from the snapshot when it is up to date.
+
+    Falls back to importing the lesson module and running
+    process_dictionary when the snapshot is missing, of another format
+    version, or stale. The lesson is loaded once per registry; later
+    calls return the same dictionaries.
+
+    Args:
+        module_name: Lesson module name (e.g. "enota1")
+        path: Snapshot file path
+        registry: VocabularyRegistry memoizing the lesson (default: the
+                  registry shared with utilities.generic_run_me)
+
+    Returns:
+        Tuple of (slovenian_dict, italian_dict)
+    """
+    if registry is None:
+        registry = default_registry
+
+    def build(store: VocabularyStore):
+        snapshot = open_snapshot(path)
+        if snapshot is not None and snapshot.is_fresh(module_name):
+            return snapshot.load_lesson(module_name, store)
+
+        module = importlib.import_module(module_name)
+        return process_dictionary(getattr(module, LESSONS[module_name]), store=store)
+
+    deck = registry.deck(("lesson", module_name), build)
+    return deck.dict_slo, deck.dict_ita
+
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    meta = compile_snapshot(out)
+    print(f"snapshot scritto in {out}: {len(meta['lessons'])} lezioni, "
+          f"{sum(lesson['items'][1] for lesson in meta['lessons'])} item")